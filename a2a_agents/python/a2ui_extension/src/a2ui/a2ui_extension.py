@@ -17,6 +17,7 @@ from typing import Any, Optional
 
 from a2a.server.agent_execution import RequestContext
 from a2a.types import AgentExtension, Part, DataPart
+from pydantic import ValidationError
 
 logger = logging.getLogger(__name__)
 
@@ -80,6 +81,30 @@ def get_a2ui_datapart(part: Part) -> Optional[DataPart]:
     return None
 
 
+def parse_a2ui_part_json(text: str) -> Optional[Part]:
+    """Parses an A2UI part that was serialized to JSON text, e.g. with `Part.model_dump_json`.
+
+    Text that cannot be a serialized A2UI part, such as ordinary chat text, is
+    rejected without parsing: it has to be a JSON object and mention the A2UI
+    MIME type.
+
+    Args:
+        text: The text to parse.
+
+    Returns:
+        The A2UI part if the text is a serialized A2UI part, None otherwise.
+    """
+    # lstrip() returns the same string when there is no leading whitespace,
+    # so this check does not copy ordinary text.
+    if not text.lstrip().startswith("{") or A2UI_MIME_TYPE not in text:
+        return None
+    try:
+        part = Part.model_validate_json(text)
+    except ValidationError:
+        return None
+    return part if is_a2ui_part(part) else None
+
+
 def get_a2ui_agent_extension(
     accepts_inline_custom_catalog: bool = False,
 ) -> AgentExtension:
@@ -115,3 +140,20 @@ def try_activate_a2ui_extension(context: RequestContext) -> bool:
         context.add_activated_extension(A2UI_EXTENSION_URI)
         return True
     return False
+
+
+def is_streaming_request(context: RequestContext) -> bool:
+    """Returns whether the client sent the request with `message/stream`.
+
+    Only streaming clients see working status updates. Other clients read the
+    final task, so it must carry every A2UI message.
+
+    Args:
+        context: The request context to check.
+
+    Returns:
+        True for a JSON-RPC `message/stream` request, False otherwise.
+    """
+    if context.call_context is None:
+        return False
+    return context.call_context.state.get("method") == "message/stream"
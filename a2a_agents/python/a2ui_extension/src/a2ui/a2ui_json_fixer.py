@@ -0,0 +1,184 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import logging
+import re
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+_CODE_FENCE_START = re.compile(r"^```[A-Za-z]*[ \t]*\n?")
+_CODE_FENCE_END = re.compile(r"\n?```$")
+
+_CLOSING = {"[": "]", "{": "}"}
+
+
+@dataclass
+class A2uiJsonFixResult:
+    """The result of `fix_a2ui_json`."""
+
+    json_string: str
+    """The fixed JSON string."""
+    fixes: list[str] = field(default_factory=list)
+    """A description of each fix that was applied, in order."""
+
+    @property
+    def was_fixed(self) -> bool:
+        return bool(self.fixes)
+
+
+def _strip_code_fence(json_string: str, fixes: list[str]) -> str:
+    stripped = json_string.strip()
+    if not stripped.startswith("```"):
+        return stripped
+    stripped = _CODE_FENCE_START.sub("", stripped, count=1)
+    stripped = _CODE_FENCE_END.sub("", stripped, count=1)
+    fixes.append("Removed markdown code fence")
+    return stripped.strip()
+
+
+def _fix_syntax(json_string: str, fixes: list[str]) -> str:
+    """Fixes single quotes, trailing commas and truncated brackets in one pass."""
+    out: list[str] = []
+    stack: list[str] = []
+    quote = None  # The quote character of the string being read, if any.
+    escape = False
+    converted_quotes = False
+    removed_commas = 0
+
+    for char in json_string:
+        if quote is not None:
+            if escape:
+                escape = False
+                # `\'` is not a valid JSON escape; inside a converted string
+                # a plain `'` is enough.
+                if char == "'" and quote == "'":
+                    out[-1] = "'"
+                    continue
+            elif char == "\\":
+                escape = True
+            elif char == quote:
+                quote = None
+                char = '"'
+            elif char == '"' and quote == "'":
+                char = '\\"'
+            out.append(char)
+            continue
+
+        if char in "\"'":
+            quote = char
+            if char == "'":
+                converted_quotes = True
+                char = '"'
+        elif char in "[{":
+            stack.append(_CLOSING[char])
+        elif char in "]}":
+            # Drop a trailing comma before the closing bracket.
+            index = len(out) - 1
+            while index >= 0 and out[index].isspace():
+                index -= 1
+            if index >= 0 and out[index] == ",":
+                del out[index]
+                removed_commas += 1
+            if stack and stack[-1] == char:
+                stack.pop()
+        out.append(char)
+
+    if converted_quotes:
+        fixes.append("Replaced single-quoted strings with double-quoted strings")
+    if removed_commas:
+        fixes.append(f"Removed {removed_commas} trailing commas")
+
+    if quote is not None or stack:
+        if quote is not None:
+            out.append('"')
+        fixed = "".join(out).rstrip()
+        while fixed.endswith(","):
+            fixed = fixed[:-1].rstrip()
+        closers = "".join(reversed(stack))
+        fixes.append(f"Closed truncated JSON with '{closers}'")
+        return fixed + closers
+    return "".join(out)
+
+
+def _literal_key_for(value: Any) -> Optional[str]:
+    if isinstance(value, str):
+        return "literalString"
+    if isinstance(value, bool):
+        return "literalBoolean"
+    if isinstance(value, (int, float)):
+        return "literalNumber"
+    if isinstance(value, list):
+        return "literalArray"
+    return None
+
+
+def _fix_literal_keys(node: Any) -> int:
+    """Renames `literal` to the typed `literal*` key, returning the fix count."""
+    count = 0
+    if isinstance(node, dict):
+        if "literal" in node:
+            key = _literal_key_for(node["literal"])
+            if key is not None and key not in node:
+                node[key] = node.pop("literal")
+                count += 1
+        for value in node.values():
+            count += _fix_literal_keys(value)
+    elif isinstance(node, list):
+        for value in node:
+            count += _fix_literal_keys(value)
+    return count
+
+
+def fix_a2ui_json(json_string: str) -> A2uiJsonFixResult:
+    """Fixes common, mechanical mistakes in LLM generated A2UI JSON.
+
+    The fixes are deterministic and only applied where the input is not
+    already valid, so well-formed JSON passes through unchanged:
+
+    - A surrounding markdown code fence (e.g. ```json ... ```) is removed.
+    - Single-quoted strings are converted to double-quoted strings.
+    - Trailing commas before `]` or `}` are removed.
+    - JSON truncated before its closing brackets is closed.
+    - `literal` is renamed to `literalString`, `literalNumber`,
+      `literalBoolean` or `literalArray` based on the value type.
+
+    Args:
+        json_string: The A2UI JSON part of an LLM response.
+
+    Returns:
+        The fixed JSON string and the list of fixes that were applied. The
+        string may still fail to parse if the input had other problems.
+    """
+    fixes: list[str] = []
+    fixed = _strip_code_fence(json_string, fixes)
+
+    try:
+        data = json.loads(fixed)
+    except json.JSONDecodeError:
+        fixed = _fix_syntax(fixed, fixes)
+        try:
+            data = json.loads(fixed)
+        except json.JSONDecodeError:
+            return A2uiJsonFixResult(json_string=fixed, fixes=fixes)
+
+    if literal_count := _fix_literal_keys(data):
+        fixes.append(f"Renamed {literal_count} 'literal' keys to typed literal keys")
+        fixed = json.dumps(data)
+
+    if fixes:
+        logger.info(f"Fixed A2UI JSON: {'; '.join(fixes)}")
+    return A2uiJsonFixResult(json_string=fixed, fixes=fixes)
@@ -0,0 +1,110 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+from typing import Any, Optional
+
+from pydantic import BaseModel, RootModel
+from pydantic_core import PydanticSerializationError, to_jsonable_python
+
+DEFAULT_MAX_LOG_LENGTH = 200
+TRUNCATION_MARKER = "..."
+
+
+def _dump_shallow(value: Any) -> Any:
+    """Converts a value the JSON encoder does not support, one level at a time.
+
+    A pydantic model becomes a dict of its own fields, by alias and without
+    None fields, with nested models left as they are. The encoder calls this
+    again for each nested model as it reaches it, so a model is only
+    converted as far as it is encoded.
+    """
+    if isinstance(value, RootModel):
+        return value.root
+    if isinstance(value, BaseModel):
+        fields = {}
+        for name, field in type(value).model_fields.items():
+            if field.exclude or (field_value := getattr(value, name)) is None:
+                continue
+            fields[field.serialization_alias or field.alias or name] = field_value
+        if value.model_extra:
+            fields.update(
+                (name, field_value)
+                for name, field_value in value.model_extra.items()
+                if field_value is not None
+            )
+        return fields
+    try:
+        return to_jsonable_python(value)
+    except PydanticSerializationError:
+        return str(value)
+
+
+_encoder = json.JSONEncoder(ensure_ascii=False, default=_dump_shallow)
+
+
+def dump_truncated_json(value: Any, max_length: Optional[int] = DEFAULT_MAX_LOG_LENGTH) -> str:
+    """Serializes a value to JSON for a log message, stopping at `max_length` characters.
+
+    The JSON is encoded incrementally, so a large value is not serialized in
+    full only to be cut off. Pydantic models are encoded by alias and without
+    None fields, like `model_dump(mode="json", exclude_none=True,
+    by_alias=True)`, but field by field as they are reached, so the fields
+    past `max_length` are never converted. Custom field and model serializers
+    are not applied. Values JSON does not support are encoded with pydantic,
+    or with `str` if pydantic cannot encode them either. Strings are not
+    JSON-encoded, only truncated.
+
+    Args:
+        value: The value to serialize.
+        max_length: The maximum number of characters to keep, or None to keep
+          everything.
+
+    Returns:
+        The serialized value, ending with "..." if it was truncated.
+    """
+    if isinstance(value, str):
+        if max_length is None or len(value) <= max_length:
+            return value
+        return value[:max_length] + TRUNCATION_MARKER
+
+    chunks = []
+    length = 0
+    for chunk in _encoder.iterencode(value):
+        chunks.append(chunk)
+        length += len(chunk)
+        if max_length is not None and length > max_length:
+            return "".join(chunks)[:max_length] + TRUNCATION_MARKER
+    return "".join(chunks)
+
+
+class LazyJson:
+    """A log argument that is serialized only if the message is emitted.
+
+    Pass it as a %-style argument rather than formatting it into the message,
+    so nothing is serialized when the log level is disabled:
+
+        logger.info("Converted A2UI part: %s", LazyJson(part))
+
+    See `dump_truncated_json` for how the value is serialized.
+    """
+
+    __slots__ = ("_value", "_max_length")
+
+    def __init__(self, value: Any, max_length: Optional[int] = DEFAULT_MAX_LOG_LENGTH):
+        self._value = value
+        self._max_length = max_length
+
+    def __str__(self) -> str:
+        return dump_truncated_json(self._value, self._max_length)
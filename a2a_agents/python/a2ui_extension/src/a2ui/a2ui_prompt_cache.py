@@ -0,0 +1,85 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import NamedTuple, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CACHED_PROMPTS = 64
+
+
+class A2uiPromptKey(NamedTuple):
+    """Identifies a built system prompt."""
+
+    agent_name: str
+    """The name of the agent the prompt is for."""
+    base_url: Optional[str] = None
+    """The base URL used for links and assets in the prompt."""
+    catalog_uri: Optional[str] = None
+    """The URI of the component catalog the prompt is for."""
+    schema_hash: Optional[str] = None
+    """The hash of the A2UI schema in the prompt, see `get_schema_hash`."""
+
+
+class A2uiPromptCache:
+    """A thread-safe, bounded cache of built system prompts.
+
+    Building an A2UI system prompt can mean loading and validating examples
+    and serializing the schema. Agents that pass their instructions as a
+    callable rebuild them on every LLM call, so the built prompt is cached by
+    the inputs it depends on.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_CACHED_PROMPTS):
+        self._max_size = max_size
+        self._prompts: OrderedDict[A2uiPromptKey, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_prompt(self, key: A2uiPromptKey, build_prompt: Callable[[], str]) -> str:
+        """Returns the prompt for the key, building it on the first call.
+
+        Args:
+            key: The inputs the prompt depends on.
+            build_prompt: Builds the prompt if it is not cached.
+
+        Returns:
+            The cached or newly built prompt.
+        """
+        with self._lock:
+            if (prompt := self._prompts.get(key)) is not None:
+                self._prompts.move_to_end(key)
+                return prompt
+
+        prompt = build_prompt()
+        logger.info(f"Built system prompt for {key.agent_name} and catalog {key.catalog_uri}")
+
+        with self._lock:
+            prompt = self._prompts.setdefault(key, prompt)
+            self._prompts.move_to_end(key)
+            while len(self._prompts) > self._max_size:
+                self._prompts.popitem(last=False)
+        return prompt
+
+    def __contains__(self, key: A2uiPromptKey) -> bool:
+        with self._lock:
+            return key in self._prompts
+
+    def clear(self) -> None:
+        """Removes all cached prompts."""
+        with self._lock:
+            self._prompts.clear()
@@ -0,0 +1,177 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import logging
+from dataclasses import dataclass
+from typing import Any, Optional
+
+import jsonschema
+
+from a2ui.a2ui_stream_parser import A2UI_JSON_DELIMITER, parse_a2ui_response
+from a2ui.a2ui_validator import A2uiValidationResult
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_FRAGMENT_CHARS = 4000
+
+
+def get_schema_fragment(
+    message_schema: dict[str, Any], error: jsonschema.exceptions.ValidationError
+) -> dict[str, Any]:
+    """Returns the sub-schema that the failing value was validated against.
+
+    Args:
+        message_schema: The single message A2UI schema.
+        error: A validation error for a single message.
+
+    Returns:
+        The schema object containing the keyword that failed.
+    """
+    fragment = message_schema
+    # The last entry of the schema path is the failing keyword itself.
+    for key in list(error.relative_schema_path)[:-1]:
+        if not isinstance(fragment, (dict, list)):
+            break
+        try:
+            fragment = fragment[key]
+        except (KeyError, IndexError, TypeError):
+            break
+    return fragment if isinstance(fragment, dict) else message_schema
+
+
+def splice_repaired_messages(
+    a2ui_messages: list[dict[str, Any]],
+    failed_indices: list[int],
+    repaired_messages: list[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """Replaces the failing messages with their repaired versions.
+
+    Args:
+        a2ui_messages: The original list of A2UI messages.
+        failed_indices: The indices of the failing messages, in order.
+        repaired_messages: The repaired messages, in the same order.
+
+    Returns:
+        A new list with the repaired messages in place of the failing ones.
+
+    Raises:
+        ValueError: If the number of repaired messages does not match.
+    """
+    if len(repaired_messages) != len(failed_indices):
+        raise ValueError(
+            f"Expected {len(failed_indices)} repaired messages, got {len(repaired_messages)}."
+        )
+    spliced = list(a2ui_messages)
+    for index, message in zip(failed_indices, repaired_messages):
+        spliced[index] = message
+    return spliced
+
+
+@dataclass
+class A2uiRepairRequest:
+    """A request to the LLM to fix only the failing messages of a response.
+
+    Instead of regenerating the whole response, the LLM is sent each failing
+    message with the JSON pointer of its error and the relevant schema fragment.
+    The corrected messages are then spliced back into the valid ones.
+    """
+
+    text: str
+    """The conversational text part of the original response."""
+    a2ui_messages: list[dict[str, Any]]
+    """All A2UI messages of the original response."""
+    validation_result: A2uiValidationResult
+    """The per-message validation result for `a2ui_messages`."""
+    message_schema: dict[str, Any]
+    """The single message A2UI schema the messages were validated against."""
+
+    def build_prompt(self, max_fragment_chars: int = DEFAULT_MAX_FRAGMENT_CHARS) -> str:
+        """Builds the repair prompt for the failing messages.
+
+        Args:
+            max_fragment_chars: Schema fragments longer than this are replaced
+              with a pointer to the schema in the system instructions.
+
+        Returns:
+            The prompt to send to the LLM.
+        """
+        sections = []
+        for error in self.validation_result.errors:
+            fragment = json.dumps(
+                get_schema_fragment(self.message_schema, error.error),
+                separators=(",", ":"),
+            )
+            if len(fragment) > max_fragment_chars:
+                fragment = "(See the A2UI JSON SCHEMA in your instructions.)"
+            message = json.dumps(
+                self.a2ui_messages[error.message_index], separators=(",", ":")
+            )
+            sections.append(
+                f"Message {error.message_index}:\n"
+                f"Error at '{error.json_pointer}': {error.error.message}\n"
+                f"Schema for the failing value: {fragment}\n"
+                f"Invalid message: {message}"
+            )
+
+        failed_count = len(self.validation_result.errors)
+        return (
+            "Some A2UI messages in your previous response were invalid. "
+            "The other messages were valid and have been kept.\n"
+            f"Fix ONLY the {failed_count} messages below. Respond with the delimiter "
+            f"'{A2UI_JSON_DELIMITER}' followed by a JSON list of exactly {failed_count} "
+            "corrected messages, in the order listed. Do not call any tools and do "
+            "not repeat the valid messages.\n\n" + "\n\n".join(sections)
+        )
+
+    def apply(self, repair_response: str) -> str:
+        """Splices the LLM's repaired messages into the original response.
+
+        Args:
+            repair_response: The LLM response to the repair prompt.
+
+        Returns:
+            The full response, with the original text part and all messages.
+
+        Raises:
+            ValueError: If the repair response cannot be parsed or does not
+              contain one message per failing message.
+        """
+        _, repaired_messages = parse_a2ui_response(repair_response)
+        a2ui_messages = splice_repaired_messages(
+            self.a2ui_messages,
+            self.validation_result.failed_indices,
+            repaired_messages,
+        )
+        logger.info(f"Spliced {len(repaired_messages)} repaired A2UI messages.")
+        return f"{self.text}\n{A2UI_JSON_DELIMITER}\n{json.dumps(a2ui_messages)}"
+
+    def try_apply(self, repair_response: str) -> Optional[str]:
+        """Like `apply`, but returns None if the repair response cannot be used.
+
+        The repair response only contains the corrected messages, so it must
+        never be used as a response on its own. A None result means the
+        attempt failed, and the original request should be retried in full.
+
+        Args:
+            repair_response: The LLM response to the repair prompt.
+
+        Returns:
+            The full response, or None if the repair could not be applied.
+        """
+        try:
+            return self.apply(repair_response)
+        except ValueError as e:
+            logger.warning(f"Could not apply A2UI repair: {e}")
+            return None
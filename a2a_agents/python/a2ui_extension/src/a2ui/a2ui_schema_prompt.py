@@ -0,0 +1,128 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import json
+import logging
+import re
+from collections.abc import Iterable
+from typing import Any, Union
+
+logger = logging.getLogger(__name__)
+
+# Matches the component type in `"component": { "Text": ...`. Examples that are
+# Python format strings escape braces as `{{`, so allow several.
+_COMPONENT_TYPE_PATTERN = re.compile(r'"component"\s*:\s*\{+\s*"([A-Za-z0-9_]+)"')
+
+_COMPONENT_DEFINITIONS_PATH = (
+    "properties",
+    "surfaceUpdate",
+    "properties",
+    "components",
+    "items",
+    "properties",
+    "component",
+    "properties",
+)
+
+
+def find_component_types(examples: Union[str, Iterable[str]]) -> set[str]:
+    """Returns the component types used by A2UI examples or templates.
+
+    Args:
+        examples: The example text, or several example texts.
+
+    Returns:
+        The names of the component types, e.g. {"Column", "Text"}.
+    """
+    if isinstance(examples, str):
+        examples = [examples]
+    return {
+        match
+        for example in examples
+        for match in _COMPONENT_TYPE_PATTERN.findall(example)
+    }
+
+
+def _get_component_definitions(a2ui_schema: dict[str, Any]) -> dict[str, Any]:
+    definitions = a2ui_schema
+    for key in _COMPONENT_DEFINITIONS_PATH:
+        definitions = definitions.get(key)
+        if not isinstance(definitions, dict):
+            return {}
+    # Catalogs may be merged as a whole, with the component types under
+    # `components` next to the catalog `styles`.
+    if isinstance(definitions.get("components"), dict):
+        return definitions["components"]
+    return definitions
+
+
+def prune_schema_components(
+    a2ui_schema: dict[str, Any], component_types: Iterable[str]
+) -> dict[str, Any]:
+    """Returns a copy of the A2UI schema with only the given component types.
+
+    The input schema is left untouched. Keys that are not component types,
+    such as `$ref`, are kept.
+
+    Args:
+        a2ui_schema: The single message A2UI schema, with a catalog merged in.
+        component_types: The names of the component types to keep.
+
+    Returns:
+        The pruned schema.
+    """
+    pruned = copy.deepcopy(a2ui_schema)
+    definitions = _get_component_definitions(pruned)
+    keep = set(component_types)
+    for name in list(definitions):
+        if name not in keep and not name.startswith("$"):
+            del definitions[name]
+    return pruned
+
+
+def minify_schema(a2ui_schema: dict[str, Any]) -> str:
+    """Serializes the schema without insignificant whitespace."""
+    return json.dumps(a2ui_schema, separators=(",", ":"))
+
+
+def build_schema_prompt(
+    a2ui_schema: Union[str, dict[str, Any]],
+    examples: Union[str, Iterable[str]],
+) -> str:
+    """Builds the A2UI schema text for a system prompt.
+
+    Only the component types used by the examples are included, and the
+    schema is minified. If the examples do not use any known component type,
+    the full schema is used.
+
+    Args:
+        a2ui_schema: The single message A2UI schema, as a JSON string or dict.
+        examples: The examples or templates that will be in the same prompt.
+
+    Returns:
+        The minified schema as a JSON string.
+    """
+    if isinstance(a2ui_schema, str):
+        a2ui_schema = json.loads(a2ui_schema)
+
+    component_types = find_component_types(examples) & set(
+        _get_component_definitions(a2ui_schema)
+    )
+    if not component_types:
+        logger.info("No known component types in examples, using the full schema")
+        return minify_schema(a2ui_schema)
+
+    logger.info(f"Pruned A2UI schema to components {sorted(component_types)}")
+    return minify_schema(prune_schema_components(a2ui_schema, component_types))
@@ -0,0 +1,302 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import logging
+from collections import Counter
+from typing import Any, Optional, Union
+
+from a2ui.a2ui_validator import A2uiValidator
+
+logger = logging.getLogger(__name__)
+
+A2UI_JSON_DELIMITER = "---a2ui_JSON---"
+
+A2uiStreamItem = Union[str, dict[str, Any]]
+
+
+class A2uiStreamParser:
+    """Incrementally parses an LLM response in the `---a2ui_JSON---` format.
+
+    The response is a conversational text part, the delimiter, and then a JSON
+    list of A2UI messages, optionally wrapped in a markdown code fence. Chunks
+    are fed as they arrive from the model. The text part is returned once the
+    delimiter is seen, and each A2UI message is returned as soon as its closing
+    brace arrives, so callers can forward messages while the model is still
+    writing later ones. Messages that are not valid JSON are skipped and
+    recorded in `errors`.
+    """
+
+    def __init__(self, delimiter: str = A2UI_JSON_DELIMITER):
+        self._delimiter = delimiter
+        self._buffer = ""
+        self._in_json = False
+        self._done = False
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._is_list: Optional[bool] = None
+        self._message_start: Optional[int] = None
+        self.text: Optional[str] = None
+        self.message_count = 0
+        self.errors: list[json.JSONDecodeError] = []
+
+    @property
+    def has_a2ui_json(self) -> bool:
+        """Whether the delimiter has been seen."""
+        return self._in_json
+
+    def feed(self, chunk: str) -> list[A2uiStreamItem]:
+        """Feeds a chunk of the LLM response to the parser.
+
+        Args:
+            chunk: The next chunk of response text.
+
+        Returns:
+            The items completed by this chunk, in order. The text part is
+            returned as a `str` and each A2UI message as a `dict`.
+        """
+        self._buffer += chunk
+        items: list[A2uiStreamItem] = []
+        if not self._in_json:
+            index = self._buffer.find(self._delimiter)
+            if index == -1:
+                return items
+            self.text = self._buffer[:index].strip()
+            items.append(self.text)
+            self._buffer = self._buffer[index + len(self._delimiter) :]
+            self._in_json = True
+
+        items.extend(self._scan())
+        return items
+
+    def close(self) -> list[A2uiStreamItem]:
+        """Signals the end of the LLM response.
+
+        Returns:
+            The text part if the response did not contain the delimiter.
+
+        Raises:
+            ValueError: If the response ended in the middle of an A2UI message.
+        """
+        if not self._in_json:
+            if self.text is not None:
+                return []
+            self.text = self._buffer.strip()
+            self._buffer = ""
+            return [self.text]
+        if self._depth > 0:
+            raise ValueError(
+                f"A2UI JSON ended unexpectedly after {self.message_count} complete messages."
+            )
+        return []
+
+    def _scan(self) -> list[dict[str, Any]]:
+        messages = []
+        buffer = self._buffer
+        while self._pos < len(buffer) and not self._done:
+            char = buffer[self._pos]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+            elif char == '"':
+                # Characters outside the top level value (e.g. code fences) are skipped.
+                self._in_string = self._depth > 0
+            elif char in "[{":
+                if self._depth == 0:
+                    self._is_list = char == "["
+                if char == "{" and self._depth == (1 if self._is_list else 0):
+                    self._message_start = self._pos
+                self._depth += 1
+            elif char in "]}" and self._depth > 0:
+                self._depth -= 1
+                if (
+                    self._message_start is not None
+                    and self._depth == (1 if self._is_list else 0)
+                ):
+                    message_str = buffer[self._message_start : self._pos + 1]
+                    self._message_start = None
+                    try:
+                        messages.append(json.loads(message_str))
+                        self.message_count += 1
+                    except json.JSONDecodeError as e:
+                        logger.warning(f"Skipping invalid A2UI message: {e}")
+                        self.errors.append(e)
+                if self._depth == 0:
+                    self._done = True
+            self._pos += 1
+
+        # Drop consumed input that can no longer be part of a message.
+        if self._message_start is None:
+            self._buffer = buffer[self._pos :]
+            self._pos = 0
+        elif self._message_start > 0:
+            self._buffer = buffer[self._message_start :]
+            self._pos -= self._message_start
+            self._message_start = 0
+        return messages
+
+
+def get_surface_id(a2ui_message: dict[str, Any]) -> Optional[str]:
+    """Returns the id of the surface an A2UI message applies to, if it has one."""
+    for value in a2ui_message.values():
+        if isinstance(value, dict) and isinstance(value.get("surfaceId"), str):
+            return value["surfaceId"]
+    return None
+
+
+class A2uiMessageStreamer:
+    """Picks out the valid A2UI messages of a response while the model writes it.
+
+    Each model response is fed through its own `A2uiStreamParser`, and every
+    completed message that passes the validator is returned so it can be sent
+    to the client right away. Invalid messages are skipped; the full response
+    is still validated once the model finishes.
+
+    Once a response fails validation and is repaired, call `stop`. Messages
+    from later attempts are then only sent with the final response, so the
+    client never renders a half-repaired attempt. When the response is
+    regenerated in full instead, or given up on, call `abandon` and send the
+    messages it returns, so the surfaces drawn by the abandoned attempt are
+    removed from the client.
+    """
+
+    def __init__(self, validator: Optional[A2uiValidator]):
+        self._validator = validator
+        self._parser = A2uiStreamParser()
+        self._surface_ids: dict[str, None] = {}
+        self.is_streaming = validator is not None
+
+    def feed(self, chunk: str) -> list[dict[str, Any]]:
+        """Feeds a chunk of the current model response.
+
+        Args:
+            chunk: The next chunk of response text.
+
+        Returns:
+            The valid A2UI messages completed by this chunk, or an empty list
+            once streaming has been stopped.
+        """
+        if not self.is_streaming:
+            return []
+        messages = [
+            item
+            for item in self._parser.feed(chunk)
+            if isinstance(item, dict) and self._validator.is_valid_message(item)
+        ]
+        for message in messages:
+            if (surface_id := get_surface_id(message)) is None:
+                continue
+            if "deleteSurface" in message:
+                self._surface_ids.pop(surface_id, None)
+            else:
+                self._surface_ids[surface_id] = None
+        return messages
+
+    def end_response(self):
+        """Marks the end of a model response, so the next one is parsed separately."""
+        self._parser = A2uiStreamParser()
+
+    def stop(self):
+        """Stops streaming for the rest of the request."""
+        self.is_streaming = False
+
+    def abandon(self) -> list[dict[str, Any]]:
+        """Stops streaming and takes back what was streamed so far.
+
+        Returns:
+            A `deleteSurface` message for every surface that streamed messages
+            were sent to, in the order the surfaces were first streamed.
+        """
+        self.stop()
+        delete_messages = [
+            {"deleteSurface": {"surfaceId": surface_id}}
+            for surface_id in self._surface_ids
+        ]
+        self._surface_ids = {}
+        return delete_messages
+
+
+def _message_key(a2ui_message: dict[str, Any]) -> str:
+    return json.dumps(a2ui_message, sort_keys=True, separators=(",", ":"))
+
+
+def get_undelivered_messages(
+    a2ui_messages: list[dict[str, Any]],
+    delivered_messages: list[dict[str, Any]],
+) -> list[dict[str, Any]]:
+    """Returns the messages of a final response that were not streamed already.
+
+    Each delivered message accounts for one identical message in
+    `a2ui_messages`, so a message the response repeats is still sent again.
+    Messages delivered before a `deleteSurface` for their surface no longer
+    count, since the client has dropped them.
+
+    Args:
+        a2ui_messages: The A2UI messages of the final response.
+        delivered_messages: The A2UI messages already sent to the client, in
+            the order they were sent.
+
+    Returns:
+        The remaining messages, in their original order.
+    """
+    remaining: Counter[str] = Counter()
+    surface_keys: dict[str, set[str]] = {}
+    for message in delivered_messages:
+        key = _message_key(message)
+        surface_id = get_surface_id(message)
+        if surface_id is not None and "deleteSurface" in message:
+            for deleted_key in surface_keys.pop(surface_id, set()):
+                del remaining[deleted_key]
+        elif surface_id is not None:
+            surface_keys.setdefault(surface_id, set()).add(key)
+        remaining[key] += 1
+
+    undelivered = []
+    for message in a2ui_messages:
+        key = _message_key(message)
+        if remaining[key] > 0:
+            remaining[key] -= 1
+        else:
+            undelivered.append(message)
+    return undelivered
+
+
+def parse_a2ui_response(
+    content: str, delimiter: str = A2UI_JSON_DELIMITER
+) -> tuple[str, list[dict[str, Any]]]:
+    """Parses a complete LLM response in the `---a2ui_JSON---` format.
+
+    Args:
+        content: The full LLM response.
+        delimiter: The delimiter between the text part and the A2UI JSON.
+
+    Returns:
+        A tuple of the text part and the list of A2UI messages.
+
+    Raises:
+        json.JSONDecodeError: If an A2UI message is not valid JSON.
+        ValueError: If the A2UI JSON is truncated.
+    """
+    parser = A2uiStreamParser(delimiter)
+    items = parser.feed(content) + parser.close()
+    if parser.errors:
+        raise parser.errors[0]
+    messages = [item for item in items if isinstance(item, dict)]
+    return parser.text or "", messages
@@ -0,0 +1,365 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Optional, Union
+
+import jsonschema
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CACHED_VALIDATORS = 32
+
+SchemaLike = Union[str, dict[str, Any]]
+
+
+def _load_schema(schema: SchemaLike) -> dict[str, Any]:
+    return json.loads(schema) if isinstance(schema, str) else schema
+
+
+def _read_only(*args, **kwargs):
+    raise TypeError("Shared A2UI schemas are read-only; modify a copy.deepcopy() instead.")
+
+
+class _ReadOnlyDict(dict):
+    """A dict that can't be modified. Copies of it are plain, mutable dicts."""
+
+    __setitem__ = __delitem__ = __ior__ = _read_only
+    clear = pop = popitem = setdefault = update = _read_only
+
+    def __copy__(self) -> dict[str, Any]:
+        return dict(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> dict[str, Any]:
+        return {key: copy.deepcopy(value, memo) for key, value in self.items()}
+
+    def __reduce__(self):
+        return dict, (dict(self),)
+
+
+class _ReadOnlyList(list):
+    """A list that can't be modified. Copies of it are plain, mutable lists."""
+
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+    append = clear = extend = insert = pop = remove = reverse = sort = _read_only
+
+    def __copy__(self) -> list[Any]:
+        return list(self)
+
+    def __deepcopy__(self, memo: dict[int, Any]) -> list[Any]:
+        return [copy.deepcopy(value, memo) for value in self]
+
+    def __reduce__(self):
+        return list, (list(self),)
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, dict):
+        return _ReadOnlyDict((key, _freeze(item)) for key, item in value.items())
+    if isinstance(value, list):
+        return _ReadOnlyList(_freeze(item) for item in value)
+    return value
+
+
+def _canonical_json(schema: SchemaLike) -> str:
+    if isinstance(schema, str):
+        return schema
+    return json.dumps(schema, sort_keys=True, separators=(",", ":"))
+
+
+def get_schema_hash(
+    a2ui_schema: SchemaLike, catalog: Optional[SchemaLike] = None
+) -> str:
+    """Computes a content hash for an A2UI schema and optional component catalog.
+
+    Args:
+        a2ui_schema: The single message A2UI schema, as a JSON string or dict.
+        catalog: The optional component catalog, as a JSON string or dict.
+
+    Returns:
+        A hex digest that identifies the (schema, catalog) pair by content.
+    """
+    digest = hashlib.sha256(_canonical_json(a2ui_schema).encode("utf-8"))
+    if catalog is not None:
+        digest.update(b"\0")
+        digest.update(_canonical_json(catalog).encode("utf-8"))
+    return digest.hexdigest()
+
+
+def merge_catalog_into_schema(
+    a2ui_schema: dict[str, Any], catalog: dict[str, Any]
+) -> dict[str, Any]:
+    """Returns a copy of the A2UI schema with the component catalog spliced in.
+
+    The input schema is left untouched, so it can be shared between callers.
+
+    Args:
+        a2ui_schema: The single message A2UI schema.
+        catalog: The component catalog to use for `surfaceUpdate` components.
+
+    Returns:
+        A new schema dict with the catalog set as the component properties.
+    """
+    merged = copy.deepcopy(a2ui_schema)
+    merged["properties"]["surfaceUpdate"]["properties"]["components"]["items"][
+        "properties"
+    ]["component"]["properties"] = catalog
+    return merged
+
+
+def to_json_pointer(path: Any) -> str:
+    """Formats a jsonschema error path as a JSON pointer (RFC 6901)."""
+    return "".join(
+        "/" + str(token).replace("~", "~0").replace("/", "~1") for token in path
+    )
+
+
+@dataclass
+class A2uiMessageError:
+    """A validation error for a single A2UI message in a list of messages."""
+
+    message_index: int
+    """The index of the failing message in the list."""
+    json_pointer: str
+    """The JSON pointer of the failing value, relative to the list."""
+    error: jsonschema.exceptions.ValidationError
+    """The underlying jsonschema error."""
+
+    def __str__(self) -> str:
+        return f"Message {self.message_index} at '{self.json_pointer}': {self.error.message}"
+
+
+@dataclass
+class A2uiValidationResult:
+    """The result of validating each A2UI message in a list on its own."""
+
+    valid_messages: dict[int, dict[str, Any]] = field(default_factory=dict)
+    """The messages that passed validation, keyed by their index in the list."""
+    errors: list[A2uiMessageError] = field(default_factory=list)
+    """One error per failing message, ordered by message index."""
+
+    @property
+    def is_valid(self) -> bool:
+        return not self.errors
+
+    @property
+    def failed_indices(self) -> list[int]:
+        return [error.message_index for error in self.errors]
+
+    def valid_prefix(self) -> list[dict[str, Any]]:
+        """Returns the valid messages before the first failing message."""
+        first_failure = self.errors[0].message_index if self.errors else None
+        return [
+            message
+            for index, message in sorted(self.valid_messages.items())
+            if first_failure is None or index < first_failure
+        ]
+
+
+class A2uiValidator:
+    """A compiled, reusable validator for lists of A2UI messages.
+
+    Building a jsonschema validator checks the schema against its metaschema,
+    so instances of this class should be created once and reused, typically
+    through `get_a2ui_validator`.
+
+    `message_schema` is a read-only copy of the single message schema;
+    modifying it raises TypeError. `copy.deepcopy` returns a mutable copy.
+    """
+
+    def __init__(self, message_schema: dict[str, Any], schema_hash: str):
+        # Validators are shared through the registry, so the schema is frozen
+        # to keep one caller from changing it for the others.
+        self.message_schema: dict[str, Any] = _freeze(message_schema)
+        self.schema_hash = schema_hash
+
+        validator_cls = jsonschema.validators.validator_for(self.message_schema)
+        validator_cls.check_schema(self.message_schema)
+        self._message_validator = validator_cls(self.message_schema)
+        # The LLM returns a list of messages, so validate against an array of
+        # the single message schema.
+        self._list_validator = validator_cls(
+            {"type": "array", "items": self.message_schema}
+        )
+
+    def validate(self, a2ui_messages: Any) -> None:
+        """Validates a list of A2UI messages.
+
+        Raises:
+            jsonschema.exceptions.ValidationError: If the messages are invalid.
+        """
+        self._list_validator.validate(a2ui_messages)
+
+    def validate_message(self, a2ui_message: Any) -> None:
+        """Validates a single A2UI message.
+
+        Raises:
+            jsonschema.exceptions.ValidationError: If the message is invalid.
+        """
+        self._message_validator.validate(a2ui_message)
+
+    def is_valid(self, a2ui_messages: Any) -> bool:
+        """Returns True if the list of A2UI messages is valid."""
+        return self._list_validator.is_valid(a2ui_messages)
+
+    def is_valid_message(self, a2ui_message: Any) -> bool:
+        """Returns True if the single A2UI message is valid."""
+        return self._message_validator.is_valid(a2ui_message)
+
+    def validate_messages(self, a2ui_messages: Any) -> A2uiValidationResult:
+        """Validates each A2UI message in a list on its own.
+
+        Unlike `validate`, a failing message does not hide the result for the
+        other messages, so callers can use the valid ones and only regenerate
+        the failing ones.
+
+        Args:
+            a2ui_messages: A list of A2UI messages, or a single message.
+
+        Returns:
+            The valid messages and one error per failing message.
+
+        Raises:
+            jsonschema.exceptions.ValidationError: If the input is neither a
+              list nor a single message object.
+        """
+        if isinstance(a2ui_messages, dict):
+            a2ui_messages = [a2ui_messages]
+        elif not isinstance(a2ui_messages, list):
+            raise jsonschema.exceptions.ValidationError(
+                f"Expected a list of A2UI messages, got {type(a2ui_messages).__name__}"
+            )
+
+        result = A2uiValidationResult()
+        for index, message in enumerate(a2ui_messages):
+            error = jsonschema.exceptions.best_match(
+                self._message_validator.iter_errors(message)
+            )
+            if error is None:
+                result.valid_messages[index] = message
+            else:
+                result.errors.append(
+                    A2uiMessageError(
+                        message_index=index,
+                        json_pointer=to_json_pointer([index, *error.absolute_path]),
+                        error=error,
+                    )
+                )
+        return result
+
+
+class A2uiValidatorRegistry:
+    """A thread-safe, bounded registry of compiled A2UI validators.
+
+    Validators are keyed by the content hash of the (schema, catalog) pair, so
+    agents that load the same schema share a single compiled validator.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_CACHED_VALIDATORS):
+        self._max_size = max_size
+        self._validators: OrderedDict[str, A2uiValidator] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_validator(
+        self, a2ui_schema: SchemaLike, catalog: Optional[SchemaLike] = None
+    ) -> A2uiValidator:
+        """Returns the compiled validator for the schema and optional catalog.
+
+        Args:
+            a2ui_schema: The single message A2UI schema, as a JSON string or dict.
+            catalog: The optional component catalog, as a JSON string or dict.
+
+        Returns:
+            The shared A2uiValidator for this (schema, catalog) pair.
+
+        Raises:
+            json.JSONDecodeError: If a string schema or catalog is not valid JSON.
+            jsonschema.exceptions.SchemaError: If the schema itself is invalid.
+        """
+        schema_hash = get_schema_hash(a2ui_schema, catalog)
+        with self._lock:
+            if (validator := self._validators.get(schema_hash)) is not None:
+                self._validators.move_to_end(schema_hash)
+                return validator
+
+        message_schema = _load_schema(a2ui_schema)
+        if catalog is not None:
+            message_schema = merge_catalog_into_schema(
+                message_schema, _load_schema(catalog)
+            )
+        validator = A2uiValidator(message_schema, schema_hash)
+        logger.info(f"Compiled A2UI validator for schema hash {schema_hash[:12]}")
+
+        with self._lock:
+            # Another thread may have compiled the same schema in the meantime.
+            validator = self._validators.setdefault(schema_hash, validator)
+            self._validators.move_to_end(schema_hash)
+            while len(self._validators) > self._max_size:
+                self._validators.popitem(last=False)
+        return validator
+
+    def get_validator_by_hash(self, schema_hash: str) -> Optional[A2uiValidator]:
+        """Returns the cached validator with the given schema hash, if any.
+
+        Args:
+            schema_hash: The `schema_hash` of a validator from this registry.
+
+        Returns:
+            The validator, or None if it was never compiled or has been evicted.
+        """
+        with self._lock:
+            if (validator := self._validators.get(schema_hash)) is not None:
+                self._validators.move_to_end(schema_hash)
+            return validator
+
+    def clear(self) -> None:
+        """Removes all cached validators."""
+        with self._lock:
+            self._validators.clear()
+
+
+_default_registry = A2uiValidatorRegistry()
+
+
+def get_a2ui_validator(
+    a2ui_schema: SchemaLike, catalog: Optional[SchemaLike] = None
+) -> A2uiValidator:
+    """Returns a shared, compiled validator for lists of A2UI messages.
+
+    Args:
+        a2ui_schema: The single message A2UI schema, as a JSON string or dict.
+        catalog: The optional component catalog, as a JSON string or dict.
+
+    Returns:
+        The A2uiValidator cached in the default registry.
+    """
+    return _default_registry.get_validator(a2ui_schema, catalog)
+
+
+def get_a2ui_validator_by_hash(schema_hash: str) -> Optional[A2uiValidator]:
+    """Returns the validator with the given schema hash from the default registry.
+
+    Args:
+        schema_hash: The `schema_hash` of a validator from `get_a2ui_validator`.
+
+    Returns:
+        The validator, or None if it was never compiled or has been evicted.
+    """
+    return _default_registry.get_validator_by_hash(schema_hash)
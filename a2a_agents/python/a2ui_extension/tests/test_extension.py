@@ -14,6 +14,7 @@
 
 
 from a2a.server.agent_execution import RequestContext
+from a2a.server.context import ServerCallContext
 from a2a.types import DataPart, TextPart, Part
 from a2ui import a2ui_extension
 
@@ -58,6 +59,26 @@ def test_non_a2ui_part():
     ), "Should not return A2UI DataPart"
 
 
+def test_parse_a2ui_part_json():
+    part = a2ui_extension.create_a2ui_part({"beginRendering": {"surfaceId": "s"}})
+
+    parsed = a2ui_extension.parse_a2ui_part_json(part.model_dump_json())
+
+    assert parsed == part
+
+
+def test_parse_a2ui_part_json_rejects_other_text():
+    non_a2ui_data = Part(root=DataPart(data={"foo": "bar"})).model_dump_json()
+
+    assert a2ui_extension.parse_a2ui_part_json("Show me restaurants") is None
+    assert a2ui_extension.parse_a2ui_part_json("") is None
+    assert a2ui_extension.parse_a2ui_part_json(non_a2ui_data) is None
+    assert (
+        a2ui_extension.parse_a2ui_part_json('{"text": "application/json+a2ui"}')
+        is None
+    )
+
+
 def test_get_a2ui_agent_extension():
     agent_extension = a2ui_extension.get_a2ui_agent_extension()
     assert agent_extension.uri == a2ui_extension.A2UI_EXTENSION_URI
@@ -88,3 +109,13 @@ def test_try_activate_a2ui_extension_not_requested():
 
     assert not a2ui_extension.try_activate_a2ui_extension(context)
     context.add_activated_extension.assert_not_called()
+
+
+def test_is_streaming_request():
+    def make_context(method):
+        call_context = ServerCallContext(state={"method": method})
+        return RequestContext(call_context=call_context)
+
+    assert a2ui_extension.is_streaming_request(make_context("message/stream"))
+    assert not a2ui_extension.is_streaming_request(make_context("message/send"))
+    assert not a2ui_extension.is_streaming_request(RequestContext())
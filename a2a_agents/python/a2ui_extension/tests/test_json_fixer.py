@@ -0,0 +1,95 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+from a2ui import a2ui_json_fixer
+
+MESSAGES = [
+    {"beginRendering": {"surfaceId": "s", "root": "root-column"}},
+    {
+        "surfaceUpdate": {
+            "surfaceId": "s",
+            "components": [
+                {
+                    "id": "title",
+                    "component": {"Text": {"text": {"literalString": "It's {here}"}}},
+                }
+            ],
+        }
+    },
+]
+
+
+def test_valid_json_is_unchanged():
+    json_string = json.dumps(MESSAGES)
+
+    result = a2ui_json_fixer.fix_a2ui_json(json_string)
+
+    assert result.json_string == json_string
+    assert not result.was_fixed
+
+
+def test_removes_code_fence():
+    # `lstrip("```json")` strips characters, so it would also eat a leading `n`.
+    result = a2ui_json_fixer.fix_a2ui_json('```json\n{"n": 1}\n```')
+
+    assert json.loads(result.json_string) == {"n": 1}
+    assert result.fixes == ["Removed markdown code fence"]
+
+
+def test_fixes_single_quotes_and_trailing_commas():
+    result = a2ui_json_fixer.fix_a2ui_json(
+        "[{'beginRendering': {'surfaceId': 's', 'root': 'say \"hi\" it\\'s',},},]"
+    )
+
+    assert json.loads(result.json_string) == [
+        {"beginRendering": {"surfaceId": "s", "root": 'say "hi" it\'s'}}
+    ]
+    assert len(result.fixes) == 2
+
+
+def test_closes_truncated_json():
+    truncated = json.dumps(MESSAGES)[:-4]
+
+    result = a2ui_json_fixer.fix_a2ui_json(truncated)
+
+    assert json.loads(result.json_string) == MESSAGES
+
+
+def test_renames_literal_keys():
+    result = a2ui_json_fixer.fix_a2ui_json(
+        json.dumps(
+            [
+                {"text": {"literal": "Hi"}},
+                {"value": {"literal": 3}},
+                {"checked": {"literal": True}},
+                {"path": {"path": "/name"}},
+            ]
+        )
+    )
+
+    assert json.loads(result.json_string) == [
+        {"text": {"literalString": "Hi"}},
+        {"value": {"literalNumber": 3}},
+        {"checked": {"literalBoolean": True}},
+        {"path": {"path": "/name"}},
+    ]
+    assert result.was_fixed
+
+
+def test_unfixable_json_is_returned_for_the_caller_to_reject():
+    result = a2ui_json_fixer.fix_a2ui_json('[{"a": }]')
+
+    assert result.json_string == '[{"a": }]'
@@ -0,0 +1,95 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import datetime
+import json
+import logging
+from typing import Any, Optional
+
+from a2a.types import Message, Part, Role, TextPart
+from pydantic import BaseModel, ConfigDict
+
+from a2ui import a2ui_extension, a2ui_logging
+
+
+def test_dump_truncated_json():
+    assert a2ui_logging.dump_truncated_json({"a": [1, 2]}) == '{"a": [1, 2]}'
+    assert (
+        a2ui_logging.dump_truncated_json({"a": "x" * 100}, max_length=10)
+        == '{"a": "xxx...'
+    )
+    assert a2ui_logging.dump_truncated_json("plain text", max_length=5) == "plain..."
+    assert a2ui_logging.dump_truncated_json("x" * 300, max_length=None) == "x" * 300
+
+
+def test_dump_truncated_json_pydantic_model():
+    part = a2ui_extension.create_a2ui_part({"beginRendering": {"surfaceId": "s"}})
+
+    assert a2ui_logging.dump_truncated_json(part) == (
+        '{"data": {"beginRendering": {"surfaceId": "s"}}, "kind": "data", '
+        '"metadata": {"mimeType": "application/json+a2ui"}}'
+    )
+
+
+def test_dump_truncated_json_nested_pydantic_models_match_model_dump():
+    class Event(BaseModel):
+        message: Message
+        timestamp: datetime.datetime
+        error: Optional[str] = None
+
+    event = Event(
+        message=Message(
+            message_id="m1",
+            role=Role.agent,
+            parts=[
+                a2ui_extension.create_a2ui_part({"deleteSurface": {"surfaceId": "s"}}),
+                Part(root=TextPart(text="done")),
+            ],
+        ),
+        timestamp=datetime.datetime(2025, 1, 2, 3, 4, 5),
+    )
+
+    assert json.loads(a2ui_logging.dump_truncated_json(event, max_length=None)) == (
+        event.model_dump(mode="json", exclude_none=True, by_alias=True)
+    )
+
+
+def test_dump_truncated_json_stops_converting_models_at_max_length():
+    class Unserializable:
+        def __str__(self):
+            raise AssertionError("Should not be serialized")
+
+    class Item(BaseModel):
+        model_config = ConfigDict(arbitrary_types_allowed=True)
+
+        value: Any
+
+    items = [Item(value=i) for i in range(100)] + [Item(value=Unserializable())]
+
+    assert a2ui_logging.dump_truncated_json(items, max_length=20) == (
+        '[{"value": 0}, {"val...'
+    )
+
+
+def test_lazy_json_is_not_serialized_when_level_is_disabled(caplog):
+    class Unserializable:
+        def __str__(self):
+            raise AssertionError("Should not be serialized")
+
+    logger = logging.getLogger("test_lazy_json")
+    with caplog.at_level(logging.WARNING, logger="test_lazy_json"):
+        logger.info("Value: %s", a2ui_logging.LazyJson(Unserializable()))
+        logger.warning("Value: %s", a2ui_logging.LazyJson({"a": 1}))
+
+    assert caplog.messages == ['Value: {"a": 1}']
@@ -0,0 +1,46 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from a2ui import a2ui_prompt_cache
+
+
+def test_prompt_is_built_once_per_key():
+    cache = a2ui_prompt_cache.A2uiPromptCache()
+    builds = []
+
+    def build_prompt():
+        builds.append(1)
+        return f"prompt {len(builds)}"
+
+    key = a2ui_prompt_cache.A2uiPromptKey("agent", catalog_uri="c", schema_hash="h")
+
+    assert cache.get_prompt(key, build_prompt) == "prompt 1"
+    assert cache.get_prompt(key, build_prompt) == "prompt 1"
+    assert key in cache
+    other_key = key._replace(schema_hash="other")
+    assert cache.get_prompt(other_key, build_prompt) == "prompt 2"
+
+
+def test_prompt_cache_evicts_least_recently_used():
+    cache = a2ui_prompt_cache.A2uiPromptCache(max_size=1)
+    first = a2ui_prompt_cache.A2uiPromptKey("agent", base_url="a")
+    second = a2ui_prompt_cache.A2uiPromptKey("agent", base_url="b")
+
+    cache.get_prompt(first, lambda: "a")
+    cache.get_prompt(second, lambda: "b")
+
+    assert first not in cache
+    assert second in cache
+    cache.clear()
+    assert second not in cache
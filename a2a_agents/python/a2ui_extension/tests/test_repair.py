@@ -0,0 +1,111 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import pytest
+from a2ui import a2ui_repair, a2ui_stream_parser, a2ui_validator
+
+MESSAGE_SCHEMA = {
+    "type": "object",
+    "additionalProperties": False,
+    "properties": {
+        "beginRendering": {
+            "type": "object",
+            "properties": {
+                "surfaceId": {"type": "string"},
+                "root": {"type": "string"},
+            },
+            "required": ["surfaceId", "root"],
+        },
+        "deleteSurface": {
+            "type": "object",
+            "properties": {"surfaceId": {"type": "string"}},
+            "required": ["surfaceId"],
+        },
+    },
+}
+
+VALID_MESSAGE = {"beginRendering": {"surfaceId": "s", "root": "r"}}
+INVALID_MESSAGE = {"beginRendering": {"surfaceId": "s"}}
+
+
+def _make_repair_request():
+    validator = a2ui_validator.A2uiValidatorRegistry().get_validator(MESSAGE_SCHEMA)
+    messages = [VALID_MESSAGE, INVALID_MESSAGE, {"deleteSurface": {"surfaceId": "t"}}]
+    return a2ui_repair.A2uiRepairRequest(
+        text="Here you go.",
+        a2ui_messages=messages,
+        validation_result=validator.validate_messages(messages),
+        message_schema=MESSAGE_SCHEMA,
+    )
+
+
+def test_get_schema_fragment_returns_failing_sub_schema():
+    validator = a2ui_validator.A2uiValidatorRegistry().get_validator(MESSAGE_SCHEMA)
+    error = validator.validate_messages([INVALID_MESSAGE]).errors[0].error
+
+    fragment = a2ui_repair.get_schema_fragment(MESSAGE_SCHEMA, error)
+
+    assert fragment == MESSAGE_SCHEMA["properties"]["beginRendering"]
+
+
+def test_build_prompt_contains_only_failing_message():
+    prompt = _make_repair_request().build_prompt()
+
+    assert "Message 1:" in prompt
+    assert "'/1/beginRendering'" in prompt
+    assert json.dumps(INVALID_MESSAGE, separators=(",", ":")) in prompt
+    assert "deleteSurface" not in prompt
+    assert a2ui_stream_parser.A2UI_JSON_DELIMITER in prompt
+
+
+def test_build_prompt_omits_large_fragments():
+    prompt = _make_repair_request().build_prompt(max_fragment_chars=10)
+
+    assert "See the A2UI JSON SCHEMA" in prompt
+
+
+def test_apply_splices_repaired_messages():
+    request = _make_repair_request()
+    repaired = {"beginRendering": {"surfaceId": "s", "root": "fixed"}}
+
+    content = request.apply("---a2ui_JSON---" + json.dumps([repaired]))
+
+    text, messages = a2ui_stream_parser.parse_a2ui_response(content)
+    assert text == "Here you go."
+    assert messages == [VALID_MESSAGE, repaired, {"deleteSurface": {"surfaceId": "t"}}]
+
+
+def test_apply_rejects_wrong_number_of_messages():
+    with pytest.raises(ValueError):
+        _make_repair_request().apply("---a2ui_JSON---[]")
+
+
+def test_try_apply_returns_none_on_wrong_number_of_messages():
+    request = _make_repair_request()
+    # A reply that is valid A2UI by itself, but has more messages than failed.
+    repair_response = "---a2ui_JSON---" + json.dumps(
+        [VALID_MESSAGE, {"deleteSurface": {"surfaceId": "t"}}]
+    )
+
+    assert request.try_apply(repair_response) is None
+
+
+def test_try_apply_returns_spliced_response():
+    request = _make_repair_request()
+    repaired = {"beginRendering": {"surfaceId": "s", "root": "fixed"}}
+    repair_response = "---a2ui_JSON---" + json.dumps([repaired])
+
+    assert request.try_apply(repair_response) == request.apply(repair_response)
@@ -0,0 +1,109 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+from a2ui import a2ui_schema_prompt
+
+COMPONENTS = {
+    "Text": {"type": "object"},
+    "Image": {"type": "object"},
+    "Column": {"type": "object"},
+}
+
+
+def _schema(component_properties):
+    return {
+        "type": "object",
+        "properties": {
+            "surfaceUpdate": {
+                "type": "object",
+                "properties": {
+                    "components": {
+                        "type": "array",
+                        "items": {
+                            "type": "object",
+                            "properties": {
+                                "component": {
+                                    "type": "object",
+                                    "properties": component_properties,
+                                }
+                            },
+                        },
+                    }
+                },
+            }
+        },
+    }
+
+
+def _component_properties(schema):
+    return schema["properties"]["surfaceUpdate"]["properties"]["components"][
+        "items"
+    ]["properties"]["component"]["properties"]
+
+
+def _component_names(schema_prompt):
+    schema = json.loads(schema_prompt)
+    return set(a2ui_schema_prompt._get_component_definitions(schema))
+
+
+EXAMPLES = """
+---BEGIN EXAMPLE---
+[{{ "surfaceUpdate": {{ "components": [
+  {{ "id": "root", "component": {{ "Column": {{ "children": {{ "explicitList": ["t"] }} }} }} }},
+  {{ "id": "t", "component": {{
+    "Text": {{ "text": {{ "literalString": "{base_url}" }} }} }} }}
+] }} }}]
+---END EXAMPLE---
+"""
+
+
+def test_find_component_types():
+    assert a2ui_schema_prompt.find_component_types(EXAMPLES) == {"Column", "Text"}
+    assert a2ui_schema_prompt.find_component_types(
+        [EXAMPLES, '{"component": {"Image": {}}}']
+    ) == {"Column", "Text", "Image"}
+
+
+def test_build_schema_prompt_prunes_and_minifies():
+    schema = _schema(dict(COMPONENTS))
+
+    schema_prompt = a2ui_schema_prompt.build_schema_prompt(
+        json.dumps(schema, indent=2), EXAMPLES
+    )
+
+    assert _component_names(schema_prompt) == {"Column", "Text"}
+    assert "\n" not in schema_prompt and ", " not in schema_prompt
+    # The input schema is left untouched.
+    assert set(_component_properties(schema)) == set(COMPONENTS)
+
+
+def test_build_schema_prompt_prunes_merged_catalog():
+    schema = _schema(
+        {"components": {"$ref": "standard.json", **COMPONENTS}, "styles": {}}
+    )
+
+    schema_prompt = a2ui_schema_prompt.build_schema_prompt(schema, EXAMPLES)
+
+    assert _component_names(schema_prompt) == {"$ref", "Column", "Text"}
+    assert "styles" in _component_properties(json.loads(schema_prompt))
+
+
+def test_build_schema_prompt_without_known_components_uses_full_schema():
+    schema = _schema(dict(COMPONENTS))
+
+    schema_prompt = a2ui_schema_prompt.build_schema_prompt(schema, "No examples.")
+
+    assert _component_names(schema_prompt) == set(COMPONENTS)
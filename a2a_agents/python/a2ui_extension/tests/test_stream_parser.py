@@ -0,0 +1,225 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+
+import pytest
+from a2ui import a2ui_stream_parser, a2ui_validator
+
+MESSAGES = [
+    {"beginRendering": {"surfaceId": "s", "root": "root-column"}},
+    {
+        "surfaceUpdate": {
+            "surfaceId": "s",
+            "components": [
+                {
+                    "id": "title",
+                    "component": {
+                        "Text": {"text": {"literalString": 'Braces } and "quotes" {'}}
+                    },
+                }
+            ],
+        }
+    },
+]
+
+RESPONSE = (
+    "Here are your results.\n---a2ui_JSON---\n```json\n"
+    + json.dumps(MESSAGES, indent=2)
+    + "\n```"
+)
+
+
+def test_parser_emits_text_then_each_message_as_it_completes():
+    parser = a2ui_stream_parser.A2uiStreamParser()
+    items = []
+    completed_at = []
+    for i, char in enumerate(RESPONSE):
+        new_items = parser.feed(char)
+        items.extend(new_items)
+        completed_at.extend([i] * len(new_items))
+    items.extend(parser.close())
+
+    assert items == ["Here are your results."] + MESSAGES
+    # The first message is available before the second one is written.
+    assert completed_at[1] < RESPONSE.index('"surfaceUpdate"')
+    assert parser.message_count == 2
+
+
+def test_parser_handles_delimiter_split_across_chunks():
+    parser = a2ui_stream_parser.A2uiStreamParser()
+
+    assert parser.feed("Hello ---a2ui_") == []
+    assert parser.feed("JSON--- [") == ["Hello"]
+    assert parser.feed(json.dumps(MESSAGES[0])) == [MESSAGES[0]]
+    assert parser.feed("]") == []
+    assert parser.close() == []
+
+
+def test_parser_without_delimiter_returns_text_on_close():
+    parser = a2ui_stream_parser.A2uiStreamParser()
+
+    assert parser.feed("Just some text") == []
+    assert parser.close() == ["Just some text"]
+    assert not parser.has_a2ui_json
+    assert parser.close() == []
+
+
+def test_parser_accepts_single_object():
+    text, messages = a2ui_stream_parser.parse_a2ui_response(
+        "Done.---a2ui_JSON---" + json.dumps(MESSAGES[0])
+    )
+
+    assert text == "Done."
+    assert messages == [MESSAGES[0]]
+
+
+def test_parser_accepts_empty_list():
+    text, messages = a2ui_stream_parser.parse_a2ui_response(
+        "I couldn't find anyone by that name.---a2ui_JSON---[]"
+    )
+
+    assert text == "I couldn't find anyone by that name."
+    assert messages == []
+
+
+def test_parser_rejects_truncated_json():
+    with pytest.raises(ValueError):
+        a2ui_stream_parser.parse_a2ui_response(
+            "Text---a2ui_JSON---" + json.dumps(MESSAGES)[:-10]
+        )
+
+
+def test_parser_skips_invalid_messages_while_streaming():
+    parser = a2ui_stream_parser.A2uiStreamParser()
+
+    items = parser.feed("Text---a2ui_JSON---[{'bad': 1}, " + json.dumps(MESSAGES[0]) + "]")
+
+    assert items == ["Text", MESSAGES[0]]
+    assert len(parser.errors) == 1
+    with pytest.raises(json.JSONDecodeError):
+        a2ui_stream_parser.parse_a2ui_response("Text---a2ui_JSON---[{'bad': 1}]")
+
+
+def _make_streamer():
+    # Only beginRendering messages are valid, so the surfaceUpdate is skipped.
+    validator = a2ui_validator.A2uiValidatorRegistry().get_validator(
+        {"type": "object", "required": ["beginRendering"]}
+    )
+    return a2ui_stream_parser.A2uiMessageStreamer(validator)
+
+
+def test_streamer_returns_only_valid_messages():
+    streamer = _make_streamer()
+
+    assert streamer.feed("Text---a2ui_JSON---") == []
+    assert streamer.feed(json.dumps(MESSAGES)) == [MESSAGES[0]]
+
+
+def test_streamer_parses_each_response_separately():
+    streamer = _make_streamer()
+    streamer.feed("Text---a2ui_JSON---[" + json.dumps(MESSAGES[0])[:-5])
+
+    streamer.end_response()
+
+    assert streamer.feed("Text---a2ui_JSON---" + json.dumps(MESSAGES)) == [MESSAGES[0]]
+
+
+def test_streamer_returns_nothing_once_stopped():
+    streamer = _make_streamer()
+
+    streamer.stop()
+
+    assert streamer.feed("Text---a2ui_JSON---" + json.dumps(MESSAGES)) == []
+
+
+def test_streamer_abandon_deletes_streamed_surfaces():
+    streamer = a2ui_stream_parser.A2uiMessageStreamer(
+        a2ui_validator.A2uiValidatorRegistry().get_validator({"type": "object"})
+    )
+    streamer.feed(
+        "Text---a2ui_JSON---"
+        + json.dumps(
+            MESSAGES
+            + [
+                {"beginRendering": {"surfaceId": "t", "root": "root"}},
+                {"beginRendering": {"surfaceId": "old", "root": "root"}},
+                {"deleteSurface": {"surfaceId": "old"}},
+            ]
+        )
+    )
+
+    assert streamer.abandon() == [
+        {"deleteSurface": {"surfaceId": "s"}},
+        {"deleteSurface": {"surfaceId": "t"}},
+    ]
+    assert not streamer.is_streaming
+    assert streamer.abandon() == []
+
+
+def test_streamer_abandon_without_streamed_messages():
+    streamer = _make_streamer()
+
+    assert streamer.abandon() == []
+
+
+def test_streamer_without_validator_does_not_stream():
+    streamer = a2ui_stream_parser.A2uiMessageStreamer(None)
+
+    assert not streamer.is_streaming
+    assert streamer.feed("Text---a2ui_JSON---" + json.dumps(MESSAGES)) == []
+
+
+def test_get_undelivered_messages():
+    delete = {"deleteSurface": {"surfaceId": "other"}}
+    reordered = {"beginRendering": {"root": "root-column", "surfaceId": "s"}}
+
+    undelivered = a2ui_stream_parser.get_undelivered_messages(
+        MESSAGES + [delete, delete], [reordered, delete]
+    )
+
+    assert undelivered == [MESSAGES[1], delete]
+
+
+def test_get_undelivered_messages_resends_deleted_surfaces():
+    delete = {"deleteSurface": {"surfaceId": "s"}}
+
+    undelivered = a2ui_stream_parser.get_undelivered_messages(
+        MESSAGES, MESSAGES + [delete]
+    )
+
+    assert undelivered == MESSAGES
+
+
+def test_get_undelivered_messages_after_surface_is_redrawn():
+    delete = {"deleteSurface": {"surfaceId": "s"}}
+
+    undelivered = a2ui_stream_parser.get_undelivered_messages(
+        MESSAGES, MESSAGES + [delete, MESSAGES[0]]
+    )
+
+    assert undelivered == [MESSAGES[1]]
+
+
+@pytest.mark.parametrize(
+    "message, surface_id",
+    [
+        (MESSAGES[0], "s"),
+        (MESSAGES[1], "s"),
+        ({"deleteSurface": {"surfaceId": "t"}}, "t"),
+        ({"unknown": {}}, None),
+    ],
+)
+def test_get_surface_id(message, surface_id):
+    assert a2ui_stream_parser.get_surface_id(message) == surface_id
@@ -0,0 +1,208 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import copy
+import json
+import pickle
+
+import jsonschema
+import pytest
+from a2ui import a2ui_validator
+
+MESSAGE_SCHEMA = {
+    "type": "object",
+    "additionalProperties": False,
+    "properties": {
+        "beginRendering": {
+            "type": "object",
+            "properties": {
+                "surfaceId": {"type": "string"},
+                "root": {"type": "string"},
+            },
+            "required": ["surfaceId", "root"],
+        },
+        "surfaceUpdate": {
+            "type": "object",
+            "properties": {
+                "surfaceId": {"type": "string"},
+                "components": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "id": {"type": "string"},
+                            "component": {
+                                "type": "object",
+                                "additionalProperties": False,
+                            },
+                        },
+                    },
+                },
+            },
+        },
+    },
+}
+
+CATALOG = {"Text": {"type": "object"}}
+
+
+def test_validator_accepts_valid_messages():
+    validator = a2ui_validator.A2uiValidatorRegistry().get_validator(MESSAGE_SCHEMA)
+
+    validator.validate([{"beginRendering": {"surfaceId": "s", "root": "r"}}])
+    assert validator.is_valid([])
+
+
+def test_validator_rejects_invalid_messages():
+    validator = a2ui_validator.A2uiValidatorRegistry().get_validator(MESSAGE_SCHEMA)
+
+    with pytest.raises(jsonschema.exceptions.ValidationError):
+        validator.validate([{"beginRendering": {"surfaceId": "s"}}])
+    with pytest.raises(jsonschema.exceptions.ValidationError):
+        validator.validate_message({"unknownMessage": {}})
+
+
+def test_registry_reuses_validator_for_same_content():
+    registry = a2ui_validator.A2uiValidatorRegistry()
+
+    schema_str = json.dumps(MESSAGE_SCHEMA)
+
+    from_dict = registry.get_validator(MESSAGE_SCHEMA)
+    from_copy = registry.get_validator(json.loads(schema_str))
+    from_str = registry.get_validator(schema_str)
+
+    assert from_dict is from_copy
+    assert from_str is registry.get_validator(schema_str)
+    assert from_str.message_schema == MESSAGE_SCHEMA
+
+
+def test_registry_keys_by_catalog():
+    registry = a2ui_validator.A2uiValidatorRegistry()
+
+    without_catalog = registry.get_validator(MESSAGE_SCHEMA)
+    with_catalog = registry.get_validator(MESSAGE_SCHEMA, CATALOG)
+
+    assert without_catalog is not with_catalog
+    assert registry.get_validator(MESSAGE_SCHEMA, CATALOG) is with_catalog
+
+    message = {
+        "surfaceUpdate": {
+            "surfaceId": "s",
+            "components": [{"id": "c", "component": {"Text": {}}}],
+        }
+    }
+    assert with_catalog.is_valid([message])
+    assert not without_catalog.is_valid([message])
+
+
+def test_merge_catalog_does_not_mutate_schema():
+    original = json.dumps(MESSAGE_SCHEMA, sort_keys=True)
+
+    merged = a2ui_validator.merge_catalog_into_schema(MESSAGE_SCHEMA, CATALOG)
+
+    assert json.dumps(MESSAGE_SCHEMA, sort_keys=True) == original
+    component = merged["properties"]["surfaceUpdate"]["properties"]["components"][
+        "items"
+    ]["properties"]["component"]
+    assert component["properties"] == CATALOG
+
+
+@pytest.mark.parametrize(
+    "modify",
+    [
+        lambda schema: schema.update({"type": "array"}),
+        lambda schema: schema.pop("type"),
+        lambda schema: schema["properties"].__setitem__("deleteSurface", {}),
+        lambda schema: schema["properties"]["beginRendering"]["required"].append("x"),
+    ],
+)
+def test_validator_schema_is_read_only(modify):
+    validator = a2ui_validator.A2uiValidatorRegistry().get_validator(MESSAGE_SCHEMA)
+
+    with pytest.raises(TypeError):
+        modify(validator.message_schema)
+    assert validator.message_schema == MESSAGE_SCHEMA
+
+
+def test_validator_schema_copies_are_mutable():
+    schema = a2ui_validator.A2uiValidatorRegistry().get_validator(MESSAGE_SCHEMA).message_schema
+
+    for schema_copy in (copy.deepcopy(schema), pickle.loads(pickle.dumps(schema))):
+        schema_copy["properties"]["beginRendering"]["required"].append("x")
+        assert type(schema_copy) is dict
+    assert json.loads(json.dumps(schema)) == MESSAGE_SCHEMA
+    assert schema["properties"]["beginRendering"]["required"] == ["surfaceId", "root"]
+
+
+def test_registry_does_not_freeze_caller_schema():
+    schema = copy.deepcopy(MESSAGE_SCHEMA)
+
+    a2ui_validator.A2uiValidatorRegistry().get_validator(schema)
+
+    schema["type"] = "array"
+
+
+def test_registry_evicts_least_recently_used():
+    registry = a2ui_validator.A2uiValidatorRegistry(max_size=1)
+
+    first = registry.get_validator(MESSAGE_SCHEMA)
+    registry.get_validator(MESSAGE_SCHEMA, CATALOG)
+
+    assert registry.get_validator(MESSAGE_SCHEMA) is not first
+
+
+def test_registry_looks_up_validator_by_hash():
+    registry = a2ui_validator.A2uiValidatorRegistry()
+
+    validator = registry.get_validator(MESSAGE_SCHEMA, CATALOG)
+
+    assert registry.get_validator_by_hash(validator.schema_hash) is validator
+    assert registry.get_validator_by_hash("unknown") is None
+
+
+def test_get_a2ui_validator_uses_shared_registry():
+    assert a2ui_validator.get_a2ui_validator(
+        MESSAGE_SCHEMA
+    ) is a2ui_validator.get_a2ui_validator(MESSAGE_SCHEMA)
+
+
+def test_validate_messages_reports_index_and_pointer():
+    validator = a2ui_validator.A2uiValidatorRegistry().get_validator(MESSAGE_SCHEMA)
+    messages = [
+        {"beginRendering": {"surfaceId": "s", "root": "r"}},
+        {"surfaceUpdate": {"surfaceId": "s", "components": [{"id": 1}]}},
+        {"beginRendering": {"surfaceId": "t", "root": "r"}},
+    ]
+
+    result = validator.validate_messages(messages)
+
+    assert not result.is_valid
+    assert result.failed_indices == [1]
+    assert result.errors[0].json_pointer == "/1/surfaceUpdate/components/0/id"
+    assert sorted(result.valid_messages) == [0, 2]
+    assert result.valid_prefix() == [messages[0]]
+
+
+def test_validate_messages_accepts_valid_list_and_single_message():
+    validator = a2ui_validator.A2uiValidatorRegistry().get_validator(MESSAGE_SCHEMA)
+    message = {"beginRendering": {"surfaceId": "s", "root": "r"}}
+
+    assert validator.validate_messages([message, message]).is_valid
+    assert validator.validate_messages(message).valid_prefix() == [message]
+    with pytest.raises(jsonschema.exceptions.ValidationError):
+        validator.validate_messages("not a list")
+
+
+def test_to_json_pointer_escapes_tokens():
+    assert a2ui_validator.to_json_pointer([0, "a/b", "c~d"]) == "/0/a~1b/c~0d"
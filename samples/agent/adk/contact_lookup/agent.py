@@ -19,11 +19,17 @@ from collections.abc import AsyncIterable
 from typing import Any
 
 import jsonschema
+from a2ui.a2ui_json_fixer import fix_a2ui_json
+from a2ui.a2ui_logging import LazyJson
+from a2ui.a2ui_repair import A2uiRepairRequest
+from a2ui.a2ui_stream_parser import A2uiMessageStreamer
+from a2ui.a2ui_validator import get_a2ui_validator
 from a2ui_examples import CONTACT_UI_EXAMPLES
 
 # Corrected imports from our new/refactored files
 from a2ui_schema import A2UI_SCHEMA
 from google.adk.agents.llm_agent import LlmAgent
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.adk.artifacts import InMemoryArtifactService
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
 from google.adk.models.lite_llm import LiteLlm
@@ -58,21 +64,20 @@ class ContactAgent:
             memory_service=InMemoryMemoryService(),
         )
 
-        # --- MODIFICATION: Wrap the schema ---
-        # Load the A2UI_SCHEMA string into a Python object for validation
-        try:
-            # First, load the schema for a *single message*
-            single_message_schema = json.loads(A2UI_SCHEMA)
+        # Partial responses are only needed to stream A2UI messages.
+        self._run_config = (
+            RunConfig(streaming_mode=StreamingMode.SSE) if use_ui else None
+        )
 
-            # The prompt instructs the LLM to return a *list* of messages.
-            # Therefore, our validation schema must be an *array* of the single message schema.
-            self.a2ui_schema_object = {"type": "array", "items": single_message_schema}
-            logger.info(
-                "A2UI_SCHEMA successfully loaded and wrapped in an array validator."
-            )
+        # --- MODIFICATION: Compile the schema validator ---
+        # Load the A2UI_SCHEMA string into a shared, compiled validator.
+        # The validator checks the *list* of messages the prompt asks the LLM for.
+        try:
+            self.a2ui_validator = get_a2ui_validator(A2UI_SCHEMA)
+            logger.info("A2UI_SCHEMA successfully loaded into a compiled validator.")
         except json.JSONDecodeError as e:
             logger.error(f"CRITICAL: Failed to parse A2UI_SCHEMA: {e}")
-            self.a2ui_schema_object = None
+            self.a2ui_validator = None
         # --- END MODIFICATION ---
 
     def get_processing_message(self) -> str:
@@ -118,9 +123,11 @@ class ContactAgent:
         max_retries = 1  # Total 2 attempts
         attempt = 0
         current_query_text = query
+        # Set when only some A2UI messages failed, so the retry repairs just those.
+        repair_request = None
 
         # Ensure schema was loaded
-        if self.use_ui and self.a2ui_schema_object is None:
+        if self.use_ui and self.a2ui_validator is None:
             logger.error(
                 "--- ContactAgent.stream: A2UI_SCHEMA is not loaded. "
                 "Cannot perform UI validation. ---"
@@ -134,8 +141,26 @@ class ContactAgent:
             }
             return
 
+        # Stream model output so that A2UI messages can be sent to the client
+        # as soon as the model finishes writing each one.
+        a2ui_streamer = A2uiMessageStreamer(self.a2ui_validator)
+
         while attempt <= max_retries:
             attempt += 1
+            if attempt > 1:
+                # Messages from a retry or repair are only sent with the final
+                # response, once it has been validated.
+                if repair_request is not None:
+                    # The valid messages already streamed are kept by the repair.
+                    a2ui_streamer.stop()
+                else:
+                    # The whole response is regenerated, so take down the
+                    # surfaces the abandoned attempt drew.
+                    for a2ui_message in a2ui_streamer.abandon():
+                        yield {
+                            "is_task_complete": False,
+                            "a2ui_message": a2ui_message,
+                        }
             logger.info(
                 f"--- ContactAgent.stream: Attempt {attempt}/{max_retries + 1} "
                 f"for session {session_id} ---"
@@ -150,8 +175,20 @@ class ContactAgent:
                 user_id=self._user_id,
                 session_id=session.id,
                 new_message=current_message,
+                run_config=self._run_config,
             ):
-                logger.info(f"Event from runner: {event}")
+                if event.partial:
+                    if event.content and event.content.parts:
+                        for part in event.content.parts:
+                            for a2ui_message in a2ui_streamer.feed(part.text or ""):
+                                yield {
+                                    "is_task_complete": False,
+                                    "a2ui_message": a2ui_message,
+                                }
+                    continue
+                # Each model response is streamed separately.
+                a2ui_streamer.end_response()
+                logger.info("Event from runner: %s", LazyJson(event))
                 if event.is_final_response():
                     if (
                         event.content
@@ -163,7 +200,7 @@ class ContactAgent:
                         )
                     break  # Got the final response, stop consuming events
                 else:
-                    logger.info(f"Intermediate event: {event}")
+                    logger.info("Intermediate event: %s", LazyJson(event))
                     # Yield intermediate updates on every attempt
                     yield {
                         "is_task_complete": False,
@@ -180,20 +217,35 @@ class ContactAgent:
                         "I received no response. Please try again."
                         f"Please retry the original request: '{query}'"
                     )
+                    repair_request = None
                     continue  # Go to next retry
                 else:
                     # Retries exhausted on no-response
                     final_response_content = "I'm sorry, I encountered an error and couldn't process your request."
                     # Fall through to send this as a text-only error
 
+            repair_failed = False
+            if repair_request is not None and final_response_content is not None:
+                repaired_content = repair_request.try_apply(final_response_content)
+                if repaired_content is None:
+                    # The reply only holds the repaired messages, so it is never
+                    # a response on its own; count this attempt as invalid.
+                    repair_failed = True
+                else:
+                    final_response_content = repaired_content
+                repair_request = None
+
             is_valid = False
             error_message = ""
+            validation_result = None
 
             if self.use_ui:
                 logger.info(
                     f"--- ContactAgent.stream: Validating UI response (Attempt {attempt})... ---"
                 )
                 try:
+                    if repair_failed:
+                        raise ValueError("Could not apply the repaired A2UI messages")
                     if "---a2ui_JSON---" not in final_response_content:
                         raise ValueError("Delimiter '---a2ui_JSON---' not found.")
 
@@ -201,10 +253,20 @@ class ContactAgent:
                         "---a2ui_JSON---", 1
                     )
 
+                    # Fix mechanical mistakes (code fences, trailing commas, ...) locally
+                    # instead of spending a retry on them.
+                    json_fix_result = fix_a2ui_json(json_string)
+                    json_string_cleaned = json_fix_result.json_string
+                    if json_fix_result.was_fixed:
+                        logger.info(
+                            f"--- ContactAgent.stream: Fixed A2UI JSON locally: {json_fix_result.fixes} ---"
+                        )
+                        # The client parses the final response, so it must get the fixed JSON.
+                        final_response_content = (
+                            f"{text_part}---a2ui_JSON---\n{json_string_cleaned}"
+                        )
+
                     # Handle the "no results found" case
-                    json_string_cleaned = (
-                        json_string.strip().lstrip("```json").rstrip("```").strip()
-                    )
                     if not json_string.strip() or json_string_cleaned == "[]":
                         logger.info(
                             "--- ContactAgent.stream: Empty JSON list found. Assuming valid (e.g., 'no results'). ---"
@@ -220,13 +282,23 @@ class ContactAgent:
                         parsed_json_data = json.loads(json_string_cleaned)
 
                         # 2. Check if it validates against the A2UI_SCHEMA
-                        # This will raise jsonschema.exceptions.ValidationError if it fails
+                        # This will raise a ValueError naming each failing message
                         logger.info(
                             "--- ContactAgent.stream: Validating against A2UI_SCHEMA... ---"
                         )
-                        jsonschema.validate(
-                            instance=parsed_json_data, schema=self.a2ui_schema_object
+                        # Each message is checked on its own so the error names exactly
+                        # which messages failed and where.
+                        validation_result = self.a2ui_validator.validate_messages(
+                            parsed_json_data
                         )
+                        if not validation_result.is_valid:
+                            logger.info(
+                                f"--- ContactAgent.stream: {len(validation_result.valid_messages)} messages valid, "
+                                f"messages {validation_result.failed_indices} failed. ---"
+                            )
+                            raise ValueError(
+                                "; ".join(str(error) for error in validation_result.errors)
+                            )
                         # --- End New Validation Steps ---
 
                         logger.info(
@@ -247,6 +319,17 @@ class ContactAgent:
                         f"--- Failed response content: {final_response_content[:500]}... ---"
                     )
                     error_message = f"Validation failed: {e}."
+                    if validation_result is not None and not validation_result.is_valid:
+                        repair_request = A2uiRepairRequest(
+                            text=text_part.strip(),
+                            a2ui_messages=(
+                                parsed_json_data
+                                if isinstance(parsed_json_data, list)
+                                else [parsed_json_data]
+                            ),
+                            validation_result=validation_result,
+                            message_schema=self.a2ui_validator.message_schema,
+                        )
 
             else:  # Not using UI, so text is always "valid"
                 is_valid = True
@@ -255,7 +338,7 @@ class ContactAgent:
                 logger.info(
                     f"--- ContactAgent.stream: Response is valid. Sending final response (Attempt {attempt}). ---"
                 )
-                logger.info(f"Final response: {final_response_content}")
+                logger.info("Final response: %s", LazyJson(final_response_content))
                 yield {
                     "is_task_complete": True,
                     "content": final_response_content,
@@ -269,19 +352,29 @@ class ContactAgent:
                     f"--- ContactAgent.stream: Retrying... ({attempt}/{max_retries + 1}) ---"
                 )
                 # Prepare the query for the retry
-                current_query_text = (
-                    f"Your previous response was invalid. {error_message} "
-                    "You MUST generate a valid response that strictly follows the A2UI JSON SCHEMA. "
-                    "The response MUST be a JSON list of A2UI messages. "
-                    "Ensure the response is split by '---a2ui_JSON---' and the JSON part is well-formed. "
-                    f"Please retry the original request: '{query}'"
-                )
+                if repair_request is not None:
+                    # Only the failing messages are regenerated; the valid ones are kept.
+                    current_query_text = repair_request.build_prompt()
+                else:
+                    current_query_text = (
+                        f"Your previous response was invalid. {error_message} "
+                        "You MUST generate a valid response that strictly follows the A2UI JSON SCHEMA. "
+                        "The response MUST be a JSON list of A2UI messages. "
+                        "Ensure the response is split by '---a2ui_JSON---' and the JSON part is well-formed. "
+                        f"Please retry the original request: '{query}'"
+                    )
                 # Loop continues...
 
         # --- If we're here, it means we've exhausted retries ---
         logger.error(
             "--- ContactAgent.stream: Max retries exhausted. Sending text-only error. ---"
         )
+        # Don't leave a half-drawn surface next to the error.
+        for a2ui_message in a2ui_streamer.abandon():
+            yield {
+                "is_task_complete": False,
+                "a2ui_message": a2ui_message,
+            }
         yield {
             "is_task_complete": True,
             "content": (
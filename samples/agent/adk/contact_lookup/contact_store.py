@@ -0,0 +1,151 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import logging
+import os
+import threading
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# The base URL the image URLs in contact_data.json are written with.
+DEFAULT_BASE_URL = "http://localhost:10002"
+
+# Names are indexed by all substrings of this length.
+NGRAM_SIZE = 3
+
+
+def _ngrams(text: str) -> set[str]:
+    return {text[i : i + NGRAM_SIZE] for i in range(len(text) - NGRAM_SIZE + 1)}
+
+
+@dataclass
+class _ContactIndex:
+    """An immutable snapshot of the contacts and their indexes."""
+
+    contacts: list[dict[str, Any]] = field(default_factory=list)
+    names: list[str] = field(default_factory=list)
+    """The lowercase name of each contact."""
+    name_ngrams: dict[str, set[int]] = field(default_factory=dict)
+    """Maps each name n-gram to the indices of the contacts containing it."""
+    departments: dict[str, list[int]] = field(default_factory=dict)
+    """Maps each lowercase department to the indices of its contacts."""
+    mtime_ns: Optional[int] = None
+
+
+def _build_index(contacts: list[dict[str, Any]], mtime_ns: int) -> _ContactIndex:
+    names = [contact.get("name", "").lower() for contact in contacts]
+    name_ngrams: dict[str, set[int]] = defaultdict(set)
+    departments: dict[str, list[int]] = defaultdict(list)
+    for index, (contact, name) in enumerate(zip(contacts, names)):
+        for ngram in _ngrams(name):
+            name_ngrams[ngram].add(index)
+        departments[contact.get("department", "").lower()].append(index)
+    return _ContactIndex(
+        contacts=contacts,
+        names=names,
+        name_ngrams=dict(name_ngrams),
+        departments=dict(departments),
+        mtime_ns=mtime_ns,
+    )
+
+
+class ContactStore:
+    """An in-memory, indexed view of a contact data file.
+
+    The file is parsed once, with the base URL rewritten at load time, and
+    reloaded when its modification time changes. Names are matched by
+    case-insensitive substring using an n-gram index, and departments through
+    an index of the distinct departments.
+    """
+
+    def __init__(self, file_path: str, base_url: Optional[str] = None):
+        self._file_path = file_path
+        self._base_url = base_url
+        self._index = _ContactIndex()
+        self._lock = threading.Lock()
+
+    def _get_index(self) -> _ContactIndex:
+        mtime_ns = os.stat(self._file_path).st_mtime_ns
+        if self._index.mtime_ns == mtime_ns:
+            return self._index
+
+        with self._lock:
+            if self._index.mtime_ns != mtime_ns:
+                with open(self._file_path) as f:
+                    contact_data_str = f.read()
+                if self._base_url:
+                    contact_data_str = contact_data_str.replace(
+                        DEFAULT_BASE_URL, self._base_url
+                    )
+                self._index = _build_index(json.loads(contact_data_str), mtime_ns)
+                logger.info(
+                    f"Loaded {len(self._index.contacts)} contacts from {self._file_path}"
+                )
+            return self._index
+
+    def search(self, name: str, department: str = "") -> list[dict[str, Any]]:
+        """Returns the contacts whose name and department contain the given text.
+
+        Args:
+            name: Text to match anywhere in the name, ignoring case.
+            department: Optional text to match anywhere in the department,
+              ignoring case.
+
+        Returns:
+            The matching contacts, in file order.
+
+        Raises:
+            FileNotFoundError: If the contact data file does not exist.
+            json.JSONDecodeError: If the contact data file is not valid JSON.
+        """
+        index = self._get_index()
+        name_lower = name.lower()
+
+        if len(name_lower) >= NGRAM_SIZE:
+            postings = [index.name_ngrams.get(ngram, set()) for ngram in _ngrams(name_lower)]
+            candidates = set.intersection(*postings) if postings else set()
+        else:
+            # Too short for the n-gram index; every name is a candidate.
+            candidates = range(len(index.contacts))
+
+        if department:
+            dept_lower = department.lower()
+            in_department = {
+                i
+                for dept, indices in index.departments.items()
+                if dept_lower in dept
+                for i in indices
+            }
+            candidates = [i for i in candidates if i in in_department]
+
+        return [
+            index.contacts[i] for i in sorted(candidates) if name_lower in index.names[i]
+        ]
+
+
+_stores: dict[tuple[str, Optional[str]], ContactStore] = {}
+_stores_lock = threading.Lock()
+
+
+def get_contact_store(file_path: str, base_url: Optional[str] = None) -> ContactStore:
+    """Returns the shared contact store for the file and base URL."""
+    key = (file_path, base_url)
+    with _stores_lock:
+        if (store := _stores.get(key)) is None:
+            store = _stores[key] = ContactStore(file_path, base_url)
+        return store
@@ -0,0 +1,151 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import os
+
+import pytest
+import contact_store
+
+CONTACTS = [
+    {
+        "name": "Alex Jordan",
+        "department": "Marketing",
+        "imageUrl": "http://localhost:10002/static/profile1.png",
+    },
+    {
+        "name": "Lee",
+        "department": "Engineering",
+        "imageUrl": "http://localhost:10002/static/profile2.png",
+    },
+    {
+        "name": "Jordan Lee",
+        "department": "Engineering",
+        "imageUrl": "http://localhost:10002/static/profile3.png",
+    },
+    {
+        "name": "Alexandra Ng",
+        "department": "Product Marketing",
+        "imageUrl": "http://localhost:10002/static/profile4.png",
+    },
+]
+
+
+def _write_contacts(file_path, contacts):
+    with open(file_path, "w") as f:
+        json.dump(contacts, f)
+
+
+@pytest.fixture
+def contact_file(tmp_path):
+    file_path = tmp_path / "contact_data.json"
+    _write_contacts(file_path, CONTACTS)
+    return file_path
+
+
+@pytest.fixture
+def store(contact_file):
+    return contact_store.ContactStore(str(contact_file))
+
+
+def _names(contacts):
+    return [contact["name"] for contact in contacts]
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("", ["Alex Jordan", "Lee", "Jordan Lee", "Alexandra Ng"]),
+        ("e", ["Alex Jordan", "Lee", "Jordan Lee", "Alexandra Ng"]),
+        ("ng", ["Alexandra Ng"]),
+        ("LE", ["Alex Jordan", "Lee", "Jordan Lee", "Alexandra Ng"]),
+    ],
+)
+def test_search_name_shorter_than_ngram_size(store, name, expected):
+    assert len(name) < contact_store.NGRAM_SIZE
+
+    assert _names(store.search(name)) == expected
+
+
+@pytest.mark.parametrize(
+    "name, expected",
+    [
+        ("alex", ["Alex Jordan", "Alexandra Ng"]),
+        ("JORDAN", ["Alex Jordan", "Jordan Lee"]),
+        ("n lee", ["Jordan Lee"]),
+        ("x jordan", ["Alex Jordan"]),
+        ("lee", ["Lee", "Jordan Lee"]),
+    ],
+)
+def test_search_substring_across_ngrams(store, name, expected):
+    assert _names(store.search(name)) == expected
+
+
+def test_search_unknown_name(store):
+    assert store.search("Taylor") == []
+
+
+@pytest.mark.parametrize(
+    "department, expected",
+    [
+        ("Marketing", ["Alex Jordan", "Alexandra Ng"]),
+        ("product", ["Alexandra Ng"]),
+        ("ENGINEERING", ["Lee", "Jordan Lee"]),
+        ("Sales", []),
+    ],
+)
+def test_search_department_filter(store, department, expected):
+    assert _names(store.search("", department)) == expected
+
+
+def test_search_name_and_department(store):
+    assert _names(store.search("jordan", "engineering")) == ["Jordan Lee"]
+    assert _names(store.search("alex", "product")) == ["Alexandra Ng"]
+
+
+def test_search_rewrites_base_url(contact_file):
+    store = contact_store.ContactStore(str(contact_file), base_url="https://contacts.test")
+
+    assert store.search("Lee")[0]["imageUrl"] == "https://contacts.test/static/profile2.png"
+
+
+def test_search_reloads_after_file_changes(store, contact_file):
+    assert _names(store.search("Alex")) == ["Alex Jordan", "Alexandra Ng"]
+
+    _write_contacts(contact_file, CONTACTS + [{"name": "Alexis Park", "department": "Sales"}])
+    # Set the modification time explicitly, since the write can land within
+    # the file system's timestamp resolution.
+    mtime_ns = os.stat(contact_file).st_mtime_ns + 1_000_000_000
+    os.utime(contact_file, ns=(mtime_ns, mtime_ns))
+
+    assert _names(store.search("Alex")) == ["Alex Jordan", "Alexandra Ng", "Alexis Park"]
+    assert _names(store.search("", "sales")) == ["Alexis Park"]
+
+
+def test_search_does_not_reload_unchanged_file(store, contact_file, monkeypatch):
+    store.search("Alex")
+
+    def fail_build_index(*args):
+        raise AssertionError("index rebuilt for an unchanged file")
+
+    monkeypatch.setattr(contact_store, "_build_index", fail_build_index)
+
+    assert _names(store.search("Jordan")) == ["Alex Jordan", "Jordan Lee"]
+
+
+def test_search_missing_file(tmp_path):
+    store = contact_store.ContactStore(str(tmp_path / "missing.json"))
+
+    with pytest.raises(FileNotFoundError):
+        store.search("Alex")
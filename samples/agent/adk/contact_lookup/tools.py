@@ -16,6 +16,7 @@ import json
 import logging
 import os
 
+from contact_store import get_contact_store
 from google.adk.tools.tool_context import ToolContext
 
 logger = logging.getLogger(__name__)
@@ -34,29 +35,10 @@ def get_contact_info(name: str, tool_context: ToolContext, department: str = "")
     try:
         script_dir = os.path.dirname(__file__)
         file_path = os.path.join(script_dir, "contact_data.json")
-        with open(file_path) as f:
-            contact_data_str = f.read()
-            if base_url := tool_context.state.get("base_url"):                
-                contact_data_str = contact_data_str.replace("http://localhost:10002", base_url)
-                logger.info(f'Updated base URL from tool context: {base_url}')
-            all_contacts = json.loads(contact_data_str)        
-
-        name_lower = name.lower()
-
-        dept_lower = department.lower() if department else ""
-
-        # Filter by name
-        results = [
-            contact for contact in all_contacts if name_lower in contact["name"].lower()
-        ]
-
-        # If department is provided, filter results further
-        if dept_lower:
-            results = [
-                contact
-                for contact in results
-                if dept_lower in contact["department"].lower()
-            ]
+        # The store parses the file once, rewriting image URLs to the base URL,
+        # and reloads it when the file changes.
+        contact_store = get_contact_store(file_path, tool_context.state.get("base_url"))
+        results = contact_store.search(name, department)
 
         logger.info(f"  - Success: Found {len(results)} matching contacts.")
 
@@ -24,6 +24,7 @@ from a2ui.a2ui_extension import get_a2ui_agent_extension
 from agent import GitHubIdeasAgent
 from agent_executor import GitHubIdeasAgentExecutor
 from dotenv import load_dotenv
+from github_client import close_github_client
 from starlette.middleware.cors import CORSMiddleware
 from starlette.staticfiles import StaticFiles
 
@@ -96,6 +97,7 @@ def main(host, port):
         )
 
         app.mount("/static", StaticFiles(directory="images"), name="static")
+        app.add_event_handler("shutdown", close_github_client)
 
         uvicorn.run(app, host=host, port=port)
     except MissingAPIKeyError as e:
@@ -0,0 +1,153 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CACHE_TTL_SECONDS = 30.0
+DEFAULT_CACHE_MAX_ENTRIES = 256
+
+# The cached body is stored decoded, so these headers no longer apply to it.
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+CacheKey = tuple[str, str, str]
+
+
+@dataclass
+class _CachedResponse:
+    status_code: int
+    headers: list[tuple[str, str]]
+    content: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    stored_at: float
+
+
+class ConditionalCachingTransport(httpx.AsyncBaseTransport):
+    """An HTTP transport that caches GET responses and revalidates them.
+
+    Responses with an ETag or Last-Modified header are cached. Within the TTL
+    a cached response is served without a request. After the TTL the request
+    is sent with If-None-Match / If-Modified-Since, and a 304 Not Modified
+    response is answered from the cache. GitHub does not count 304 responses
+    against the rate limit.
+
+    Any other successful request (e.g. posting a comment) drops the cached
+    reads for the same repository, so the next read sees the change.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        ttl_seconds: float = DEFAULT_CACHE_TTL_SECONDS,
+        max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+    ):
+        self._transport = transport
+        self._ttl_seconds = ttl_seconds
+        self._max_entries = max_entries
+        self._entries: OrderedDict[CacheKey, _CachedResponse] = OrderedDict()
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+
+    @staticmethod
+    def _get_key(request: httpx.Request) -> CacheKey:
+        # Responses depend on who is asking and which media type they asked for.
+        return (
+            str(request.url),
+            request.headers.get("Authorization", ""),
+            request.headers.get("Accept", ""),
+        )
+
+    @staticmethod
+    def _get_scope(url: httpx.URL) -> str:
+        # e.g. /repos/{owner}/{repo}
+        return "/".join(url.path.split("/")[:4])
+
+    def _invalidate(self, url: httpx.URL):
+        scope = self._get_scope(url)
+        for key in [key for key in self._entries if self._get_scope(httpx.URL(key[0])) == scope]:
+            del self._entries[key]
+
+    def _to_response(self, request: httpx.Request, entry: _CachedResponse) -> httpx.Response:
+        return httpx.Response(
+            entry.status_code,
+            headers=entry.headers,
+            content=entry.content,
+            request=request,
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            response = await self._transport.handle_async_request(request)
+            if response.status_code < 400:
+                self._invalidate(request.url)
+            return response
+
+        key = self._get_key(request)
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+            if time.monotonic() - entry.stored_at < self._ttl_seconds:
+                self.hits += 1
+                return self._to_response(request, entry)
+            if entry.etag:
+                request.headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                request.headers["If-Modified-Since"] = entry.last_modified
+
+        response = await self._transport.handle_async_request(request)
+
+        if response.status_code == 304 and entry is not None:
+            await response.aclose()
+            self.revalidations += 1
+            entry.stored_at = time.monotonic()
+            return self._to_response(request, entry)
+
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code != 200 or not (etag or last_modified):
+            return response
+
+        self.misses += 1
+        content = await response.aread()
+        await response.aclose()
+        entry = _CachedResponse(
+            status_code=response.status_code,
+            headers=[
+                (name, value)
+                for name, value in response.headers.multi_items()
+                if name.lower() not in _DROPPED_HEADERS
+            ],
+            content=content,
+            etag=etag,
+            last_modified=last_modified,
+            stored_at=time.monotonic(),
+        )
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self._max_entries:
+            self._entries.popitem(last=False)
+        return self._to_response(request, entry)
+
+    async def aclose(self):
+        self._entries.clear()
+        await self._transport.aclose()
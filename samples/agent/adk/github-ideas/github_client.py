@@ -0,0 +1,118 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import os
+from typing import Optional
+
+import httpx
+from github_cache import (
+    DEFAULT_CACHE_MAX_ENTRIES,
+    DEFAULT_CACHE_TTL_SECONDS,
+    ConditionalCachingTransport,
+)
+from github_scheduler import (
+    DEFAULT_BURST,
+    DEFAULT_REQUESTS_PER_SECOND,
+    RateLimitedTransport,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GITHUB_API_URL = "https://api.github.com"
+DEFAULT_MAX_CONNECTIONS = 20
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 10
+DEFAULT_TIMEOUT_SECONDS = 30.0
+
+_client: Optional[httpx.AsyncClient] = None
+_scheduler: Optional[RateLimitedTransport] = None
+
+
+def _get_int_env(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def get_github_api_url() -> str:
+    """Returns the GitHub API base URL.
+
+    Set GITHUB_API_URL to use GitHub Enterprise or a local stand-in server.
+    """
+    return os.getenv("GITHUB_API_URL", DEFAULT_GITHUB_API_URL).rstrip("/")
+
+
+def get_github_client() -> httpx.AsyncClient:
+    """Returns the shared, pooled HTTP client for the GitHub API.
+
+    Connections are kept alive and multiplexed over HTTP/2 between tool
+    calls, so each call does not pay for a new TCP and TLS handshake. The
+    pool size can be set with GITHUB_MAX_CONNECTIONS and
+    GITHUB_MAX_KEEPALIVE_CONNECTIONS.
+
+    GET responses are cached and revalidated with conditional requests, see
+    `ConditionalCachingTransport`. The cache can be tuned with
+    GITHUB_CACHE_TTL_SECONDS and GITHUB_CACHE_MAX_ENTRIES.
+
+    Requests that reach GitHub are scheduled within its rate limit, see
+    `RateLimitedTransport`. The rate can be set with
+    GITHUB_REQUESTS_PER_SECOND and GITHUB_REQUEST_BURST.
+    """
+    global _client, _scheduler
+    if _client is None or _client.is_closed:
+        limits = httpx.Limits(
+            max_connections=_get_int_env(
+                "GITHUB_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS
+            ),
+            max_keepalive_connections=_get_int_env(
+                "GITHUB_MAX_KEEPALIVE_CONNECTIONS", DEFAULT_MAX_KEEPALIVE_CONNECTIONS
+            ),
+        )
+        # Cache hits and 304 revalidations are answered above the scheduler,
+        # so only requests that reach GitHub wait for a token.
+        _scheduler = RateLimitedTransport(
+            httpx.AsyncHTTPTransport(http2=True, limits=limits),
+            requests_per_second=float(
+                os.getenv("GITHUB_REQUESTS_PER_SECOND", DEFAULT_REQUESTS_PER_SECOND)
+            ),
+            burst=_get_int_env("GITHUB_REQUEST_BURST", DEFAULT_BURST),
+        )
+        transport = ConditionalCachingTransport(
+            _scheduler,
+            ttl_seconds=float(
+                os.getenv("GITHUB_CACHE_TTL_SECONDS", DEFAULT_CACHE_TTL_SECONDS)
+            ),
+            max_entries=_get_int_env(
+                "GITHUB_CACHE_MAX_ENTRIES", DEFAULT_CACHE_MAX_ENTRIES
+            ),
+        )
+        _client = httpx.AsyncClient(
+            transport=transport,
+            timeout=DEFAULT_TIMEOUT_SECONDS,
+        )
+        logger.info(f"Created GitHub HTTP client with {limits}")
+    return _client
+
+
+def get_github_queue_depth() -> int:
+    """Returns the number of GitHub requests waiting for the rate limit."""
+    return _scheduler.queue_depth if _scheduler is not None else 0
+
+
+async def close_github_client():
+    """Closes the shared GitHub HTTP client, if it was created."""
+    global _client, _scheduler
+    if _client is not None:
+        await _client.aclose()
+        _client = None
+        _scheduler = None
@@ -0,0 +1,217 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Optional
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REQUESTS_PER_SECOND = 5.0
+DEFAULT_BURST = 20
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_SECONDS = 1.0
+# Never wait longer than this for a rate limit to reset; fail instead.
+MAX_WAIT_SECONDS = 60.0
+
+_RETRYABLE_SERVER_ERRORS = {502, 503, 504}
+_DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+CoalesceKey = tuple[str, str, str, str]
+
+
+@dataclass
+class _SharedResponse:
+    status_code: int
+    headers: list[tuple[str, str]]
+    content: bytes
+
+
+class RateLimitedTransport(httpx.AsyncBaseTransport):
+    """An HTTP transport that schedules requests within the GitHub rate limit.
+
+    Requests wait for a token from a token bucket before they are sent. The
+    bucket is paused until the reset time when GitHub reports that no requests
+    are left (X-RateLimit-Remaining / X-RateLimit-Reset) or asks to back off
+    (Retry-After). Rate limited requests are retried with exponential backoff,
+    and identical GET requests that are in flight at the same time share one
+    response. `queue_depth` is the number of requests waiting for a token.
+    """
+
+    def __init__(
+        self,
+        transport: httpx.AsyncBaseTransport,
+        requests_per_second: float = DEFAULT_REQUESTS_PER_SECOND,
+        burst: int = DEFAULT_BURST,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_seconds: float = DEFAULT_BACKOFF_SECONDS,
+    ):
+        self._transport = transport
+        self._requests_per_second = requests_per_second
+        self._burst = burst
+        self._max_retries = max_retries
+        self._backoff_seconds = backoff_seconds
+        self._tokens = float(burst)
+        self._updated_at = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+        self._in_flight: dict[CoalesceKey, asyncio.Task] = {}
+        self.queue_depth = 0
+        self.coalesced = 0
+        self.retries = 0
+
+    async def _acquire(self):
+        self.queue_depth += 1
+        try:
+            # The lock makes waiting requests take tokens in arrival order.
+            async with self._lock:
+                while True:
+                    now = time.monotonic()
+                    self._tokens = min(
+                        self._burst,
+                        self._tokens + (now - self._updated_at) * self._requests_per_second,
+                    )
+                    self._updated_at = now
+                    wait = self._paused_until - now
+                    if wait <= 0 and self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    if wait <= 0:
+                        wait = (1 - self._tokens) / self._requests_per_second
+                    if self.queue_depth > 1:
+                        logger.info(
+                            f"GitHub request queue depth {self.queue_depth}, waiting {wait:.2f}s"
+                        )
+                    await asyncio.sleep(wait)
+        finally:
+            self.queue_depth -= 1
+
+    def _get_retry_delay(self, response: httpx.Response) -> Optional[float]:
+        """Returns how long GitHub asked us to wait, if the response says so."""
+        if retry_after := response.headers.get("Retry-After"):
+            try:
+                return float(retry_after)
+            except ValueError:
+                pass
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            if reset := response.headers.get("X-RateLimit-Reset"):
+                try:
+                    return max(0.0, float(reset) - time.time())
+                except ValueError:
+                    pass
+        return None
+
+    def _is_retryable(self, request: httpx.Request, response: httpx.Response) -> bool:
+        if response.status_code == 429:
+            return True
+        if response.status_code == 403:
+            # A 403 is only a rate limit if GitHub says so; otherwise it's a real error.
+            return self._get_retry_delay(response) is not None
+        # Other methods may have had side effects before the server error.
+        return request.method == "GET" and response.status_code in _RETRYABLE_SERVER_ERRORS
+
+    async def _send(self, request: httpx.Request) -> httpx.Response:
+        attempt = 0
+        while True:
+            await self._acquire()
+            response = await self._transport.handle_async_request(request)
+
+            delay = self._get_retry_delay(response)
+            if delay is not None:
+                # Pause the bucket for every request, not just this one.
+                self._paused_until = max(self._paused_until, time.monotonic() + min(delay, MAX_WAIT_SECONDS))
+
+            if attempt >= self._max_retries or not self._is_retryable(request, response):
+                return response
+
+            attempt += 1
+            self.retries += 1
+            backoff = self._backoff_seconds * 2 ** (attempt - 1) * (1 + random.random())
+            wait = max(backoff, min(delay or 0.0, MAX_WAIT_SECONDS))
+            logger.warning(
+                f"GitHub request {request.method} {request.url} returned {response.status_code}, "
+                f"retry {attempt}/{self._max_retries} in {wait:.2f}s"
+            )
+            await response.aclose()
+            await asyncio.sleep(wait)
+
+    @staticmethod
+    def _to_response(request: httpx.Request, shared: _SharedResponse) -> httpx.Response:
+        return httpx.Response(
+            shared.status_code,
+            headers=shared.headers,
+            content=shared.content,
+            request=request,
+        )
+
+    async def _send_shared(self, request: httpx.Request) -> _SharedResponse:
+        response = await self._send(request)
+        try:
+            content = await response.aread()
+        finally:
+            await response.aclose()
+        return _SharedResponse(
+            status_code=response.status_code,
+            headers=[
+                (name, value)
+                for name, value in response.headers.multi_items()
+                if name.lower() not in _DROPPED_HEADERS
+            ],
+            content=content,
+        )
+
+    def _forget_in_flight(self, key: CoalesceKey, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET":
+            return await self._send(request)
+
+        key = (
+            str(request.url),
+            request.headers.get("Authorization", ""),
+            request.headers.get("Accept", ""),
+            request.headers.get("If-None-Match", ""),
+        )
+        while (in_flight := self._in_flight.get(key)) is not None:
+            self.coalesced += 1
+            try:
+                return self._to_response(request, await asyncio.shield(in_flight))
+            except asyncio.CancelledError:
+                if not in_flight.cancelled():
+                    raise
+                # The request that started the shared send was cancelled, which
+                # says nothing about this one; send it again.
+                self._forget_in_flight(key, in_flight)
+
+        # The send runs in its own task, so cancelling one request never
+        # cancels the others that are waiting for the same response.
+        task = asyncio.create_task(self._send_shared(request))
+        self._in_flight[key] = task
+        task.add_done_callback(lambda _: self._forget_in_flight(key, task))
+        try:
+            shared = await asyncio.shield(task)
+        except asyncio.CancelledError:
+            task.cancel()
+            raise
+        return self._to_response(request, shared)
+
+    async def aclose(self):
+        await self._transport.aclose()
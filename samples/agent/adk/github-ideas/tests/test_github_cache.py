@@ -0,0 +1,192 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+import httpx
+import pytest
+from github_cache import ConditionalCachingTransport
+
+API_URL = "https://api.github.com"
+ISSUES_PATH = "/repos/google/A2UI/issues"
+LAST_MODIFIED = "Wed, 01 Oct 2025 12:00:00 GMT"
+
+
+class FakeGitHub:
+    """A stand-in for the GitHub API that supports conditional requests."""
+
+    def __init__(self):
+        self.requests: list[httpx.Request] = []
+        self.versions: dict[str, int] = {}
+
+    def _get_etag(self, path: str) -> str:
+        return f'"{path}@{self.versions.get(path, 0)}"'
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        path = request.url.path
+        if request.method != "GET":
+            issues_path = "/".join(path.split("/")[:4]) + "/issues"
+            self.versions[issues_path] = self.versions.get(issues_path, 0) + 1
+            return httpx.Response(201, json={"created": True})
+
+        etag = self._get_etag(path)
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(
+            200,
+            headers={"ETag": etag, "Last-Modified": LAST_MODIFIED},
+            json={"path": path, "version": self.versions.get(path, 0)},
+        )
+
+
+@pytest.fixture
+def github():
+    return FakeGitHub()
+
+
+def _make_client(github: FakeGitHub, **kwargs) -> tuple[httpx.AsyncClient, ConditionalCachingTransport]:
+    transport = ConditionalCachingTransport(httpx.MockTransport(github.handle), **kwargs)
+    return httpx.AsyncClient(transport=transport, base_url=API_URL), transport
+
+
+def test_get_within_ttl_is_served_from_cache(github):
+    async def run():
+        client, transport = _make_client(github, ttl_seconds=60)
+        async with client:
+            first = await client.get(ISSUES_PATH)
+            second = await client.get(ISSUES_PATH)
+        return transport, first, second
+
+    transport, first, second = asyncio.run(run())
+
+    assert len(github.requests) == 1
+    assert second.json() == first.json()
+    assert (transport.misses, transport.hits) == (1, 1)
+
+
+def test_get_after_ttl_sends_conditional_request(github):
+    async def run():
+        client, transport = _make_client(github, ttl_seconds=0)
+        async with client:
+            await client.get(ISSUES_PATH)
+            response = await client.get(ISSUES_PATH)
+        return transport, response
+
+    transport, response = asyncio.run(run())
+
+    revalidation = github.requests[1]
+    assert revalidation.headers["If-None-Match"] == f'"{ISSUES_PATH}@0"'
+    assert revalidation.headers["If-Modified-Since"] == LAST_MODIFIED
+    # The 304 is answered from the cache.
+    assert response.status_code == 200
+    assert response.json() == {"path": ISSUES_PATH, "version": 0}
+    assert transport.revalidations == 1
+
+
+def test_changed_resource_replaces_cached_response(github):
+    async def run():
+        client, transport = _make_client(github, ttl_seconds=0)
+        async with client:
+            await client.get(ISSUES_PATH)
+            github.versions[ISSUES_PATH] = 1
+            return await client.get(ISSUES_PATH)
+
+    response = asyncio.run(run())
+
+    assert response.json() == {"path": ISSUES_PATH, "version": 1}
+
+
+def test_least_recently_used_entry_is_evicted(github):
+    async def run():
+        client, transport = _make_client(github, ttl_seconds=60, max_entries=2)
+        async with client:
+            await client.get("/repos/google/A2UI/issues/1")
+            await client.get("/repos/google/A2UI/issues/2")
+            # Reading issue 1 again makes issue 2 the least recently used.
+            await client.get("/repos/google/A2UI/issues/1")
+            await client.get("/repos/google/A2UI/issues/3")
+            await client.get("/repos/google/A2UI/issues/1")
+            await client.get("/repos/google/A2UI/issues/2")
+
+    asyncio.run(run())
+
+    assert [request.url.path for request in github.requests] == [
+        "/repos/google/A2UI/issues/1",
+        "/repos/google/A2UI/issues/2",
+        "/repos/google/A2UI/issues/3",
+        "/repos/google/A2UI/issues/2",
+    ]
+
+
+def test_write_invalidates_cached_reads_for_the_repository(github):
+    other_repo_path = "/repos/google/other/issues"
+
+    async def run():
+        client, transport = _make_client(github, ttl_seconds=60)
+        async with client:
+            await client.get(ISSUES_PATH)
+            await client.get(other_repo_path)
+            await client.post(ISSUES_PATH, json={"title": "An idea"})
+            issues = await client.get(ISSUES_PATH)
+            await client.get(other_repo_path)
+        return issues
+
+    issues = asyncio.run(run())
+
+    assert [(request.method, request.url.path) for request in github.requests] == [
+        ("GET", ISSUES_PATH),
+        ("GET", other_repo_path),
+        ("POST", ISSUES_PATH),
+        ("GET", ISSUES_PATH),
+    ]
+    assert issues.json() == {"path": ISSUES_PATH, "version": 1}
+
+
+def test_failed_write_keeps_cached_reads(github):
+    async def run():
+        transport = ConditionalCachingTransport(
+            httpx.MockTransport(
+                lambda request: httpx.Response(422)
+                if request.method == "POST"
+                else github.handle(request)
+            ),
+            ttl_seconds=60,
+        )
+        async with httpx.AsyncClient(transport=transport, base_url=API_URL) as client:
+            await client.get(ISSUES_PATH)
+            await client.post(ISSUES_PATH, json={})
+            await client.get(ISSUES_PATH)
+
+    asyncio.run(run())
+
+    assert len(github.requests) == 1
+
+
+def test_responses_without_validators_are_not_cached():
+    requests = []
+
+    def handle(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        return httpx.Response(200, json={})
+
+    async def run():
+        transport = ConditionalCachingTransport(httpx.MockTransport(handle), ttl_seconds=60)
+        async with httpx.AsyncClient(transport=transport, base_url=API_URL) as client:
+            await client.get(ISSUES_PATH)
+            await client.get(ISSUES_PATH)
+
+    asyncio.run(run())
+
+    assert len(requests) == 2
@@ -0,0 +1,109 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+
+import httpx
+from github_scheduler import RateLimitedTransport
+
+URL = "https://api.github.com/repos/google/A2UI/issues"
+
+
+class SlowTransport(httpx.AsyncBaseTransport):
+    """Answers every request with 200 once `release` is set."""
+
+    def __init__(self):
+        self.release = asyncio.Event()
+        self.requests = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        await self.release.wait()
+        return httpx.Response(200, json={"request": self.requests})
+
+
+def test_concurrent_gets_share_one_request():
+    async def run():
+        inner = SlowTransport()
+        transport = RateLimitedTransport(inner)
+        a = asyncio.create_task(transport.handle_async_request(httpx.Request("GET", URL)))
+        b = asyncio.create_task(transport.handle_async_request(httpx.Request("GET", URL)))
+        await asyncio.sleep(0)
+        inner.release.set()
+        responses = await asyncio.gather(a, b)
+        return inner, transport, responses
+
+    inner, transport, responses = asyncio.run(run())
+
+    assert inner.requests == 1
+    assert transport.coalesced == 1
+    assert [response.json() for response in responses] == [{"request": 1}] * 2
+
+
+def test_cancelled_leader_does_not_cancel_waiters():
+    async def run():
+        inner = SlowTransport()
+        transport = RateLimitedTransport(inner)
+        a = asyncio.create_task(transport.handle_async_request(httpx.Request("GET", URL)))
+        await asyncio.sleep(0)
+        b = asyncio.create_task(transport.handle_async_request(httpx.Request("GET", URL)))
+        await asyncio.sleep(0)
+        a.cancel()
+        await asyncio.sleep(0)
+        inner.release.set()
+        response = await b
+        return inner, a, b, response
+
+    inner, a, b, response = asyncio.run(run())
+
+    assert a.cancelled()
+    assert not b.cancelled()
+    assert response.status_code == 200
+    # The waiter sent the request again after the leader was cancelled.
+    assert inner.requests == 2
+
+
+def test_cancelled_waiter_does_not_cancel_leader():
+    async def run():
+        inner = SlowTransport()
+        transport = RateLimitedTransport(inner)
+        a = asyncio.create_task(transport.handle_async_request(httpx.Request("GET", URL)))
+        await asyncio.sleep(0)
+        b = asyncio.create_task(transport.handle_async_request(httpx.Request("GET", URL)))
+        await asyncio.sleep(0)
+        b.cancel()
+        await asyncio.sleep(0)
+        inner.release.set()
+        response = await a
+        return inner, b, response
+
+    inner, b, response = asyncio.run(run())
+
+    assert b.cancelled()
+    assert response.status_code == 200
+    assert inner.requests == 1
+
+
+def test_rate_limited_get_is_retried():
+    responses = [
+        httpx.Response(429, headers={"Retry-After": "0"}),
+        httpx.Response(200, json={"ok": True}),
+    ]
+    inner = httpx.MockTransport(lambda request: responses.pop(0))
+    transport = RateLimitedTransport(inner, backoff_seconds=0)
+
+    response = asyncio.run(transport.handle_async_request(httpx.Request("GET", URL)))
+
+    assert response.status_code == 200
+    assert transport.retries == 1
@@ -12,16 +12,27 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import json
 import logging
+import math
 import os
-import httpx
 from typing import Optional, List
 
+import httpx
+
+from github_client import get_github_api_url, get_github_client
 from google.adk.tools.tool_context import ToolContext
 
 logger = logging.getLogger(__name__)
 
+# Long comment threads are trimmed before they reach the LLM context.
+COMMENTS_PER_PAGE = 100
+MAX_COMMENTS = 50
+MAX_COMMENT_BODY_CHARS = 2000
+MAX_ISSUE_BODY_CHARS = 8000
+MAX_CONCURRENT_COMMENT_PAGES = 4
+
 def _get_headers():
     github_token = os.getenv("GITHUB_TOKEN")
     if not github_token:
@@ -38,7 +49,7 @@ def _get_repo():
     return github_repo
 
 
-def create_github_issue(
+async def create_github_issue(
     title: str, body: str, labels: List[str] = [], tool_context: ToolContext = None
 ) -> str:
     """Call this tool to create a GitHub issue.
@@ -54,7 +65,7 @@ def create_github_issue(
     try:
         repo = _get_repo()
         headers = _get_headers()
-        url = f"https://api.github.com/repos/{repo}/issues"
+        url = f"{get_github_api_url()}/repos/{repo}/issues"
         
         payload = {
             "title": title,
@@ -62,28 +73,28 @@ def create_github_issue(
             "labels": labels
         }
 
-        with httpx.Client() as client:
-            response = client.post(url, headers=headers, json=payload)
-            response.raise_for_status()
-            issue_data = response.json()
-            issue_url = issue_data.get("html_url")
-            
-            logger.info(f"Successfully created issue: {issue_url}")
-            return json.dumps(
-                {
-                    "success": True,
-                    "message": f"GitHub issue created successfully: {issue_url}",
-                    "issue_url": issue_url,
-                    "issue_number": issue_data.get("number")
-                }
-            )
+        client = get_github_client()
+        response = await client.post(url, headers=headers, json=payload)
+        response.raise_for_status()
+        issue_data = response.json()
+        issue_url = issue_data.get("html_url")
+        
+        logger.info(f"Successfully created issue: {issue_url}")
+        return json.dumps(
+            {
+                "success": True,
+                "message": f"GitHub issue created successfully: {issue_url}",
+                "issue_url": issue_url,
+                "issue_number": issue_data.get("number")
+            }
+        )
     except Exception as e:
         error_msg = f"Error creating issue: {str(e)}"
         logger.error(error_msg)
         return json.dumps({"success": False, "message": error_msg})
 
 
-def search_issues(
+async def search_issues(
     query: str, sort_by: str = "created", tool_context: ToolContext = None
 ) -> str:
     """Search for issues in the repository.
@@ -97,7 +108,7 @@ def search_issues(
         headers = _get_headers()
         
         # Use the List Issues API instead of Search API to avoid indexing latency/errors
-        url = f"https://api.github.com/repos/{repo}/issues"
+        url = f"{get_github_api_url()}/repos/{repo}/issues"
         
         params = {
             "sort": sort_by,
@@ -120,28 +131,28 @@ def search_issues(
         
         # If no state specified, GitHub defaults to open.
         
-        with httpx.Client() as client:
-            req = client.build_request("GET", url, headers=headers, params=params)
-            logger.info(f"Sending Request: {req.url}")
-            response = client.send(req)
-            response.raise_for_status()
-            data = response.json()
+        client = get_github_client()
+        req = client.build_request("GET", url, headers=headers, params=params)
+        logger.info(f"Sending Request: {req.url}")
+        response = await client.send(req)
+        response.raise_for_status()
+        data = response.json()
+        
+        # Simplified list for the agent
+        issues = []
+        for item in data:
+            # API returns list of issues directly
+            issues.append({
+                "number": item["number"],
+                "title": item["title"],
+                "state": item["state"],
+                "comments": item["comments"],
+                "labels": [l["name"] for l in item["labels"]],
+                "author": item["user"]["login"],
+                "reactions": item.get("reactions", {}).get("+1", 0) # Basic support for upvotes
+            })
             
-            # Simplified list for the agent
-            issues = []
-            for item in data:
-                # API returns list of issues directly
-                issues.append({
-                    "number": item["number"],
-                    "title": item["title"],
-                    "state": item["state"],
-                    "comments": item["comments"],
-                    "labels": [l["name"] for l in item["labels"]],
-                    "author": item["user"]["login"],
-                    "reactions": item.get("reactions", {}).get("+1", 0) # Basic support for upvotes
-                })
-                
-            return json.dumps(issues)
+        return json.dumps(issues)
 
     except Exception as e:
         error_msg = f"Error searching issues: {str(e)}"
@@ -149,7 +160,27 @@ def search_issues(
         return json.dumps({"error": error_msg})
 
 
-def get_issue_details(
+async def _get_json_page(client, url: str, headers: dict, page: int, semaphore: asyncio.Semaphore):
+    async with semaphore:
+        response = await client.get(url, headers=headers, params={"per_page": COMMENTS_PER_PAGE, "page": page})
+        response.raise_for_status()
+        return response
+
+
+def _get_last_page(response) -> int:
+    last_url = response.links.get("last", {}).get("url")
+    if not last_url:
+        return 1
+    return int(httpx.URL(last_url).params.get("page", 1))
+
+
+def _truncate(text: Optional[str], max_chars: int) -> Optional[str]:
+    if text is None or len(text) <= max_chars:
+        return text
+    return text[:max_chars] + f"... [truncated {len(text) - max_chars} characters]"
+
+
+async def get_issue_details(
     issue_number: int, tool_context: ToolContext = None
 ) -> str:
     """Get full details for a specific issue, including comments.
@@ -160,39 +191,54 @@ def get_issue_details(
     try:
         repo = _get_repo()
         headers = _get_headers()
-        base_url = f"https://api.github.com/repos/{repo}/issues/{issue_number}"
+        base_url = f"{get_github_api_url()}/repos/{repo}/issues/{issue_number}"
+        comments_url = f"{base_url}/comments"
         
-        with httpx.Client() as client:
-            # Get Issue
-            issue_resp = client.get(base_url, headers=headers)
-            issue_resp.raise_for_status()
-            issue = issue_resp.json()
-            
-            # Get Comments
-            comments_resp = client.get(f"{base_url}/comments", headers=headers)
-            comments_resp.raise_for_status()
-            comments_data = comments_resp.json()
-            
-            comments = []
-            for c in comments_data:
-                comments.append({
-                    "id": c["id"],
-                    "body": c["body"],
-                    "user": c["user"]["login"],
-                    "created_at": c["created_at"]
-                })
-
-            result = {
-                "number": issue["number"],
-                "title": issue["title"],
-                "body": issue["body"],
-                "state": issue["state"],
-                "author": issue["user"]["login"],
-                "labels": [l["name"] for l in issue["labels"]],
-                "reactions": issue.get("reactions", {}),
-                "comments": comments
-            }
-            return json.dumps(result)
+        client = get_github_client()
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_COMMENT_PAGES)
+
+        # Get the issue and the first page of comments at the same time
+        issue_resp, first_comments_resp = await asyncio.gather(
+            client.get(base_url, headers=headers),
+            _get_json_page(client, comments_url, headers, 1, semaphore),
+        )
+        issue_resp.raise_for_status()
+        issue = issue_resp.json()
+
+        # Only the most recent comments are kept, so only fetch the pages that contain them
+        last_page = _get_last_page(first_comments_resp)
+        pages_needed = math.ceil(MAX_COMMENTS / COMMENTS_PER_PAGE) + 1
+        other_pages = range(max(2, last_page - pages_needed + 1), last_page + 1)
+        other_comments_resps = await asyncio.gather(
+            *(_get_json_page(client, comments_url, headers, page, semaphore) for page in other_pages)
+        )
+
+        comments_data = [
+            c for resp in [first_comments_resp, *other_comments_resps] for c in resp.json()
+        ][-MAX_COMMENTS:]
+        
+        comments = []
+        for c in comments_data:
+            comments.append({
+                "id": c["id"],
+                "body": _truncate(c["body"], MAX_COMMENT_BODY_CHARS),
+                "user": c["user"]["login"],
+                "created_at": c["created_at"]
+            })
+
+        result = {
+            "number": issue["number"],
+            "title": issue["title"],
+            "body": _truncate(issue["body"], MAX_ISSUE_BODY_CHARS),
+            "state": issue["state"],
+            "author": issue["user"]["login"],
+            "labels": [l["name"] for l in issue["labels"]],
+            "reactions": issue.get("reactions", {}),
+            "comments": comments
+        }
+        if (omitted_comments := issue.get("comments", 0) - len(comments)) > 0:
+            result["omitted_comments"] = omitted_comments
+        return json.dumps(result)
 
     except Exception as e:
         error_msg = f"Error getting issue details: {str(e)}"
@@ -200,7 +246,7 @@ def get_issue_details(
         return json.dumps({"error": error_msg})
 
 
-def add_reaction(
+async def add_reaction(
     issue_number: int, reaction_type: str = "+1", tool_context: ToolContext = None
 ) -> str:
     """Add a reaction to an issue.
@@ -215,13 +261,13 @@ def add_reaction(
         # Accept header for reactions preview API (though it's standard now, good practice)
         headers["Accept"] = "application/vnd.github.squirrel-girl-preview+json"
         
-        url = f"https://api.github.com/repos/{repo}/issues/{issue_number}/reactions"
+        url = f"{get_github_api_url()}/repos/{repo}/issues/{issue_number}/reactions"
         
-        with httpx.Client() as client:
-            response = client.post(url, headers=headers, json={"content": reaction_type})
-            response.raise_for_status()
-            
-            return json.dumps({"success": True, "message": "Reaction added."})
+        client = get_github_client()
+        response = await client.post(url, headers=headers, json={"content": reaction_type})
+        response.raise_for_status()
+        
+        return json.dumps({"success": True, "message": "Reaction added."})
 
     except Exception as e:
         error_msg = f"Error adding reaction: {str(e)}"
@@ -229,7 +275,7 @@ def add_reaction(
         return json.dumps({"error": error_msg})
 
 
-def add_comment(
+async def add_comment(
     issue_number: int, body: str, tool_context: ToolContext = None
 ) -> str:
     """Add a comment to an issue.
@@ -242,13 +288,13 @@ def add_comment(
         repo = _get_repo()
         headers = _get_headers()
         
-        url = f"https://api.github.com/repos/{repo}/issues/{issue_number}/comments"
+        url = f"{get_github_api_url()}/repos/{repo}/issues/{issue_number}/comments"
         
-        with httpx.Client() as client:
-            response = client.post(url, headers=headers, json={"body": body})
-            response.raise_for_status()
-            
-            return json.dumps({"success": True, "message": "Comment posted."})
+        client = get_github_client()
+        response = await client.post(url, headers=headers, json={"body": body})
+        response.raise_for_status()
+        
+        return json.dumps({"success": True, "message": "Comment posted."})
 
     except Exception as e:
         error_msg = f"Error posting comment: {str(e)}"
@@ -22,6 +22,7 @@ from a2a.server.request_handlers import DefaultRequestHandler
 from a2a.server.tasks import InMemoryTaskStore
 from agent import OrchestratorAgent
 from agent_executor import OrchestratorAgentExecutor
+from subagent_http_client import close_subagent_http_client
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
 
@@ -50,7 +51,7 @@ def main(host, port, subagent_urls):
 
         base_url = f"http://{host}:{port}"
         
-        orchestrator_agent = asyncio.run(OrchestratorAgent.build_agent(subagent_urls=subagent_urls))
+        orchestrator_agent, subagent_refresher = OrchestratorAgent.build_agent(subagent_urls=subagent_urls)
         agent_executor = OrchestratorAgentExecutor(base_url=base_url, agent=orchestrator_agent)
 
         request_handler = DefaultRequestHandler(
@@ -72,6 +73,26 @@ def main(host, port, subagent_urls):
             allow_headers=["*"],
         )
 
+        # Subagent cards are fetched with the shared subagent HTTP client, so
+        # this has to run on the server's event loop. Subagents that were down
+        # at startup are added once they come up, and changed agent cards are
+        # picked up without a restart.
+        background_tasks = set()
+
+        async def start_subagent_refresher():
+            await subagent_refresher.resolve(orchestrator_agent)
+            task = asyncio.create_task(subagent_refresher.run(orchestrator_agent))
+            background_tasks.add(task)
+            task.add_done_callback(background_tasks.discard)
+
+        async def cancel_background_tasks():
+            for task in background_tasks:
+                task.cancel()
+
+        app.add_event_handler("startup", start_subagent_refresher)
+        app.add_event_handler("shutdown", cancel_background_tasks)
+        app.add_event_handler("shutdown", close_subagent_http_client)
+
         uvicorn.run(app, host=host, port=port)
     except MissingAPIKeyError as e:
         logger.error(f"Error: {e} {traceback.format_exc()}")
@@ -16,29 +16,33 @@ import json
 import logging
 import os
 from typing import List
-from a2a.client import A2ACardResolver
 from a2a.extensions.common import HTTP_EXTENSION_HEADER
 from google.adk.models.lite_llm import LiteLlm
 from google.adk.agents.llm_agent import LlmAgent
-from google.adk.agents.remote_a2a_agent import RemoteA2aAgent, DEFAULT_TIMEOUT
+from google.adk.agents.remote_a2a_agent import RemoteA2aAgent
 from google.adk.planners.built_in_planner import BuiltInPlanner
 from google.genai import types as genai_types
-import httpx
 import re
 import part_converters
 from google.adk.agents.callback_context import  CallbackContext
 from google.adk.models.llm_request import LlmRequest
 from google.adk.models.llm_response import LlmResponse
+from subagent_http_client import get_subagent_http_client
+from subagent_refresher import SubagentRefresher
 from subagent_route_manager import SubagentRouteManager
+from subagent_streaming import RequestScopedStreamingClientConfig
 from a2ui.a2ui_extension import is_a2ui_part, A2UI_EXTENSION_URI
 from typing import override
-from a2a.types import TransportProtocol as A2ATransport
+from a2a.types import AgentCard, TransportProtocol as A2ATransport
 
 logger = logging.getLogger(__name__)
+
+SUBAGENT_STREAMING = os.getenv("SUBAGENT_STREAMING", "true").lower() == "true"
+
 from a2a.client.middleware import ClientCallInterceptor
-from a2a.client.client import ClientConfig as A2AClientConfig
 from a2a.client.client_factory import ClientFactory as A2AClientFactory
 from a2ui.a2ui_extension import A2UI_CLIENT_CAPABILITIES_KEY
+from a2ui.a2ui_logging import LazyJson
 
 class A2UIMetadataInterceptor(ClientCallInterceptor):
     @override
@@ -51,7 +55,7 @@ class A2UIMetadataInterceptor(ClientCallInterceptor):
         context: ClientCallContext | None,
     ) -> tuple[dict[str, Any], dict[str, Any]]:
         """Enables the A2UI extension header and adds A2UI client capabilities to remote agent message metadata."""
-        logger.info("Intercepting client call to method: " + method_name + " and payload " + json.dumps(request_payload))
+        logger.info("Intercepting client call to method: %s and payload %s", method_name, LazyJson(request_payload))
                 
         if context and context.state and context.state.get("use_ui"):
             # Add A2UI extension header
@@ -63,7 +67,7 @@ class A2UIMetadataInterceptor(ClientCallInterceptor):
                 if "metadata" not in message:
                     message["metadata"] = {}
                 message["metadata"][A2UI_CLIENT_CAPABILITIES_KEY] = client_capabilities
-                logger.info(f"Added client capabilities to remote agent message metadata: {client_capabilities}")
+                logger.info("Added client capabilities to remote agent message metadata: %s", LazyJson(client_capabilities))
                         
         return request_payload, http_kwargs
 
@@ -96,7 +100,7 @@ class OrchestratorAgent:
             and is_a2ui_part(a2a_part)
             and (user_action := a2a_part.root.data.get("userAction"))
             and (surface_id := user_action.get("surfaceId"))
-            and (target_agent := await SubagentRouteManager.get_route_to_subagent_name(surface_id, callback_context.state))
+            and (target_agent := SubagentRouteManager.get_route_to_subagent_name(surface_id, callback_context.session))
         ):
             logger.info(f"Programmatically routing userAction for surfaceId '{surface_id}' to subagent '{target_agent}'")
             return LlmResponse(
@@ -115,61 +119,71 @@ class OrchestratorAgent:
         return None
 
     @classmethod
-    async def build_agent(cls, subagent_urls: List[str]) -> LlmAgent:
-        """Builds the LLM agent for the orchestrator_agent agent."""
+    def _get_clean_name(cls, name: str) -> str:
+        # clean name for adk
+        clean_name = re.sub(r'[^0-9a-zA-Z_]+', '_', name)
+        if clean_name == "":
+            clean_name = "_"
+        if clean_name[0].isdigit():
+            clean_name = f"_{clean_name}"
+        return clean_name
 
-        subagents = []
-        for subagent_url in subagent_urls:
-            async with httpx.AsyncClient() as httpx_client:
-                resolver = A2ACardResolver(
-                    httpx_client=httpx_client,
-                    base_url=subagent_url,
-                )
-                
-                subagent_card =  await resolver.get_agent_card()
-                logger.info('Successfully fetched public agent card:' + subagent_card.model_dump_json(indent=2, exclude_none=True))
-                
-                # clean name for adk
-                clean_name = re.sub(r'[^0-9a-zA-Z_]+', '_', subagent_card.name)                
-                if clean_name == "":
-                    clean_name = "_"
-                if clean_name[0].isdigit():
-                    clean_name = f"_{clean_name}"
-                
-                # make remote agent
-                description = json.dumps({
-                    "id": clean_name,
-                    "name": subagent_card.name,
-                    "description": subagent_card.description,
-                    "skills": [
-                        {
-                            "name": skill.name, 
-                            "description": skill.description, 
-                            "examples": skill.examples, 
-                            "tags": skill.tags
-                        } for skill in subagent_card.skills
-                    ]
-                }, indent=2)
-                remote_a2a_agent = RemoteA2aAgent(
-                    clean_name, 
-                    subagent_card, 
-                    description=description, # This will be appended to system instructions
-                    a2a_part_converter=part_converters.convert_a2a_part_to_genai_part,
-                    genai_part_converter=part_converters.convert_genai_part_to_a2a_part,                      
-                    a2a_client_factory=A2AClientFactoryWithA2UIMetadata(
-                        config=A2AClientConfig(
-                            httpx_client=httpx.AsyncClient(
-                                timeout=httpx.Timeout(timeout=DEFAULT_TIMEOUT),
-                            ),
-                            streaming=False,
-                            polling=False,
-                            supported_transports=[A2ATransport.jsonrpc],
-                        )
-                    )
+    @classmethod
+    def build_remote_agent(cls, subagent_card: AgentCard) -> RemoteA2aAgent:
+        """Builds the remote agent that forwards requests to a subagent."""
+        clean_name = cls._get_clean_name(subagent_card.name)
+
+        # make remote agent
+        description = json.dumps({
+            "id": clean_name,
+            "name": subagent_card.name,
+            "description": subagent_card.description,
+            "skills": [
+                {
+                    "name": skill.name, 
+                    "description": skill.description, 
+                    "examples": skill.examples, 
+                    "tags": skill.tags
+                } for skill in subagent_card.skills
+            ]
+        }, indent=2)
+        remote_a2a_agent = RemoteA2aAgent(
+            clean_name, 
+            subagent_card, 
+            description=description, # This will be appended to system instructions
+            a2a_part_converter=part_converters.convert_a2a_part_to_genai_part,
+            genai_part_converter=part_converters.convert_genai_part_to_a2a_part,                      
+            a2a_client_factory=A2AClientFactoryWithA2UIMetadata(
+                config=RequestScopedStreamingClientConfig(
+                    httpx_client=get_subagent_http_client(),
+                    # For a streaming orchestrator request, subagents stream their
+                    # updates and each one is forwarded to the client as soon as it
+                    # arrives instead of after the subagent's task completes. Falls
+                    # back to a blocking call for message/send requests, or if the
+                    # card doesn't advertise streaming.
+                    streaming=SUBAGENT_STREAMING,
+                    polling=False,
+                    supported_transports=[A2ATransport.jsonrpc],
                 )
-                subagents.append(remote_a2a_agent)
-                
-                logger.info(f'Created remote agent with description: {description}')
+            )
+        )
+        logger.info(f'Created remote agent with description: {description}')
+        return remote_a2a_agent
+
+    @classmethod
+    def build_agent(cls, subagent_urls: List[str]) -> tuple[LlmAgent, SubagentRefresher]:
+        """Builds the LLM agent for the orchestrator_agent agent.
+
+        Returns:
+            The orchestrator agent, without subagents, and the refresher that
+            adds them. On the server's event loop, await
+            `SubagentRefresher.resolve` to register the subagents that answer,
+            then run `SubagentRefresher.run` in the background to add
+            subagents that were down and pick up changed agent cards.
+        """
+        subagent_refresher = SubagentRefresher(
+            subagent_urls, cls.build_remote_agent, get_subagent_http_client()
+        )
 
         LITELLM_MODEL = os.getenv("LITELLM_MODEL", "gemini/gemini-2.5-flash")
         return LlmAgent(
@@ -183,6 +197,6 @@ class OrchestratorAgent:
                     include_thoughts=True,
                 )
             ),
-            sub_agents=subagents,
+            sub_agents=[],
             before_model_callback=cls.programmtically_route_user_action_to_subagent,
-        )
+        ), subagent_refresher
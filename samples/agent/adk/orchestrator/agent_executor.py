@@ -12,14 +12,15 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import asyncio
 import logging
 import json
+from contextvars import ContextVar
 from typing import List, Optional, override
 from google.adk.agents.invocation_context import new_invocation_context_id
 from google.adk.events.event_actions import EventActions
 
 from a2a.server.agent_execution import RequestContext
+from google.adk.agents.base_agent import BaseAgent
 from google.adk.agents.llm_agent import LlmAgent
 from google.adk.artifacts import InMemoryArtifactService
 from a2a.server.events.event_queue import EventQueue
@@ -31,19 +32,23 @@ from google.adk.a2a.executor.a2a_agent_executor import (
     A2aAgentExecutor,
 )
 from a2a.types import AgentCapabilities, AgentCard, AgentExtension
-from a2ui.a2ui_extension import is_a2ui_part, try_activate_a2ui_extension, A2UI_EXTENSION_URI, STANDARD_CATALOG_ID, SUPPORTED_CATALOG_IDS_KEY, get_a2ui_agent_extension, A2UI_CLIENT_CAPABILITIES_KEY
+from a2ui.a2ui_extension import is_a2ui_part, is_streaming_request, try_activate_a2ui_extension, A2UI_EXTENSION_URI, STANDARD_CATALOG_ID, SUPPORTED_CATALOG_IDS_KEY, get_a2ui_agent_extension, A2UI_CLIENT_CAPABILITIES_KEY
 from google.adk.a2a.converters import event_converter
 from a2a.server.events import Event as A2AEvent
 from google.adk.events.event import Event
 from google.adk.agents.invocation_context import InvocationContext
 from google.adk.a2a.converters import part_converter
 from subagent_route_manager import SubagentRouteManager
+from subagent_streaming import orchestrator_request_streaming
 
 from agent import OrchestratorAgent
 import part_converters
 
 logger = logging.getLogger(__name__)
 
+# The subagent the current request is dispatched to, bypassing the orchestrator.
+_dispatch_subagent: ContextVar[Optional[BaseAgent]] = ContextVar("dispatch_subagent", default=None)
+
 
 class OrchestratorAgentExecutor(A2aAgentExecutor):
     """Contact AgentExecutor Example."""
@@ -66,6 +71,67 @@ class OrchestratorAgentExecutor(A2aAgentExecutor):
         )
 
         super().__init__(runner=runner, config=config)
+        self._subagent_runners: dict[str, Runner] = {}
+
+    def _get_user_action_subagent(self, context: RequestContext, runner: Runner) -> Optional[BaseAgent]:
+        """Returns the subagent that owns the surface of a userAction request, if it is known."""
+        if (
+            context.message
+            and context.message.parts
+            and is_a2ui_part(a2a_part := context.message.parts[-1])
+            and (user_action := a2a_part.root.data.get("userAction"))
+            and (surface_id := user_action.get("surfaceId"))
+            and (run_request := self._config.request_converter(context, self._config.a2a_part_converter))
+            and (subagent_name := SubagentRouteManager.get_cached_route_to_subagent_name(
+                surface_id, runner.app_name, run_request.user_id, run_request.session_id
+            ))
+        ):
+            return runner.agent.find_sub_agent(subagent_name)
+        return None
+
+    def _get_subagent_runner(self, runner: Runner, subagent: BaseAgent) -> Runner:
+        """Returns a runner that runs the subagent in the orchestrator's sessions."""
+        subagent_runner = self._subagent_runners.get(subagent.name)
+        # Subagents are replaced when their agent card changes.
+        if subagent_runner is None or subagent_runner.agent is not subagent:
+            subagent_runner = Runner(
+                app_name=runner.app_name,
+                agent=subagent,
+                artifact_service=runner.artifact_service,
+                session_service=runner.session_service,
+                memory_service=runner.memory_service,
+            )
+            self._subagent_runners[subagent.name] = subagent_runner
+        return subagent_runner
+
+    @override
+    async def _resolve_runner(self) -> Runner:
+        runner = await super()._resolve_runner()
+        if (subagent := _dispatch_subagent.get()) is not None:
+            return self._get_subagent_runner(runner, subagent)
+        return runner
+
+    @override
+    async def _handle_request(
+        self,
+        context: RequestContext,
+        event_queue: EventQueue,
+    ):
+        # A userAction on a surface whose subagent is known goes straight to
+        # that subagent, without an orchestrator LLM call to route it.
+        runner = await super()._resolve_runner()
+        subagent = self._get_user_action_subagent(context, runner)
+        if subagent is not None:
+            logger.info(f"Dispatching userAction directly to subagent '{subagent.name}'")
+
+        token = _dispatch_subagent.set(subagent)
+        # Subagents only stream to a client that streams from the orchestrator.
+        streaming_token = orchestrator_request_streaming.set(is_streaming_request(context))
+        try:
+            await super()._handle_request(context, event_queue)
+        finally:
+            orchestrator_request_streaming.reset(streaming_token)
+            _dispatch_subagent.reset(token)
 
     @classmethod
     def convert_event_to_a2a_events_and_save_surface_id_to_subagent_name(
@@ -89,7 +155,8 @@ class OrchestratorAgentExecutor(A2aAgentExecutor):
             subagent_card = None
             if (active_subagent_name := event.author):
                 # We need to find the subagent by name
-                if (subagent := next((sub for sub in invocation_context.agent.sub_agents if sub.name == active_subagent_name), None)):
+                # The invocation's agent is the subagent itself when a userAction was dispatched to it directly.
+                if (subagent := invocation_context.agent.root_agent.find_sub_agent(active_subagent_name)):
                     try:
                         subagent_card = json.loads(subagent.description)
                     except Exception:
@@ -105,14 +172,21 @@ class OrchestratorAgentExecutor(A2aAgentExecutor):
                     and (begin_rendering := a2a_part.root.data.get("beginRendering"))
                     and (surface_id := begin_rendering.get("surfaceId"))
                 ):                    
-                    asyncio.run_coroutine_threadsafe(
-                        SubagentRouteManager.set_route_to_subagent_name(
-                            surface_id,
-                            event.author,
-                            invocation_context.session_service,
-                            invocation_context.session,
-                        ),
-                        asyncio.get_event_loop(),
+                    SubagentRouteManager.save_route_to_subagent_name(
+                        surface_id,
+                        event.author,
+                        invocation_context.session_service,
+                        invocation_context.session,
+                    )
+                elif (
+                    is_a2ui_part(a2a_part)
+                    and (delete_surface := a2a_part.root.data.get("deleteSurface"))
+                    and (surface_id := delete_surface.get("surfaceId"))
+                ):
+                    SubagentRouteManager.remove_route(
+                        surface_id,
+                        invocation_context.session_service,
+                        invocation_context.session,
                     )
 
         return a2a_events
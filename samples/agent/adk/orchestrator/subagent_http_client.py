@@ -0,0 +1,77 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import logging
+import os
+from typing import Optional
+
+import httpx
+from google.adk.agents.remote_a2a_agent import DEFAULT_TIMEOUT
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_CONNECTIONS = 100
+DEFAULT_MAX_KEEPALIVE_CONNECTIONS = 20
+DEFAULT_KEEPALIVE_EXPIRY_SECONDS = 30.0
+
+_client: Optional[httpx.AsyncClient] = None
+
+
+def _get_int_env(name: str, default: int) -> int:
+    value = os.getenv(name)
+    return int(value) if value else default
+
+
+def get_subagent_http_client() -> httpx.AsyncClient:
+    """Returns the HTTP client shared by all remote subagents.
+
+    httpx pools connections per host, so one client keeps a few warm
+    connections to each subagent, multiplexed over HTTP/2 where the subagent
+    supports it, instead of a separate pool per subagent. The pool can be set
+    with SUBAGENT_MAX_CONNECTIONS, SUBAGENT_MAX_KEEPALIVE_CONNECTIONS and
+    SUBAGENT_KEEPALIVE_EXPIRY_SECONDS.
+
+    The client must only be used from the server's event loop, since pooled
+    connections belong to the loop that opened them.
+    """
+    global _client
+    if _client is None or _client.is_closed:
+        limits = httpx.Limits(
+            max_connections=_get_int_env(
+                "SUBAGENT_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS
+            ),
+            max_keepalive_connections=_get_int_env(
+                "SUBAGENT_MAX_KEEPALIVE_CONNECTIONS", DEFAULT_MAX_KEEPALIVE_CONNECTIONS
+            ),
+            keepalive_expiry=float(
+                os.getenv(
+                    "SUBAGENT_KEEPALIVE_EXPIRY_SECONDS", DEFAULT_KEEPALIVE_EXPIRY_SECONDS
+                )
+            ),
+        )
+        _client = httpx.AsyncClient(
+            http2=True,
+            limits=limits,
+            timeout=httpx.Timeout(timeout=DEFAULT_TIMEOUT),
+        )
+        logger.info(f"Created subagent HTTP client with {limits}")
+    return _client
+
+
+async def close_subagent_http_client():
+    """Closes the shared subagent HTTP client, if it was created."""
+    global _client
+    if _client is not None:
+        await _client.aclose()
+        _client = None
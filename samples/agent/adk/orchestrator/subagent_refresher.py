@@ -0,0 +1,169 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import logging
+import os
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+import httpx
+from a2a.types import AgentCard
+from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
+from a2ui.a2ui_logging import LazyJson
+from google.adk.agents.base_agent import BaseAgent
+from google.adk.agents.llm_agent import LlmAgent
+
+logger = logging.getLogger(__name__)
+
+# How long to wait for a subagent's card before going on without it.
+CARD_RESOLUTION_TIMEOUT_SECONDS = float(os.getenv("SUBAGENT_CARD_TIMEOUT_SECONDS", "5"))
+CARD_REFRESH_INTERVAL_SECONDS = float(os.getenv("SUBAGENT_CARD_REFRESH_SECONDS", "60"))
+CARD_RETRY_INITIAL_DELAY_SECONDS = 2.0
+
+
+@dataclass
+class _SubagentEntry:
+    card: Optional[AgentCard] = None
+    agent_name: Optional[str] = None
+    """The name of the subagent registered for the card."""
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+
+
+class SubagentRefresher:
+    """Fetches subagent cards and keeps the orchestrator's subagents up to date.
+
+    Cards are fetched concurrently, each with a timeout, so one slow subagent
+    does not hold up the others. After startup the cards are polled with
+    conditional requests. When a card changes, or a subagent that was down
+    comes up, a new remote agent is built and swapped into the orchestrator's
+    `sub_agents`. Invocations that are already running keep the remote agent
+    they started with.
+
+    Cards are fetched with the given client, normally the one the subagents
+    share, so it must only be used from the server's event loop.
+    """
+
+    def __init__(
+        self,
+        subagent_urls: List[str],
+        build_remote_agent: Callable[[AgentCard], BaseAgent],
+        httpx_client: httpx.AsyncClient,
+    ):
+        self._entries = {url: _SubagentEntry() for url in subagent_urls}
+        self._build_remote_agent = build_remote_agent
+        self._httpx_client = httpx_client
+
+    @property
+    def unresolved_urls(self) -> List[str]:
+        """The URLs of the subagents whose card has not been fetched yet."""
+        return [url for url, entry in self._entries.items() if entry.card is None]
+
+    async def _fetch_card(self, subagent_url: str) -> Optional[AgentCard]:
+        """Returns the subagent's card if it changed, or None if it did not or could not be fetched."""
+        entry = self._entries[subagent_url]
+        headers = {}
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+
+        try:
+            response = await asyncio.wait_for(
+                self._httpx_client.get(
+                    subagent_url.rstrip("/") + AGENT_CARD_WELL_KNOWN_PATH, headers=headers
+                ),
+                timeout=CARD_RESOLUTION_TIMEOUT_SECONDS,
+            )
+            if response.status_code == 304:
+                return None
+            response.raise_for_status()
+            card = AgentCard.model_validate(response.json())
+        except Exception as e:
+            logger.warning(f"Failed to fetch agent card from {subagent_url}: {e!r}")
+            return None
+
+        entry.etag = response.headers.get("ETag")
+        entry.last_modified = response.headers.get("Last-Modified")
+        if card == entry.card:
+            return None
+
+        logger.info('Successfully fetched public agent card: %s', LazyJson(card, max_length=None))
+        return card
+
+    async def _fetch_changed_cards(self) -> List[tuple[str, AgentCard]]:
+        urls = list(self._entries)
+        cards = await asyncio.gather(*(self._fetch_card(url) for url in urls))
+        return [(url, card) for url, card in zip(urls, cards) if card is not None]
+
+    async def resolve(self, agent: LlmAgent):
+        """Fetches all subagent cards and registers the subagents that answered.
+
+        Call this at startup, before `run`, from the server's event loop.
+        """
+        if changed_cards := await self._fetch_changed_cards():
+            self._swap_subagents(agent, changed_cards)
+
+        if self.unresolved_urls:
+            logger.warning(f"Starting without subagents at {self.unresolved_urls}, will keep retrying")
+
+    def _swap_subagents(self, agent: LlmAgent, changed_cards: List[tuple[str, AgentCard]]):
+        sub_agents = list(agent.sub_agents)
+        for subagent_url, card in changed_cards:
+            entry = self._entries[subagent_url]
+            subagent = self._build_remote_agent(card)
+            if subagent.name != entry.agent_name and any(
+                sub.name == subagent.name for sub in sub_agents
+            ):
+                logger.warning(f"Subagent '{subagent.name}' at {subagent_url} is already registered, skipping")
+                # Fetch the card in full next time, so it is retried.
+                entry.etag = entry.last_modified = None
+                continue
+
+            subagent.parent_agent = agent
+            index = next(
+                (i for i, sub in enumerate(sub_agents) if sub.name == entry.agent_name), None
+            )
+            if index is None:
+                sub_agents.append(subagent)
+                logger.info(f"Registered subagent '{subagent.name}' from {subagent_url}")
+            else:
+                sub_agents[index] = subagent
+                logger.info(f"Updated subagent '{subagent.name}' from {subagent_url}")
+            entry.card = card
+            entry.agent_name = subagent.name
+
+        # Replace the list rather than mutating it, so a request that is
+        # reading the subagents never sees a half-updated list.
+        agent.sub_agents = sub_agents
+
+    async def run(self, agent: LlmAgent):
+        """Keeps the orchestrator's subagents up to date until cancelled.
+
+        Cards are checked every CARD_REFRESH_INTERVAL_SECONDS. While some
+        subagents are down, they are retried sooner, backing off exponentially.
+        """
+        retry_delay = CARD_RETRY_INITIAL_DELAY_SECONDS
+        while True:
+            if self.unresolved_urls:
+                delay = min(retry_delay, CARD_REFRESH_INTERVAL_SECONDS)
+                retry_delay *= 2
+            else:
+                delay = CARD_REFRESH_INTERVAL_SECONDS
+                retry_delay = CARD_RETRY_INITIAL_DELAY_SECONDS
+            await asyncio.sleep(delay)
+
+            if changed_cards := await self._fetch_changed_cards():
+                self._swap_subagents(agent, changed_cards)
@@ -12,53 +12,220 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import asyncio
 import logging
+import os
+from collections import OrderedDict
 from typing import Optional
 from google.adk.agents.invocation_context import new_invocation_context_id
 from google.adk.events.event import Event
 from google.adk.events.event_actions import EventActions
 from google.adk.sessions.base_session_service import BaseSessionService
 from google.adk.sessions.session import Session
-from google.adk.sessions.state import State
+
+MAX_ROUTES_PER_SESSION = int(os.getenv("MAX_SURFACE_ROUTES_PER_SESSION", "1000"))
+MAX_ROUTED_SESSIONS = int(os.getenv("MAX_ROUTED_SESSIONS", "1000"))
+# Route changes made within this window are persisted together.
+PERSIST_DELAY_SECONDS = 1.0
+# A write can fail if the session was updated between reading and appending to it.
+PERSIST_ATTEMPTS = 2
+
+
+# (app name, user id, session id)
+SessionKey = tuple[str, str, str]
+
+
+class _SessionRoutes:
+  """The surface routes of one session, least recently used first."""
+
+  def __init__(self, routes: dict[str, str]):
+    self.routes: OrderedDict[str, str] = OrderedDict(routes)
+    # Surface ids whose route changed since the last write.
+    self.changed_surface_ids: set[str] = set()
+    self.persist_task: Optional[asyncio.Task] = None
 
 
 class SubagentRouteManager:
-  """Manages routing of tasks to sub-agents."""
+  """Manages routing of tasks to sub-agents.
+
+  Each session has a table mapping surface ids to the subagent that rendered
+  them. Tables are kept in memory, so a userAction that arrives right after
+  its surface was rendered is routed without waiting for the route to be
+  saved, and lookups are O(1). A table keeps at most MAX_ROUTES_PER_SESSION
+  routes, dropping the least recently used, and a route is dropped when its
+  surface is deleted.
+
+  Each route is persisted as its own session state value, and a removed
+  route is persisted as None. Changes are batched, so rendering many
+  surfaces appends one session event rather than one per surface, and each
+  event only holds the routes that changed. The persisted routes are loaded
+  when a session's table is not in memory, e.g. after it was evicted or
+  after a restart with a persistent session service.
+  """
 
   ROUTING_KEY_PREFIX = "route_to_subagent_name_for_surface_id_"
 
+  # session key -> routes, least recently used first
+  _sessions: OrderedDict[SessionKey, _SessionRoutes] = OrderedDict()
+  _pending_writes: set[asyncio.Task] = set()
+
   @classmethod
   def _get_routing_key(cls, surface_id: str) -> str:
     return cls.ROUTING_KEY_PREFIX + surface_id
 
   @classmethod
-  async def get_route_to_subagent_name(
-      cls, surface_id: str, state: State
+  def _load_routes(cls, session: Session) -> dict[str, str]:
+    return {
+        key[len(cls.ROUTING_KEY_PREFIX):]: subagent_name
+        for key, subagent_name in session.state.items()
+        if key.startswith(cls.ROUTING_KEY_PREFIX) and subagent_name is not None
+    }
+
+  @classmethod
+  def _get_session_routes(cls, session: Session) -> _SessionRoutes:
+    session_key = (session.app_name, session.user_id, session.id)
+    if (session_routes := cls._sessions.get(session_key)) is None:
+      session_routes = _SessionRoutes(cls._load_routes(session))
+      cls._sessions[session_key] = session_routes
+      while len(cls._sessions) > MAX_ROUTED_SESSIONS:
+        cls._sessions.popitem(last=False)
+    cls._sessions.move_to_end(session_key)
+    return session_routes
+
+  @classmethod
+  def get_route_to_subagent_name(
+      cls, surface_id: str, session: Session
   ) -> Optional[str]:
-    """Gets the subagent route for the given tool call id."""
-    subagent_name = state.get(cls._get_routing_key(surface_id), None)
+    """Gets the subagent route for the given surface id."""
+    routes = cls._get_session_routes(session).routes
+    subagent_name = routes.get(surface_id)
+    if subagent_name is not None:
+      routes.move_to_end(surface_id)
     logging.info("Got subagent route for surface_id %s to subagent_name %s", surface_id, subagent_name)    
     return subagent_name
 
   @classmethod
-  async def set_route_to_subagent_name(
+  def get_cached_route_to_subagent_name(
+      cls, surface_id: str, app_name: str, user_id: str, session_id: str
+  ) -> Optional[str]:
+    """Gets the subagent route for the given surface id if it is in memory.
+
+    Unlike `get_route_to_subagent_name`, this does not need the session, so
+    it can be used before the session is loaded.
+    """
+    session_key = (app_name, user_id, session_id)
+    session_routes = cls._sessions.get(session_key)
+    if session_routes is None or (subagent_name := session_routes.routes.get(surface_id)) is None:
+      return None
+    cls._sessions.move_to_end(session_key)
+    session_routes.routes.move_to_end(surface_id)
+    return subagent_name
+
+  @classmethod
+  def save_route_to_subagent_name(
       cls,
       surface_id: str,
       subagent_name: str,
       session_service: BaseSessionService,
       session: Session,
   ):
-    """Sets the subagent route for the given tool call id."""
-    key = cls._get_routing_key(surface_id)    
-
-    if session.state.get(key) != subagent_name:
-      await session_service.append_event(
-          session,
-          Event(
-              invocation_id=new_invocation_context_id(),
-              author="system",
-              actions=EventActions(state_delta={key: subagent_name}),
-          ),
-      )
-
-      logging.info("Set subagent route for surface_id %s to subagent_name %s", surface_id, subagent_name)
\ No newline at end of file
+    """Sets the subagent route for the given surface id.
+
+    The route can be read right away. It is persisted to session state in the
+    background; this must be called from the event loop.
+    """
+    session_routes = cls._get_session_routes(session)
+    routes = session_routes.routes
+    if routes.get(surface_id) != subagent_name:
+      routes[surface_id] = subagent_name
+      session_routes.changed_surface_ids.add(surface_id)
+      while len(routes) > MAX_ROUTES_PER_SESSION:
+        evicted_surface_id, _ = routes.popitem(last=False)
+        session_routes.changed_surface_ids.add(evicted_surface_id)
+      cls._schedule_persist(session_routes, session_service, session)
+      logging.info("Set subagent route for surface_id %s to subagent_name %s", surface_id, subagent_name)
+    routes.move_to_end(surface_id)
+
+  @classmethod
+  def remove_route(
+      cls,
+      surface_id: str,
+      session_service: BaseSessionService,
+      session: Session,
+  ):
+    """Removes the subagent route for a deleted surface."""
+    session_routes = cls._get_session_routes(session)
+    if session_routes.routes.pop(surface_id, None) is not None:
+      session_routes.changed_surface_ids.add(surface_id)
+      cls._schedule_persist(session_routes, session_service, session)
+      logging.info("Removed subagent route for surface_id %s", surface_id)
+
+  @classmethod
+  def _schedule_persist(
+      cls,
+      session_routes: _SessionRoutes,
+      session_service: BaseSessionService,
+      session: Session,
+  ):
+    if session_routes.persist_task is not None:
+      # The pending write will pick up this change.
+      return
+    task = asyncio.get_running_loop().create_task(
+        cls._persist_routes(
+            session_routes,
+            session_service,
+            session.app_name,
+            session.user_id,
+            session.id,
+        )
+    )
+    session_routes.persist_task = task
+    cls._pending_writes.add(task)
+    task.add_done_callback(cls._pending_writes.discard)
+
+  @classmethod
+  async def _persist_routes(
+      cls,
+      session_routes: _SessionRoutes,
+      session_service: BaseSessionService,
+      app_name: str,
+      user_id: str,
+      session_id: str,
+  ):
+    await asyncio.sleep(PERSIST_DELAY_SECONDS)
+    # Changes from here on schedule a new write.
+    session_routes.persist_task = None
+    changed_surface_ids = session_routes.changed_surface_ids
+    session_routes.changed_surface_ids = set()
+    for attempt in range(1, PERSIST_ATTEMPTS + 1):
+      try:
+        # The session the route was saved with is stale by now, and session
+        # services reject appends to a stale session.
+        session = await session_service.get_session(
+            app_name=app_name, user_id=user_id, session_id=session_id
+        )
+        if session is None:
+          logging.warning("Session %s no longer exists, not persisting its subagent routes", session_id)
+          return
+        # Removed routes are persisted as None.
+        state_delta = {
+            cls._get_routing_key(surface_id): session_routes.routes.get(surface_id)
+            for surface_id in changed_surface_ids
+        }
+        await session_service.append_event(
+            session,
+            Event(
+                invocation_id=new_invocation_context_id(),
+                author="system",
+                actions=EventActions(state_delta=state_delta),
+            ),
+        )
+        logging.info("Persisted %d changed subagent routes for session %s", len(state_delta), session_id)
+        return
+      except Exception:
+        logging.exception(
+            "Failed to persist subagent routes for session %s (attempt %d/%d)",
+            session_id, attempt, PERSIST_ATTEMPTS,
+        )
+    # Leave the routes for the next write to pick up.
+    session_routes.changed_surface_ids |= changed_surface_ids
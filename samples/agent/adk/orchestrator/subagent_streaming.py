@@ -0,0 +1,45 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+from contextvars import ContextVar
+
+from a2a.client.client import ClientConfig
+
+# Whether the orchestrator request being handled was sent with message/stream.
+# Set by the orchestrator's executor for each request.
+orchestrator_request_streaming: ContextVar[bool] = ContextVar(
+    "orchestrator_request_streaming", default=False
+)
+
+
+class RequestScopedStreamingClientConfig(ClientConfig):
+    """A client config that only streams while the orchestrator request streams.
+
+    A streaming subagent puts only the A2UI messages it has not streamed yet
+    in its final message, and ADK builds the orchestrator's final task from
+    that last message alone. A client that called the orchestrator with
+    message/send would therefore lose every streamed message, so subagents are
+    called with message/send for it instead.
+
+    The A2A client reads `streaming` on every call, so one client, and its
+    pooled connections, serves both kinds of request.
+    """
+
+    @property
+    def streaming(self) -> bool:
+        return self._streaming and orchestrator_request_streaming.get()
+
+    @streaming.setter
+    def streaming(self, streaming: bool):
+        self._streaming = streaming
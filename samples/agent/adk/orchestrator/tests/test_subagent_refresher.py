@@ -0,0 +1,200 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import hashlib
+
+import httpx
+import pytest
+from a2a.types import AgentCapabilities, AgentCard
+from a2a.utils.constants import AGENT_CARD_WELL_KNOWN_PATH
+from google.adk.agents.llm_agent import LlmAgent
+
+import subagent_refresher
+from subagent_refresher import SubagentRefresher
+
+CONTACTS_URL = "http://contacts.test"
+RESTAURANTS_URL = "http://restaurants.test"
+
+
+def _make_card(name: str, version: str = "1.0.0") -> AgentCard:
+    return AgentCard(
+        name=name,
+        description=f"{name} v{version}",
+        url="http://unused.test",
+        version=version,
+        default_input_modes=["text"],
+        default_output_modes=["text"],
+        capabilities=AgentCapabilities(),
+        skills=[],
+    )
+
+
+class FakeCardServer:
+    """Serves agent cards with ETags, answering 304 when the card is unchanged."""
+
+    def __init__(self):
+        # base URL -> card, or None while the subagent is down
+        self.cards: dict[str, AgentCard] = {}
+        self.requests: list[httpx.Request] = []
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        assert request.url.path == AGENT_CARD_WELL_KNOWN_PATH
+        card = self.cards.get(f"{request.url.scheme}://{request.url.host}")
+        if card is None:
+            return httpx.Response(503)
+
+        body = card.model_dump_json(by_alias=True, exclude_none=True)
+        etag = '"%s"' % hashlib.sha256(body.encode()).hexdigest()
+        if request.headers.get("If-None-Match") == etag:
+            return httpx.Response(304, headers={"ETag": etag})
+        return httpx.Response(
+            200,
+            content=body,
+            headers={"ETag": etag, "Content-Type": "application/json"},
+        )
+
+    def requests_to(self, base_url: str) -> list[httpx.Request]:
+        return [r for r in self.requests if str(r.url).startswith(base_url)]
+
+
+class FakeRemoteAgentBuilder:
+    """Builds a stand-in for each remote subagent and records what it built."""
+
+    def __init__(self):
+        self.built: list[LlmAgent] = []
+
+    def __call__(self, card: AgentCard) -> LlmAgent:
+        subagent = LlmAgent(name=card.name, description=card.description)
+        self.built.append(subagent)
+        return subagent
+
+
+@pytest.fixture
+def server():
+    return FakeCardServer()
+
+
+@pytest.fixture
+def build_remote_agent():
+    return FakeRemoteAgentBuilder()
+
+
+@pytest.fixture
+def orchestrator():
+    return LlmAgent(name="orchestrator_agent", sub_agents=[])
+
+
+def _make_refresher(server, build_remote_agent, urls) -> SubagentRefresher:
+    httpx_client = httpx.AsyncClient(transport=httpx.MockTransport(server.handle))
+    return SubagentRefresher(urls, build_remote_agent, httpx_client)
+
+
+def test_resolve_registers_subagents_that_answer(server, build_remote_agent, orchestrator):
+    server.cards[CONTACTS_URL] = _make_card("contacts")
+    refresher = _make_refresher(
+        server, build_remote_agent, [CONTACTS_URL, RESTAURANTS_URL]
+    )
+
+    asyncio.run(refresher.resolve(orchestrator))
+
+    assert [sub.name for sub in orchestrator.sub_agents] == ["contacts"]
+    assert orchestrator.sub_agents[0].parent_agent is orchestrator
+    assert refresher.unresolved_urls == [RESTAURANTS_URL]
+
+
+def test_run_registers_subagent_that_was_down(
+    server, build_remote_agent, orchestrator, monkeypatch
+):
+    monkeypatch.setattr(subagent_refresher, "CARD_RETRY_INITIAL_DELAY_SECONDS", 0.01)
+    server.cards[CONTACTS_URL] = _make_card("contacts")
+    refresher = _make_refresher(
+        server, build_remote_agent, [CONTACTS_URL, RESTAURANTS_URL]
+    )
+
+    async def run_until_registered():
+        await refresher.resolve(orchestrator)
+        server.cards[RESTAURANTS_URL] = _make_card("restaurants")
+        task = asyncio.create_task(refresher.run(orchestrator))
+        try:
+            while len(orchestrator.sub_agents) < 2:
+                await asyncio.sleep(0.01)
+        finally:
+            task.cancel()
+
+    asyncio.run(asyncio.wait_for(run_until_registered(), timeout=5))
+
+    assert [sub.name for sub in orchestrator.sub_agents] == ["contacts", "restaurants"]
+    assert orchestrator.sub_agents[1].parent_agent is orchestrator
+    assert refresher.unresolved_urls == []
+
+
+def test_changed_card_replaces_subagent(server, build_remote_agent, orchestrator):
+    server.cards[CONTACTS_URL] = _make_card("contacts")
+    server.cards[RESTAURANTS_URL] = _make_card("restaurants")
+    refresher = _make_refresher(
+        server, build_remote_agent, [CONTACTS_URL, RESTAURANTS_URL]
+    )
+    asyncio.run(refresher.resolve(orchestrator))
+    old_sub_agents = orchestrator.sub_agents
+    old_contacts, restaurants = old_sub_agents
+
+    server.cards[CONTACTS_URL] = _make_card("contacts", version="2.0.0")
+    asyncio.run(refresher.resolve(orchestrator))
+
+    new_contacts = orchestrator.sub_agents[0]
+    assert new_contacts is not old_contacts
+    assert new_contacts.description == "contacts v2.0.0"
+    assert new_contacts.parent_agent is orchestrator
+    assert orchestrator.sub_agents[1] is restaurants
+    # The list is replaced, so requests reading the old one are unaffected.
+    assert orchestrator.sub_agents is not old_sub_agents
+    assert old_sub_agents == [old_contacts, restaurants]
+
+
+def test_unchanged_card_is_not_rebuilt(server, build_remote_agent, orchestrator):
+    server.cards[CONTACTS_URL] = _make_card("contacts")
+    refresher = _make_refresher(server, build_remote_agent, [CONTACTS_URL])
+    asyncio.run(refresher.resolve(orchestrator))
+    sub_agents = orchestrator.sub_agents
+
+    asyncio.run(refresher.resolve(orchestrator))
+
+    refresh_request = server.requests_to(CONTACTS_URL)[-1]
+    assert refresh_request.headers["If-None-Match"]
+    assert len(build_remote_agent.built) == 1
+    assert orchestrator.sub_agents is sub_agents
+
+
+def test_duplicate_subagent_name_is_skipped(server, build_remote_agent, orchestrator):
+    server.cards[CONTACTS_URL] = _make_card("contacts")
+    server.cards[RESTAURANTS_URL] = _make_card("contacts", version="2.0.0")
+    refresher = _make_refresher(
+        server, build_remote_agent, [CONTACTS_URL, RESTAURANTS_URL]
+    )
+
+    asyncio.run(refresher.resolve(orchestrator))
+
+    assert len(orchestrator.sub_agents) == 1
+    assert orchestrator.sub_agents[0].description == "contacts v1.0.0"
+    assert refresher.unresolved_urls == [RESTAURANTS_URL]
+
+    # The skipped card is fetched in full again, rather than answered with a 304.
+    asyncio.run(refresher.resolve(orchestrator))
+
+    refresh_request = server.requests_to(RESTAURANTS_URL)[-1]
+    assert "If-None-Match" not in refresh_request.headers
+    assert len(orchestrator.sub_agents) == 1
+    assert orchestrator.sub_agents[0].description == "contacts v1.0.0"
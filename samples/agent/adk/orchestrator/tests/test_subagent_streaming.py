@@ -0,0 +1,169 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import asyncio
+import json
+import uuid
+
+import httpx
+import pytest
+from a2a.client.client_factory import ClientFactory
+from a2a.types import (
+    AgentCapabilities,
+    AgentCard,
+    Message,
+    Part,
+    Role,
+    TextPart,
+    TransportProtocol,
+)
+from subagent_streaming import (
+    RequestScopedStreamingClientConfig,
+    orchestrator_request_streaming,
+)
+
+SUBAGENT_URL = "http://subagent.test/"
+A2UI_MESSAGES = [
+    {"beginRendering": {"surfaceId": "contact-card", "root": "root"}},
+    {"deleteSurface": {"surfaceId": "old-card"}},
+]
+
+
+def _make_card(streaming: bool = True) -> AgentCard:
+    return AgentCard(
+        name="Subagent",
+        description="A subagent",
+        url=SUBAGENT_URL,
+        version="1.0.0",
+        default_input_modes=["text"],
+        default_output_modes=["text"],
+        capabilities=AgentCapabilities(streaming=streaming),
+        skills=[],
+    )
+
+
+def _make_status_update(text: str, final: bool) -> dict:
+    return {
+        "kind": "status-update",
+        "taskId": "task-1",
+        "contextId": "context-1",
+        "final": final,
+        "status": {
+            "state": "completed" if final else "working",
+            "message": {
+                "kind": "message",
+                "messageId": str(uuid.uuid4()),
+                "role": "agent",
+                "parts": [{"kind": "text", "text": text}],
+            },
+        },
+    }
+
+
+class FakeSubagent:
+    """Answers message/send with one message and message/stream with one event per A2UI message."""
+
+    def __init__(self):
+        self.methods = []
+
+    def handle(self, request: httpx.Request) -> httpx.Response:
+        rpc_request = json.loads(request.content)
+        self.methods.append(rpc_request["method"])
+        if rpc_request["method"] == "message/send":
+            result = {
+                "kind": "message",
+                "messageId": str(uuid.uuid4()),
+                "role": "agent",
+                "parts": [{"kind": "text", "text": json.dumps(A2UI_MESSAGES)}],
+            }
+            return httpx.Response(
+                200, json={"jsonrpc": "2.0", "id": rpc_request["id"], "result": result}
+            )
+
+        events = [
+            _make_status_update(json.dumps(a2ui_message), final=False)
+            for a2ui_message in A2UI_MESSAGES
+        ] + [_make_status_update("done", final=True)]
+        body = "".join(
+            "data: "
+            + json.dumps({"jsonrpc": "2.0", "id": rpc_request["id"], "result": event})
+            + "\n\n"
+            for event in events
+        )
+        return httpx.Response(
+            200, headers={"Content-Type": "text/event-stream"}, content=body
+        )
+
+
+def _send(orchestrator_streaming: bool, config_streaming: bool = True, card_streaming: bool = True):
+    subagent = FakeSubagent()
+
+    async def run():
+        token = orchestrator_request_streaming.set(orchestrator_streaming)
+        try:
+            async with httpx.AsyncClient(
+                transport=httpx.MockTransport(subagent.handle)
+            ) as httpx_client:
+                config = RequestScopedStreamingClientConfig(
+                    httpx_client=httpx_client,
+                    streaming=config_streaming,
+                    supported_transports=[TransportProtocol.jsonrpc],
+                )
+                client = ClientFactory(config).create(_make_card(card_streaming))
+                message = Message(
+                    message_id=str(uuid.uuid4()),
+                    role=Role.user,
+                    parts=[Part(root=TextPart(text="Who is Alex Jordan?"))],
+                )
+                return [response async for response in client.send_message(message)]
+        finally:
+            orchestrator_request_streaming.reset(token)
+
+    return subagent, asyncio.run(run())
+
+
+def test_streaming_request_forwards_each_update():
+    subagent, responses = _send(orchestrator_streaming=True)
+
+    assert subagent.methods == ["message/stream"]
+    # Each update is yielded on its own, as the subagent sends it.
+    streamed_texts = [update.status.message.parts[0].root.text for _, update in responses]
+    assert streamed_texts == [json.dumps(message) for message in A2UI_MESSAGES] + ["done"]
+
+
+def test_blocking_request_gets_every_message_in_one_response():
+    subagent, responses = _send(orchestrator_streaming=False)
+
+    assert subagent.methods == ["message/send"]
+    assert len(responses) == 1
+    assert json.loads(responses[0].parts[0].root.text) == A2UI_MESSAGES
+
+
+@pytest.mark.parametrize(
+    "config_streaming, card_streaming", [(False, True), (True, False)]
+)
+def test_streaming_request_falls_back_to_blocking(config_streaming, card_streaming):
+    subagent, _ = _send(
+        orchestrator_streaming=True,
+        config_streaming=config_streaming,
+        card_streaming=card_streaming,
+    )
+
+    assert subagent.methods == ["message/send"]
+
+
+def test_streaming_defaults_to_blocking_outside_a_request():
+    config = RequestScopedStreamingClientConfig(streaming=True)
+
+    assert not config.streaming
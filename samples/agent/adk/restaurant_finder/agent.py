@@ -19,7 +19,12 @@ from collections.abc import AsyncIterable
 from typing import Any
 
 import jsonschema
+from a2ui.a2ui_json_fixer import fix_a2ui_json
+from a2ui.a2ui_logging import LazyJson
+from a2ui.a2ui_stream_parser import A2uiMessageStreamer
+from a2ui.a2ui_validator import get_a2ui_validator
 from google.adk.agents.llm_agent import LlmAgent
+from google.adk.agents.run_config import RunConfig, StreamingMode
 from google.adk.artifacts import InMemoryArtifactService
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
 from google.adk.models.lite_llm import LiteLlm
@@ -71,21 +76,20 @@ class RestaurantAgent:
             memory_service=InMemoryMemoryService(),
         )
 
-        # --- MODIFICATION: Wrap the schema ---
-        # Load the A2UI_SCHEMA string into a Python object for validation
-        try:
-            # First, load the schema for a *single message*
-            single_message_schema = json.loads(A2UI_SCHEMA)
+        # Partial responses are only needed to stream A2UI messages.
+        self._run_config = (
+            RunConfig(streaming_mode=StreamingMode.SSE) if use_ui else None
+        )
 
-            # The prompt instructs the LLM to return a *list* of messages.
-            # Therefore, our validation schema must be an *array* of the single message schema.
-            self.a2ui_schema_object = {"type": "array", "items": single_message_schema}
-            logger.info(
-                "A2UI_SCHEMA successfully loaded and wrapped in an array validator."
-            )
+        # --- MODIFICATION: Compile the schema validator ---
+        # Load the A2UI_SCHEMA string into a shared, compiled validator.
+        # The validator checks the *list* of messages the prompt asks the LLM for.
+        try:
+            self.a2ui_validator = get_a2ui_validator(A2UI_SCHEMA)
+            logger.info("A2UI_SCHEMA successfully loaded into a compiled validator.")
         except json.JSONDecodeError as e:
             logger.error(f"CRITICAL: Failed to parse A2UI_SCHEMA: {e}")
-            self.a2ui_schema_object = None
+            self.a2ui_validator = None
         # --- END MODIFICATION ---
 
     def get_processing_message(self) -> str:
@@ -135,7 +139,7 @@ class RestaurantAgent:
         current_query_text = query
 
         # Ensure schema was loaded
-        if self.use_ui and self.a2ui_schema_object is None:
+        if self.use_ui and self.a2ui_validator is None:
             logger.error(
                 "--- RestaurantAgent.stream: A2UI_SCHEMA is not loaded. "
                 "Cannot perform UI validation. ---"
@@ -149,8 +153,21 @@ class RestaurantAgent:
             }
             return
 
+        # Stream model output so that A2UI messages can be sent to the client
+        # as soon as the model finishes writing each one.
+        a2ui_streamer = A2uiMessageStreamer(self.a2ui_validator)
+
         while attempt <= max_retries:
             attempt += 1
+            if attempt > 1:
+                # Messages from a retry are only sent with the final response,
+                # once it has been validated. The whole response is regenerated,
+                # so take down the surfaces the abandoned attempt drew.
+                for a2ui_message in a2ui_streamer.abandon():
+                    yield {
+                        "is_task_complete": False,
+                        "a2ui_message": a2ui_message,
+                    }
             logger.info(
                 f"--- RestaurantAgent.stream: Attempt {attempt}/{max_retries + 1} "
                 f"for session {session_id} ---"
@@ -165,8 +182,20 @@ class RestaurantAgent:
                 user_id=self._user_id,
                 session_id=session.id,
                 new_message=current_message,
+                run_config=self._run_config,
             ):
-                logger.info(f"Event from runner: {event}")
+                if event.partial:
+                    if event.content and event.content.parts:
+                        for part in event.content.parts:
+                            for a2ui_message in a2ui_streamer.feed(part.text or ""):
+                                yield {
+                                    "is_task_complete": False,
+                                    "a2ui_message": a2ui_message,
+                                }
+                    continue
+                # Each model response is streamed separately.
+                a2ui_streamer.end_response()
+                logger.info("Event from runner: %s", LazyJson(event))
                 if event.is_final_response():
                     if (
                         event.content
@@ -178,7 +207,7 @@ class RestaurantAgent:
                         )
                     break  # Got the final response, stop consuming events
                 else:
-                    logger.info(f"Intermediate event: {event}")
+                    logger.info("Intermediate event: %s", LazyJson(event))
                     # Yield intermediate updates on every attempt
                     yield {
                         "is_task_complete": False,
@@ -219,9 +248,18 @@ class RestaurantAgent:
                     if not json_string.strip():
                         raise ValueError("JSON part is empty.")
 
-                    json_string_cleaned = (
-                        json_string.strip().lstrip("```json").rstrip("```").strip()
-                    )
+                    # Fix mechanical mistakes (code fences, trailing commas, ...) locally
+                    # instead of spending a retry on them.
+                    json_fix_result = fix_a2ui_json(json_string)
+                    json_string_cleaned = json_fix_result.json_string
+                    if json_fix_result.was_fixed:
+                        logger.info(
+                            f"--- RestaurantAgent.stream: Fixed A2UI JSON locally: {json_fix_result.fixes} ---"
+                        )
+                        # The client parses the final response, so it must get the fixed JSON.
+                        final_response_content = (
+                            f"{text_part}---a2ui_JSON---\n{json_string_cleaned}"
+                        )
 
                     if not json_string_cleaned:
                         raise ValueError("Cleaned JSON string is empty.")
@@ -231,13 +269,23 @@ class RestaurantAgent:
                     parsed_json_data = json.loads(json_string_cleaned)
 
                     # 2. Check if it validates against the A2UI_SCHEMA
-                    # This will raise jsonschema.exceptions.ValidationError if it fails
+                    # This will raise a ValueError naming each failing message
                     logger.info(
                         "--- RestaurantAgent.stream: Validating against A2UI_SCHEMA... ---"
                     )
-                    jsonschema.validate(
-                        instance=parsed_json_data, schema=self.a2ui_schema_object
+                    # Each message is checked on its own so the error names exactly
+                    # which messages failed and where.
+                    validation_result = self.a2ui_validator.validate_messages(
+                        parsed_json_data
                     )
+                    if not validation_result.is_valid:
+                        logger.info(
+                            f"--- RestaurantAgent.stream: {len(validation_result.valid_messages)} messages valid, "
+                            f"messages {validation_result.failed_indices} failed. ---"
+                        )
+                        raise ValueError(
+                            "; ".join(str(error) for error in validation_result.errors)
+                        )
                     # --- End New Validation Steps ---
 
                     logger.info(
@@ -266,7 +314,7 @@ class RestaurantAgent:
                 logger.info(
                     f"--- RestaurantAgent.stream: Response is valid. Sending final response (Attempt {attempt}). ---"
                 )
-                logger.info(f"Final response: {final_response_content}")
+                logger.info("Final response: %s", LazyJson(final_response_content))
                 yield {
                     "is_task_complete": True,
                     "content": final_response_content,
@@ -293,6 +341,12 @@ class RestaurantAgent:
         logger.error(
             "--- RestaurantAgent.stream: Max retries exhausted. Sending text-only error. ---"
         )
+        # Don't leave a half-drawn surface next to the error.
+        for a2ui_message in a2ui_streamer.abandon():
+            yield {
+                "is_task_complete": False,
+                "a2ui_message": a2ui_message,
+            }
         yield {
             "is_task_complete": True,
             "content": (
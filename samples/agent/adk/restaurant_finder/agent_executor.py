@@ -12,7 +12,6 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import json
 import logging
 
 from a2a.server.agent_execution import AgentExecutor, RequestContext
@@ -32,7 +31,13 @@ from a2a.utils import (
     new_task,
 )
 from a2a.utils.errors import ServerError
-from a2ui.a2ui_extension import create_a2ui_part, try_activate_a2ui_extension
+from a2ui.a2ui_extension import (
+    create_a2ui_part,
+    is_streaming_request,
+    try_activate_a2ui_extension,
+)
+from a2ui.a2ui_logging import LazyJson
+from a2ui.a2ui_stream_parser import get_undelivered_messages, parse_a2ui_response
 from agent import RestaurantAgent
 
 logger = logging.getLogger(__name__)
@@ -83,14 +88,14 @@ class RestaurantAgentExecutor(AgentExecutor):
                         logger.info(f"  Part {i}: Found a2ui UI ClientEvent payload.")
                         ui_event_part = part.root.data["userAction"]
                     else:
-                        logger.info(f"  Part {i}: DataPart (data: {part.root.data})")
+                        logger.info("  Part %d: DataPart (data: %s)", i, LazyJson(part.root.data))
                 elif isinstance(part.root, TextPart):
-                    logger.info(f"  Part {i}: TextPart (text: {part.root.text})")
+                    logger.info("  Part %d: TextPart (text: %s)", i, LazyJson(part.root.text))
                 else:
                     logger.info(f"  Part {i}: Unknown part type ({type(part.root)})")
 
         if ui_event_part:
-            logger.info(f"Received a2ui ClientEvent: {ui_event_part}")
+            logger.info("Received a2ui ClientEvent: %s", LazyJson(ui_event_part))
             action = ui_event_part.get("actionName")
             ctx = ui_event_part.get("context", {})
 
@@ -122,14 +127,29 @@ class RestaurantAgentExecutor(AgentExecutor):
             task = new_task(context.message)
             await event_queue.enqueue_event(task)
         updater = TaskUpdater(event_queue, task.id, task.context_id)
+        # Only streaming clients see working updates; the others get every
+        # A2UI message with the final response.
+        is_streaming = is_streaming_request(context)
+        streamed_messages = []
 
         async for item in agent.stream(query, task.context_id):
             is_task_complete = item["is_task_complete"]
             if not is_task_complete:
-                await updater.update_status(
-                    TaskState.working,
-                    new_agent_text_message(item["updates"], task.context_id, task.id),
-                )
+                if a2ui_message := item.get("a2ui_message"):
+                    if not is_streaming:
+                        continue
+                    await updater.update_status(
+                        TaskState.working,
+                        new_agent_parts_message(
+                            [create_a2ui_part(a2ui_message)], task.context_id, task.id
+                        ),
+                    )
+                    streamed_messages.append(a2ui_message)
+                else:
+                    await updater.update_status(
+                        TaskState.working,
+                        new_agent_text_message(item["updates"], task.context_id, task.id),
+                    )
                 continue
 
             final_state = (
@@ -140,40 +160,20 @@ class RestaurantAgentExecutor(AgentExecutor):
 
             content = item["content"]
             final_parts = []
-            if "---a2ui_JSON---" in content:
-                logger.info("Splitting final response into text and UI parts.")
-                text_content, json_string = content.split("---a2ui_JSON---", 1)
-
-                if text_content.strip():
-                    final_parts.append(Part(root=TextPart(text=text_content.strip())))
-
-                if json_string.strip():
-                    try:
-                        json_string_cleaned = (
-                            json_string.strip().lstrip("```json").rstrip("```").strip()
-                        )
-                        # The new protocol sends a stream of JSON objects.
-                        # For this example, we'll assume they are sent as a list in the final response.
-                        json_data = json.loads(json_string_cleaned)
-
-                        if isinstance(json_data, list):
-                            logger.info(
-                                f"Found {len(json_data)} messages. Creating individual DataParts."
-                            )
-                            for message in json_data:
-                                final_parts.append(create_a2ui_part(message))
-                        else:
-                            # Handle the case where a single JSON object is returned
-                            logger.info(
-                                "Received a single JSON object. Creating a DataPart."
-                            )
-                            final_parts.append(create_a2ui_part(json_data))
-
-                    except json.JSONDecodeError as e:
-                        logger.error(f"Failed to parse UI JSON: {e}")
-                        final_parts.append(Part(root=TextPart(text=json_string)))
-            else:
-                final_parts.append(Part(root=TextPart(text=content.strip())))
+            try:
+                text_content, a2ui_messages = parse_a2ui_response(content)
+                if text_content:
+                    final_parts.append(Part(root=TextPart(text=text_content)))
+                # Messages the client already got while streaming are not repeated.
+                a2ui_messages = get_undelivered_messages(a2ui_messages, streamed_messages)
+                logger.info(
+                    f"Found {len(a2ui_messages)} messages. Creating individual DataParts."
+                )
+                for message in a2ui_messages:
+                    final_parts.append(create_a2ui_part(message))
+            except ValueError as e:
+                logger.error(f"Failed to parse UI JSON: {e}")
+                final_parts = [Part(root=TextPart(text=content.strip()))]
 
             logger.info("--- FINAL PARTS TO BE SENT ---")
             for i, part in enumerate(final_parts):
@@ -785,6 +785,7 @@ A2UI_SCHEMA = r'''
 }
 '''
 
+from a2ui.a2ui_schema_prompt import build_schema_prompt
 from a2ui_examples import RESTAURANT_UI_EXAMPLES
 
 
@@ -801,6 +802,8 @@ def get_ui_prompt(base_url: str, examples: str) -> str:
     """
     # The f-string substitution for base_url happens here, at runtime.
     formatted_examples = examples.format(base_url=base_url)
+    # Only include the components the examples use, to keep the prompt small.
+    a2ui_schema = build_schema_prompt(A2UI_SCHEMA, formatted_examples)
 
     return f"""
     You are a helpful restaurant finding assistant. Your final output MUST be a a2ui UI JSON response.
@@ -821,7 +824,7 @@ def get_ui_prompt(base_url: str, examples: str) -> str:
     {formatted_examples}
 
     ---BEGIN A2UI JSON SCHEMA---
-    {A2UI_SCHEMA}
+    {a2ui_schema}
     ---END A2UI JSON SCHEMA---
     """
 
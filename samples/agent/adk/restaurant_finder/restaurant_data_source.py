@@ -0,0 +1,224 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import logging
+import re
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# The base URL the image URLs in restaurant_data.json are written with.
+DEFAULT_BASE_URL = "http://localhost:10002"
+
+# Common ways users refer to a city, mapped to the city name in the addresses.
+LOCATION_ALIASES = {
+    "ny": "new york",
+    "nyc": "new york",
+    "new york city": "new york",
+    "manhattan": "new york",
+}
+
+# Words that describe a cuisine rather than name it, as in "chinese food".
+CUISINE_FILLER_WORDS = {"food", "cuisine", "dishes", "restaurant", "restaurants", "place", "places"}
+
+# Regional styles and dishes, mapped to the cuisine in the data.
+CUISINE_ALIASES = {
+    "cantonese": "chinese",
+    "dim sum": "chinese",
+    "dumplings": "chinese",
+    "hunan": "chinese",
+    "shanghainese": "chinese",
+    "sichuan": "chinese",
+    "szechuan": "chinese",
+}
+
+
+def _normalize_words(text: str) -> str:
+    # Drops punctuation and numbers, e.g. the zip code in "NY 10003".
+    return " ".join(re.sub(r"[^a-z ]", " ", text.lower()).split())
+
+
+def get_location_cities(location: str) -> list[str]:
+    """Returns the lowercase city names a location like "Manhattan, NY" may refer to.
+
+    Each comma separated part is looked up on its own, so "Upper East Side,
+    New York" and "Brooklyn, NY" both match addresses in New York.
+    """
+    cities = []
+    for part in location.split(","):
+        city = _normalize_words(part)
+        city = LOCATION_ALIASES.get(city, city)
+        if city and city not in cities:
+            cities.append(city)
+    return cities
+
+
+def normalize_cuisine(cuisine: str) -> str:
+    """Normalizes a cuisine like "Chinese food" or "Szechuan" to a lowercase cuisine name."""
+    words = [
+        word
+        for word in _normalize_words(cuisine).split()
+        if word not in CUISINE_FILLER_WORDS
+    ]
+    cuisine = " ".join(words)
+    return CUISINE_ALIASES.get(cuisine, cuisine)
+
+
+def _parse_city(address: str) -> str:
+    # Addresses look like "81 St Marks Pl, New York, NY 10003".
+    parts = [part.strip() for part in address.split(",")]
+    return parts[-2].lower() if len(parts) >= 3 else ""
+
+
+def _parse_rating(rating: str) -> int:
+    return rating.count("★")
+
+
+class RestaurantDataSource(ABC):
+    """A source of restaurants that can be filtered and paged."""
+
+    @abstractmethod
+    def find_restaurants(
+        self,
+        cuisine: str,
+        location: str,
+        limit: int,
+        offset: int = 0,
+    ) -> list[dict[str, Any]]:
+        """Returns restaurants matching the cuisine and location, best rated first.
+
+        The cuisine and location are free-form, e.g. "chinese food" or
+        "Manhattan, NY". If none of the restaurants in the location have the
+        cuisine, restaurants of any cuisine are returned.
+
+        Args:
+            cuisine: The cuisine to filter by, e.g. "Chinese" or "Szechuan".
+              Empty for any cuisine.
+            location: The location to filter by, e.g. "New York" or "NYC".
+            limit: The maximum number of restaurants to return.
+            offset: The number of matching restaurants to skip, for paging.
+
+        Returns:
+            The matching restaurants, ordered by rating.
+        """
+
+
+class SqliteRestaurantDataSource(RestaurantDataSource):
+    """A restaurant data source backed by an indexed SQLite table.
+
+    Lookups use an index on (city, cuisine, rating), so finding the top rated
+    restaurants for a location only reads the rows that are returned.
+    """
+
+    def __init__(self, connection: sqlite3.Connection):
+        self._connection = connection
+        self._lock = threading.Lock()
+        self._connection.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS restaurants (
+                id INTEGER PRIMARY KEY,
+                city TEXT NOT NULL,
+                cuisine TEXT NOT NULL,
+                rating INTEGER NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS restaurants_by_city_cuisine_rating
+                ON restaurants (city, cuisine, rating DESC, id);
+            CREATE INDEX IF NOT EXISTS restaurants_by_city_rating
+                ON restaurants (city, rating DESC, id);
+            """
+        )
+
+    @classmethod
+    def from_json_file(cls, file_path: str) -> "SqliteRestaurantDataSource":
+        """Loads a JSON list of restaurants into an in-memory SQLite database."""
+        with open(file_path) as f:
+            restaurants = json.load(f)
+        data_source = cls(sqlite3.connect(":memory:", check_same_thread=False))
+        data_source.add_restaurants(restaurants)
+        logger.info(f"Loaded {len(restaurants)} restaurants from {file_path}")
+        return data_source
+
+    def add_restaurants(self, restaurants: list[dict[str, Any]]):
+        rows = [
+            (
+                _parse_city(restaurant.get("address", "")),
+                restaurant.get("cuisine", "").lower(),
+                _parse_rating(restaurant.get("rating", "")),
+                json.dumps(restaurant, ensure_ascii=False),
+            )
+            for restaurant in restaurants
+        ]
+        with self._lock, self._connection:
+            self._connection.executemany(
+                "INSERT INTO restaurants (city, cuisine, rating, data) VALUES (?, ?, ?, ?)",
+                rows,
+            )
+
+    def find_restaurants(
+        self,
+        cuisine: str,
+        location: str,
+        limit: int,
+        offset: int = 0,
+    ) -> list[dict[str, Any]]:
+        cities = get_location_cities(location)
+        if not cities:
+            return []
+        where = f"city IN ({', '.join('?' * len(cities))})"
+        params: list[Any] = list(cities)
+
+        cuisine = normalize_cuisine(cuisine)
+        with self._lock:
+            if cuisine:
+                has_cuisine = self._connection.execute(
+                    f"SELECT 1 FROM restaurants WHERE {where} AND cuisine = ? LIMIT 1",
+                    [*params, cuisine],
+                ).fetchone()
+                if has_cuisine:
+                    where += " AND cuisine = ?"
+                    params.append(cuisine)
+                else:
+                    logger.info(f"No '{cuisine}' restaurants in {cities}, returning any cuisine")
+
+            rows = self._connection.execute(
+                f"SELECT data FROM restaurants WHERE {where} "
+                "ORDER BY rating DESC, id LIMIT ? OFFSET ?",
+                [*params, max(limit, 0), max(offset, 0)],
+            ).fetchall()
+        return [json.loads(data) for (data,) in rows]
+
+
+_data_source: Optional[RestaurantDataSource] = None
+_data_source_lock = threading.Lock()
+
+
+def set_restaurant_data_source(data_source: RestaurantDataSource):
+    """Replaces the data source used by the `get_restaurants` tool."""
+    global _data_source
+    with _data_source_lock:
+        _data_source = data_source
+
+
+def get_restaurant_data_source(default_file_path: str) -> RestaurantDataSource:
+    """Returns the configured data source, loading the JSON file on first use."""
+    global _data_source
+    with _data_source_lock:
+        if _data_source is None:
+            _data_source = SqliteRestaurantDataSource.from_json_file(default_file_path)
+        return _data_source
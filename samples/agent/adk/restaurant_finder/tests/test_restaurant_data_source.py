@@ -0,0 +1,93 @@
+# Copyright 2025 Google LLC
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#      https://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import sqlite3
+
+import pytest
+import restaurant_data_source
+
+RESTAURANTS = [
+    {
+        "name": "Xi'an Famous Foods",
+        "cuisine": "Chinese",
+        "rating": "★★★★☆",
+        "address": "81 St Marks Pl, New York, NY 10003",
+    },
+    {
+        "name": "Han Dynasty",
+        "cuisine": "Chinese",
+        "rating": "★★★★★",
+        "address": "90 3rd Ave, New York, NY 10003",
+    },
+    {
+        "name": "Joe's Pizza",
+        "cuisine": "Italian",
+        "rating": "★★★☆☆",
+        "address": "7 Carmine St, New York, NY 10014",
+    },
+    {
+        "name": "Golden Gate Dim Sum",
+        "cuisine": "Chinese",
+        "rating": "★★★★★",
+        "address": "1 Grant Ave, San Francisco, CA 94108",
+    },
+]
+
+
+@pytest.fixture
+def data_source():
+    data_source = restaurant_data_source.SqliteRestaurantDataSource(
+        sqlite3.connect(":memory:")
+    )
+    data_source.add_restaurants(RESTAURANTS)
+    return data_source
+
+
+def _names(restaurants):
+    return [restaurant["name"] for restaurant in restaurants]
+
+
+@pytest.mark.parametrize(
+    "cuisine", ["Chinese", "chinese food", "CHINESE RESTAURANTS", "Szechuan", "dim sum"]
+)
+def test_find_restaurants_free_form_cuisine(data_source, cuisine):
+    restaurants = data_source.find_restaurants(cuisine, "New York", limit=5)
+
+    assert _names(restaurants) == ["Han Dynasty", "Xi'an Famous Foods"]
+
+
+@pytest.mark.parametrize(
+    "location",
+    ["New York", "new york, NY 10003", "NYC", "Manhattan, NY", "Upper East Side, New York"],
+)
+def test_find_restaurants_free_form_location(data_source, location):
+    restaurants = data_source.find_restaurants("Chinese", location, limit=5)
+
+    assert _names(restaurants) == ["Han Dynasty", "Xi'an Famous Foods"]
+
+
+def test_find_restaurants_unknown_cuisine_returns_any_cuisine(data_source):
+    restaurants = data_source.find_restaurants("spicy noodles", "NYC", limit=5)
+
+    assert _names(restaurants) == ["Han Dynasty", "Xi'an Famous Foods", "Joe's Pizza"]
+
+
+def test_find_restaurants_pages_results(data_source):
+    restaurants = data_source.find_restaurants("", "New York", limit=2, offset=1)
+
+    assert _names(restaurants) == ["Xi'an Famous Foods", "Joe's Pizza"]
+
+
+def test_find_restaurants_unknown_location(data_source):
+    assert data_source.find_restaurants("Chinese", "Boston, MA", limit=5) == []
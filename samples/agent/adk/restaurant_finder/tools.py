@@ -17,39 +17,39 @@ import logging
 import os
 
 from google.adk.tools.tool_context import ToolContext
+from restaurant_data_source import DEFAULT_BASE_URL, get_restaurant_data_source
 
 logger = logging.getLogger(__name__)
 
 
-def get_restaurants(cuisine: str, location: str,  tool_context: ToolContext, count: int = 5) -> str:
+def get_restaurants(cuisine: str, location: str,  tool_context: ToolContext, count: int = 5, offset: int = 0) -> str:
     """Call this tool to get a list of restaurants based on a cuisine and location.
     'count' is the number of restaurants to return.
+    'offset' is the number of restaurants to skip, to get the next page of results.
     """
-    logger.info(f"--- TOOL CALLED: get_restaurants (count: {count}) ---")
+    logger.info(f"--- TOOL CALLED: get_restaurants (count: {count}, offset: {offset}) ---")
     logger.info(f"  - Cuisine: {cuisine}")
     logger.info(f"  - Location: {location}")
 
     items = []
-    if "new york" in location.lower() or "ny" in location.lower():
-        try:
-            script_dir = os.path.dirname(__file__)
-            file_path = os.path.join(script_dir, "restaurant_data.json")
-            with open(file_path) as f:
-                restaurant_data_str = f.read()
-                if base_url := tool_context.state.get("base_url"):                    
-                    restaurant_data_str = restaurant_data_str.replace("http://localhost:10002", base_url)
-                    logger.info(f'Updated base URL from tool context: {base_url}')
-                all_items = json.loads(restaurant_data_str)        
-
-            # Slice the list to return only the requested number of items
-            items = all_items[:count]
-            logger.info(
-                f"  - Success: Found {len(all_items)} restaurants, returning {len(items)}."
-            )
-
-        except FileNotFoundError:
-            logger.error(f"  - Error: restaurant_data.json not found at {file_path}")
-        except json.JSONDecodeError:
-            logger.error(f"  - Error: Failed to decode JSON from {file_path}")
+    try:
+        script_dir = os.path.dirname(__file__)
+        file_path = os.path.join(script_dir, "restaurant_data.json")
+        data_source = get_restaurant_data_source(file_path)
+        # Only the requested page of the best rated matches is read.
+        items = data_source.find_restaurants(cuisine, location, limit=count, offset=offset)
+
+        if base_url := tool_context.state.get("base_url"):
+            for item in items:
+                if image_url := item.get("imageUrl"):
+                    item["imageUrl"] = image_url.replace(DEFAULT_BASE_URL, base_url)
+            logger.info(f'Updated base URL from tool context: {base_url}')
+
+        logger.info(f"  - Success: Returning {len(items)} restaurants.")
+
+    except FileNotFoundError:
+        logger.error(f"  - Error: restaurant_data.json not found at {file_path}")
+    except json.JSONDecodeError:
+        logger.error(f"  - Error: Failed to decode JSON from {file_path}")
 
     return json.dumps(items)
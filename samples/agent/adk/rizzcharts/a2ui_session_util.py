@@ -12,6 +12,41 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import logging
+from typing import Any, Callable, Mapping, Optional
+
+from a2ui.a2ui_validator import A2uiValidator, get_a2ui_validator_by_hash
+
+logger = logging.getLogger(__name__)
+
 A2UI_ENABLED_STATE_KEY = "user:a2ui_enabled"
 A2UI_CATALOG_URI_STATE_KEY = "user:a2ui_catalog_uri"
-A2UI_SCHEMA_STATE_KEY = "user:a2ui_schema"
\ No newline at end of file
+# Only set for clients that send their catalog inline instead of a catalog uri.
+A2UI_INLINE_CATALOG_STATE_KEY = "user:a2ui_inline_catalog"
+# Sessions only store the hash of the merged schema, which is shared through the
+# A2UI validator registry.
+A2UI_SCHEMA_HASH_STATE_KEY = "user:a2ui_schema_hash"
+
+# Compiles the validator for a catalog uri or an inline catalog.
+A2uiValidatorLoader = Callable[[Optional[str], Optional[str]], A2uiValidator]
+
+
+def get_a2ui_validator_from_state(
+    state: Mapping[str, Any], load_a2ui_validator: A2uiValidatorLoader
+) -> A2uiValidator:
+    """Returns the validator for the A2UI schema referenced by the session state.
+
+    The validator registry is bounded, so the schema may have been evicted since
+    the session was prepared. It is then compiled again from the catalog stored
+    in the session state.
+    """
+    schema_hash = state.get(A2UI_SCHEMA_HASH_STATE_KEY)
+    if not schema_hash:
+        raise ValueError("A2UI schema is empty")
+    if (a2ui_validator := get_a2ui_validator_by_hash(schema_hash)) is not None:
+        return a2ui_validator
+
+    logger.info(f"A2UI schema {schema_hash[:12]} is not loaded, loading it from the session's catalog")
+    return load_a2ui_validator(
+        state.get(A2UI_CATALOG_URI_STATE_KEY), state.get(A2UI_INLINE_CATALOG_STATE_KEY)
+    )
@@ -13,7 +13,6 @@
 # limitations under the License.
 
 import json
-import jsonschema
 import logging
 from typing import Any, List, Optional
 
@@ -24,7 +23,9 @@ from google.adk.tools.base_tool import BaseTool
 from google.adk.tools import base_toolset
 from google.adk.tools.tool_context import ToolContext
 from google.adk.agents.readonly_context import ReadonlyContext
-from a2ui_session_util import A2UI_ENABLED_STATE_KEY, A2UI_SCHEMA_STATE_KEY
+from a2ui_session_util import A2UI_ENABLED_STATE_KEY, A2uiValidatorLoader, get_a2ui_validator_from_state
+from a2ui.a2ui_schema_prompt import build_schema_prompt
+from a2ui.a2ui_validator import A2uiValidator
 
 logger = logging.getLogger(__name__)
 
@@ -32,9 +33,9 @@ logger = logging.getLogger(__name__)
 class A2uiToolset(base_toolset.BaseToolset):
     """A toolset that provides A2UI Tools and can be enabled/disabled."""
 
-    def __init__(self):
+    def __init__(self, load_a2ui_validator: A2uiValidatorLoader):
         super().__init__()
-        self._ui_tools = [SendA2uiJsonToClientTool()]
+        self._ui_tools = [SendA2uiJsonToClientTool(load_a2ui_validator)]
 
     async def get_tools(
         self,
@@ -53,7 +54,8 @@ class SendA2uiJsonToClientTool(BaseTool):
     TOOL_NAME = "send_a2ui_json_to_client"
     A2UI_JSON_ARG_NAME = "a2ui_json"
 
-    def __init__(self):
+    def __init__(self, load_a2ui_validator: A2uiValidatorLoader):
+        self._load_a2ui_validator = load_a2ui_validator
         super().__init__(
             name=self.TOOL_NAME,
             description="Sends A2UI JSON to the client to render rich UI for the user. This tool can be called multiple times in the same call to render multiple UI surfaces."
@@ -77,12 +79,8 @@ class SendA2uiJsonToClientTool(BaseTool):
             ),
         )
 
-    def get_a2ui_schema(self, tool_context: ToolContext) -> dict[str, Any]:
-        a2ui_schema = tool_context.state.get(A2UI_SCHEMA_STATE_KEY)
-        if not a2ui_schema:
-            raise ValueError("A2UI schema is empty")
-        a2ui_schema_object = {"type": "array", "items": a2ui_schema} # Make a list since we support multiple parts in this tool call
-        return a2ui_schema_object 
+    def get_a2ui_validator(self, tool_context: ToolContext) -> A2uiValidator:
+        return get_a2ui_validator_from_state(tool_context.state, self._load_a2ui_validator)
 
     async def process_llm_request(
         self, *, tool_context: ToolContext, llm_request: LlmRequest
@@ -91,13 +89,20 @@ class SendA2uiJsonToClientTool(BaseTool):
             tool_context=tool_context, llm_request=llm_request
         )
 
-        a2ui_schema = self.get_a2ui_schema(tool_context)
+        # The validator's schema is read-only, so it is shared rather than copied.
+        a2ui_schema = self.get_a2ui_validator(tool_context).message_schema
+
+        # Only include the components used by the examples in the instructions.
+        instructions = llm_request.config.system_instruction
+        message_schema = build_schema_prompt(
+            a2ui_schema, instructions if isinstance(instructions, str) else ""
+        )
 
         llm_request.append_instructions(
             [
                 f"""    
 ---BEGIN A2UI JSON SCHEMA---
-{json.dumps(a2ui_schema)}
+{{"type":"array","items":{message_schema}}}
 ---END A2UI JSON SCHEMA---
 """
             ]
@@ -116,10 +121,10 @@ class SendA2uiJsonToClientTool(BaseTool):
                 )
 
             a2ui_json_payload = json.loads(a2ui_json)
-            a2ui_schema = self.get_a2ui_schema(tool_context)
-            jsonschema.validate(
-                instance=a2ui_json_payload, schema=a2ui_schema
-            )
+            validation_result = self.get_a2ui_validator(tool_context).validate_messages(a2ui_json_payload)
+            if not validation_result.is_valid:
+                # Name each failing message so the LLM only needs to fix those.
+                raise ValueError("; ".join(str(error) for error in validation_result.errors))
 
             logger.info(
                 f"Validated call to tool {self.TOOL_NAME} with {self.A2UI_JSON_ARG_NAME}"
@@ -12,12 +12,12 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import functools
 import json
 import logging
 import os
 from pathlib import Path
-from typing import Any
-import jsonschema
+from typing import Any, Optional
 
 from google.adk.models.lite_llm import LiteLlm
 from google.adk.agents.llm_agent import LlmAgent
@@ -26,49 +26,65 @@ from google.genai import types
 from google.adk.agents.readonly_context import ReadonlyContext
 from tools import get_store_sales, get_sales_data
 from a2ui_toolset import A2uiToolset
-from a2ui_session_util import A2UI_ENABLED_STATE_KEY, A2UI_CATALOG_URI_STATE_KEY, A2UI_SCHEMA_STATE_KEY
+from a2ui_session_util import A2UI_ENABLED_STATE_KEY, A2UI_CATALOG_URI_STATE_KEY, A2uiValidatorLoader, get_a2ui_validator_from_state
 from a2ui.a2ui_extension import STANDARD_CATALOG_ID
+from a2ui.a2ui_prompt_cache import A2uiPromptCache, A2uiPromptKey
+from a2ui.a2ui_validator import A2uiValidator
 
 logger = logging.getLogger(__name__)
 
+AGENT_NAME = "rizzcharts_agent"
 RIZZCHARTS_CATALOG_URI = "https://raw.githubusercontent.com/google/A2UI/refs/heads/main/a2a_agents/python/adk/samples/rizzcharts/rizzcharts_catalog_definition.json"
 
 class rizzchartsAgent:
     """An agent that runs an ecommerce dashboard"""
 
     SUPPORTED_CONTENT_TYPES = ["text", "text/plain"]
+
+    # The instructions are a callable, so ADK requests them on every LLM call.
+    _prompt_cache = A2uiPromptCache()
     
     @classmethod
-    def get_a2ui_schema(cls, readonly_context: ReadonlyContext) -> dict[str, Any]:
-        a2ui_schema = readonly_context.state.get(A2UI_SCHEMA_STATE_KEY)
-        if not a2ui_schema:
-            raise ValueError("A2UI schema is empty")
-        a2ui_schema_object = {"type": "array", "items": a2ui_schema} # Make a list since we support multiple parts in this tool call
-        return a2ui_schema_object 
+    def get_a2ui_validator(cls, readonly_context: ReadonlyContext, load_a2ui_validator: A2uiValidatorLoader) -> A2uiValidator:
+        return get_a2ui_validator_from_state(readonly_context.state, load_a2ui_validator)
 
     @classmethod
-    def load_example(cls, path: str, a2ui_schema: dict[str, Any]) -> dict[str, Any]:
+    def load_example(cls, path: str, a2ui_validator: A2uiValidator) -> dict[str, Any]:
         example_str = Path(path).read_text()
         example_json = json.loads(example_str)
-        jsonschema.validate(
-            instance=example_json, schema=a2ui_schema
-        )
+        a2ui_validator.validate(example_json)
         return example_json
 
     @classmethod
-    def get_instructions(cls, readonly_context: ReadonlyContext) -> str:
+    def get_instructions(cls, readonly_context: ReadonlyContext, load_a2ui_validator: A2uiValidatorLoader) -> str:
         use_ui = readonly_context.state.get(A2UI_ENABLED_STATE_KEY)
         if not use_ui:
             raise ValueError("A2UI must be enabled to run rizzcharts agent")
 
-        a2ui_schema = cls.get_a2ui_schema(readonly_context)
+        a2ui_validator = cls.get_a2ui_validator(readonly_context, load_a2ui_validator)
         catalog_uri = readonly_context.state.get(A2UI_CATALOG_URI_STATE_KEY)
+        return cls.get_cached_instructions(catalog_uri, a2ui_validator)
+
+    @classmethod
+    def get_cached_instructions(cls, catalog_uri: Optional[str], a2ui_validator: A2uiValidator) -> str:
+        """Returns the instructions for the catalog, building them once per (catalog, schema)."""
+        key = A2uiPromptKey(
+            agent_name=AGENT_NAME,
+            catalog_uri=catalog_uri,
+            schema_hash=a2ui_validator.schema_hash,
+        )
+        return cls._prompt_cache.get_prompt(
+            key, lambda: cls.build_instructions(catalog_uri, a2ui_validator)
+        )
+
+    @classmethod
+    def build_instructions(cls, catalog_uri: Optional[str], a2ui_validator: A2uiValidator) -> str:
         if catalog_uri == RIZZCHARTS_CATALOG_URI:
-            map_example = cls.load_example("examples/rizzcharts_catalog/map.json", a2ui_schema)
-            chart_example = cls.load_example("examples/rizzcharts_catalog/chart.json", a2ui_schema)
+            map_example = cls.load_example("examples/rizzcharts_catalog/map.json", a2ui_validator)
+            chart_example = cls.load_example("examples/rizzcharts_catalog/chart.json", a2ui_validator)
         elif catalog_uri == STANDARD_CATALOG_ID:
-            map_example = cls.load_example("examples/standard_catalog/map.json", a2ui_schema)
-            chart_example = cls.load_example("examples/standard_catalog/chart.json", a2ui_schema)
+            map_example = cls.load_example("examples/standard_catalog/map.json", a2ui_validator)
+            chart_example = cls.load_example("examples/standard_catalog/chart.json", a2ui_validator)
         else:
             raise ValueError(f"Unsupported catalog uri: {catalog_uri if catalog_uri else 'None'}")
 
@@ -127,21 +143,26 @@ Your task is to analyze the user's request, fetch the necessary data, select the
 ---END MAP EXAMPLE---
 """
         
-        logger.info(f"Generated system instructions for A2UI {'ENABLED' if use_ui else 'DISABLED'} and catalog {catalog_uri}")
+        logger.info(f"Generated system instructions for A2UI ENABLED and catalog {catalog_uri}")
 
         return final_prompt
 
     @classmethod
-    def build_agent(cls) -> LlmAgent:
-        """Builds the LLM agent for the rizzchartsAgent agent."""
+    def build_agent(cls, load_a2ui_validator: A2uiValidatorLoader) -> LlmAgent:
+        """Builds the LLM agent for the rizzchartsAgent agent.
+
+        Args:
+            load_a2ui_validator: Compiles the validator for a session's catalog
+              when it is no longer in the validator registry.
+        """
         LITELLM_MODEL = os.getenv("LITELLM_MODEL", "gemini/gemini-2.5-flash")
 
         return LlmAgent(
             model=LiteLlm(model=LITELLM_MODEL),
-            name="rizzcharts_agent",
+            name=AGENT_NAME,
             description="An agent that lets sales managers request sales data.",
-            instruction=cls.get_instructions,
-            tools=[get_store_sales, get_sales_data, A2uiToolset()],
+            instruction=functools.partial(cls.get_instructions, load_a2ui_validator=load_a2ui_validator),
+            tools=[get_store_sales, get_sales_data, A2uiToolset(load_a2ui_validator)],
             planner=BuiltInPlanner(
                 thinking_config=types.ThinkingConfig(
                     include_thoughts=True,
@@ -13,29 +13,33 @@
 # limitations under the License.
 
 import logging
-from typing import override
+from typing import List, Optional, override
 
 from a2a.server.agent_execution import RequestContext
+from a2a.server.events import Event as A2AEvent
 
-from google.adk.agents.invocation_context import new_invocation_context_id
+from google.adk.agents.invocation_context import InvocationContext, new_invocation_context_id
 from google.adk.artifacts import InMemoryArtifactService
 from google.adk.events.event import Event
 from google.adk.events.event_actions import EventActions
 from google.adk.memory.in_memory_memory_service import InMemoryMemoryService
 from google.adk.runners import Runner
 from google.adk.sessions import InMemorySessionService
+from google.adk.a2a.converters.event_converter import convert_event_to_a2a_events
+from google.adk.a2a.converters.part_converter import GenAIPartToA2APartConverter
 from google.adk.a2a.converters.request_converter import AgentRunRequest
 from google.adk.a2a.executor.a2a_agent_executor import (
     A2aAgentExecutorConfig,
     A2aAgentExecutor,
 )
 from a2ui.a2ui_extension import A2UI_EXTENSION_URI, get_a2ui_agent_extension, try_activate_a2ui_extension, A2UI_CLIENT_CAPABILITIES_KEY
+from a2ui.a2ui_logging import LazyJson
 from component_catalog_builder import ComponentCatalogBuilder
 from a2a.types import AgentCapabilities, AgentCard, AgentSkill
 from a2a.types import AgentExtension
-from a2ui_session_util import A2UI_ENABLED_STATE_KEY, A2UI_CATALOG_URI_STATE_KEY, A2UI_SCHEMA_STATE_KEY
+from a2ui_session_util import A2UI_ENABLED_STATE_KEY, A2UI_CATALOG_URI_STATE_KEY, A2UI_INLINE_CATALOG_STATE_KEY, A2UI_SCHEMA_HASH_STATE_KEY, get_a2ui_validator_from_state
 from agent import RIZZCHARTS_CATALOG_URI
-from a2ui.a2ui_extension import STANDARD_CATALOG_ID
+from a2ui.a2ui_extension import STANDARD_CATALOG_ID, SUPPORTED_CATALOG_IDS_KEY
 
 from agent import rizzchartsAgent
 import part_converter
@@ -60,7 +64,8 @@ class RizzchartsAgentExecutor(A2aAgentExecutor):
             },
             default_catalog_uri=STANDARD_CATALOG_ID
         )
-        agent = rizzchartsAgent.build_agent()
+        self._warm_instructions([STANDARD_CATALOG_ID, RIZZCHARTS_CATALOG_URI])
+        agent = rizzchartsAgent.build_agent(self._component_catalog_builder.load_catalog_validator)
         runner = Runner(
             app_name=agent.name,
             agent=agent,
@@ -68,12 +73,47 @@ class RizzchartsAgentExecutor(A2aAgentExecutor):
             session_service=InMemorySessionService(),
             memory_service=InMemoryMemoryService(),
         )
-        self._part_converter = part_converter.A2uiPartConverter()
         config = A2aAgentExecutorConfig(
-            gen_ai_part_converter=self._part_converter.convert_genai_part_to_a2a_part
+            event_converter=self._convert_event_to_a2a_events
         )
         super().__init__(runner=runner, config=config)
 
+    def _warm_instructions(self, catalog_uris: list[str]):
+        """Builds the agent instructions for each local catalog ahead of the first request."""
+        for catalog_uri in catalog_uris:
+            try:
+                a2ui_validator, catalog_uri = self._component_catalog_builder.load_a2ui_validator(
+                    client_ui_capabilities={SUPPORTED_CATALOG_IDS_KEY: [catalog_uri]}
+                )
+                rizzchartsAgent.get_cached_instructions(catalog_uri, a2ui_validator)
+            except Exception as e:
+                logger.warning(f"Failed to warm instructions for catalog {catalog_uri}: {e}")
+
+    def _convert_event_to_a2a_events(
+        self,
+        event: Event,
+        invocation_context: InvocationContext,
+        task_id: Optional[str],
+        context_id: Optional[str],
+        gen_ai_part_converter: GenAIPartToA2APartConverter,
+    ) -> List[A2AEvent]:
+        # Look up the schema for this invocation's session, so that concurrent
+        # sessions with different catalogs don't share a converter.
+        a2ui_validator = None
+        if invocation_context.session.state.get(A2UI_ENABLED_STATE_KEY):
+            a2ui_validator = get_a2ui_validator_from_state(
+                invocation_context.session.state,
+                self._component_catalog_builder.load_catalog_validator,
+            )
+        a2ui_part_converter = part_converter.A2uiPartConverter(a2ui_validator)
+        return convert_event_to_a2a_events(
+            event,
+            invocation_context,
+            task_id,
+            context_id,
+            a2ui_part_converter.convert_genai_part_to_a2a_part,
+        )
+
     def get_agent_card(self) -> AgentCard:
         return AgentCard(
             name="Ecommerce Dashboard Agent",
@@ -117,7 +157,7 @@ class RizzchartsAgentExecutor(A2aAgentExecutor):
         run_request: AgentRunRequest,
         runner: Runner,
     ):
-        logger.info(f"Loading session for message {context.message}")
+        logger.info("Loading session for message %s", LazyJson(context.message))
 
         session = await super()._prepare_session(context, run_request, runner)
 
@@ -126,23 +166,26 @@ class RizzchartsAgentExecutor(A2aAgentExecutor):
                 
         use_ui = try_activate_a2ui_extension(context)
         if use_ui:
-            a2ui_schema, catalog_uri = self._component_catalog_builder.load_a2ui_schema(client_ui_capabilities=context.message.metadata.get(A2UI_CLIENT_CAPABILITIES_KEY) if context.message and context.message.metadata else None)
+            catalog_uri, inline_catalog_str = self._component_catalog_builder.resolve_catalog(client_ui_capabilities=context.message.metadata.get(A2UI_CLIENT_CAPABILITIES_KEY) if context.message and context.message.metadata else None)
+            a2ui_validator = self._component_catalog_builder.load_catalog_validator(catalog_uri, inline_catalog_str)
 
-            self._part_converter.set_a2ui_schema(a2ui_schema)
-        
-            await runner.session_service.append_event(
-                session,
-                Event(
-                    invocation_id=new_invocation_context_id(),
-                    author="system",
-                    actions=EventActions(
-                        state_delta={
-                            A2UI_ENABLED_STATE_KEY: use_ui,
-                            A2UI_SCHEMA_STATE_KEY: a2ui_schema,
-                            A2UI_CATALOG_URI_STATE_KEY: catalog_uri,
-                        }
+            # Only store a reference to the shared schema, and only when it changed.
+            # The catalog is kept too, so the schema can be compiled again if it
+            # is evicted from the validator registry.
+            state_delta = {
+                A2UI_ENABLED_STATE_KEY: use_ui,
+                A2UI_SCHEMA_HASH_STATE_KEY: a2ui_validator.schema_hash,
+                A2UI_CATALOG_URI_STATE_KEY: catalog_uri,
+                A2UI_INLINE_CATALOG_STATE_KEY: inline_catalog_str,
+            }
+            if any(session.state.get(key) != value for key, value in state_delta.items()):
+                await runner.session_service.append_event(
+                    session,
+                    Event(
+                        invocation_id=new_invocation_context_id(),
+                        author="system",
+                        actions=EventActions(state_delta=state_delta),
                     ),
-                ),
-            )
+                )
 
         return session
@@ -12,77 +12,123 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-from functools import cache
+from collections import OrderedDict
 from typing import Any, List, Optional
 from pathlib import Path
 import json
 import logging
+import threading
 from agent import RIZZCHARTS_CATALOG_URI
 from a2ui.a2ui_extension import STANDARD_CATALOG_ID, SUPPORTED_CATALOG_IDS_KEY, INLINE_CATALOGS_KEY
+from a2ui.a2ui_logging import LazyJson
+from a2ui.a2ui_validator import A2uiValidator, get_a2ui_validator, get_a2ui_validator_by_hash, get_schema_hash
 logger = logging.getLogger(__name__)
 
+DEFAULT_MAX_CACHED_CATALOGS = 32
+
 
 class ComponentCatalogBuilder:
-    def __init__(self, a2ui_schema_path: str, uri_to_local_catalog_path: dict[str, str], default_catalog_uri: Optional[str]):
+    def __init__(self, a2ui_schema_path: str, uri_to_local_catalog_path: dict[str, str], default_catalog_uri: Optional[str], max_cached_catalogs: int = DEFAULT_MAX_CACHED_CATALOGS):
         self._a2ui_schema_path = a2ui_schema_path
         self._uri_to_local_catalog_path = uri_to_local_catalog_path
         self._default_catalog_uri = default_catalog_uri
-        pass
+        self._a2ui_schema: Optional[dict[str, Any]] = None
+        # Maps a catalog key (the catalog URI or the hash of an inline catalog) to the
+        # hash of the merged schema. The merged schemas themselves are shared through
+        # the A2UI validator registry.
+        self._max_cached_catalogs = max_cached_catalogs
+        self._schema_hashes: OrderedDict[str, str] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_base_a2ui_schema(self) -> dict[str, Any]:
+        """Returns the cached base schema. It is shared, so it must only be read."""
+        if self._a2ui_schema is None:
+            logger.info(f"Loading A2UI schema at {self._a2ui_schema_path}")
+            self._a2ui_schema = json.loads(Path(self._a2ui_schema_path).read_text())
+        return self._a2ui_schema
 
-    @cache
-    def get_file_content(self, path: str) -> str:
-        return Path(path).read_text()
+    def _get_cached_validator(self, catalog_key: str) -> Optional[A2uiValidator]:
+        with self._lock:
+            schema_hash = self._schema_hashes.get(catalog_key)
+            if schema_hash is not None:
+                self._schema_hashes.move_to_end(catalog_key)
+        return get_a2ui_validator_by_hash(schema_hash) if schema_hash else None
 
-    def load_a2ui_schema(self, client_ui_capabilities: Optional[dict[str, Any]]) -> tuple[dict[str, Any], Optional[str]]:
+    def _cache_validator(self, catalog_key: str, a2ui_validator: A2uiValidator):
+        with self._lock:
+            self._schema_hashes[catalog_key] = a2ui_validator.schema_hash
+            self._schema_hashes.move_to_end(catalog_key)
+            while len(self._schema_hashes) > self._max_cached_catalogs:
+                self._schema_hashes.popitem(last=False)
+
+    def resolve_catalog(self, client_ui_capabilities: Optional[dict[str, Any]]) -> tuple[Optional[str], Optional[str]]:
         """
         Returns:
-            A tuple of the a2ui_schema and the catalog uri
+            A tuple of the catalog uri and the inline catalog JSON. Exactly one of them is set.
         """
-        try: 
-            logger.info(f"Loading A2UI client capabilities {client_ui_capabilities}")
-                 
-            if client_ui_capabilities:                                
-                supported_catalog_uris: List[str] = client_ui_capabilities.get(SUPPORTED_CATALOG_IDS_KEY)
-                if RIZZCHARTS_CATALOG_URI in supported_catalog_uris:
-                    catalog_uri = RIZZCHARTS_CATALOG_URI
-                elif STANDARD_CATALOG_ID in supported_catalog_uris:
-                    catalog_uri = STANDARD_CATALOG_ID
-                else:
-                    catalog_uri = None
-
-                inline_catalog_str = client_ui_capabilities.get(INLINE_CATALOGS_KEY)                
-            elif self._default_catalog_uri:
-                logger.info(f"Using default catalog {self._default_catalog_uri} since client UI capabilities not found")
-                catalog_uri = self._default_catalog_uri
-                inline_catalog_str = None
+        logger.info("Loading A2UI client capabilities %s", LazyJson(client_ui_capabilities))
+
+        if client_ui_capabilities:
+            supported_catalog_uris: List[str] = client_ui_capabilities.get(SUPPORTED_CATALOG_IDS_KEY)
+            if RIZZCHARTS_CATALOG_URI in supported_catalog_uris:
+                catalog_uri = RIZZCHARTS_CATALOG_URI
+            elif STANDARD_CATALOG_ID in supported_catalog_uris:
+                catalog_uri = STANDARD_CATALOG_ID
             else:
-                raise ValueError("Client UI capabilities not provided")        
-            
-            if catalog_uri and inline_catalog_str:
-                raise ValueError(f"Cannot set both {SUPPORTED_CATALOG_IDS_KEY} and {INLINE_CATALOGS_KEY} in ClientUiCapabilities: {client_ui_capabilities}")    
-            elif catalog_uri:
-                if local_path := self._uri_to_local_catalog_path.get(catalog_uri):
-                    logger.info(f"Loading local component catalog with uri {catalog_uri} and local path {local_path}")
-                    catalog_str = self.get_file_content(local_path)
-                    catalog_json = json.loads(catalog_str)
-                else:
-                    raise ValueError(f"Local component catalog with URI {catalog_uri} not found")
-            elif inline_catalog_str:
-                logger.info(f"Loading inline component catalog {inline_catalog_str[:200]}")
-                catalog_json = json.loads(inline_catalog_str)
+                catalog_uri = None
+
+            inline_catalog_str = client_ui_capabilities.get(INLINE_CATALOGS_KEY)
+        elif self._default_catalog_uri:
+            logger.info(f"Using default catalog {self._default_catalog_uri} since client UI capabilities not found")
+            catalog_uri = self._default_catalog_uri
+            inline_catalog_str = None
+        else:
+            raise ValueError("Client UI capabilities not provided")
+
+        if catalog_uri and inline_catalog_str:
+            raise ValueError(f"Cannot set both {SUPPORTED_CATALOG_IDS_KEY} and {INLINE_CATALOGS_KEY} in ClientUiCapabilities: {client_ui_capabilities}")
+        elif not catalog_uri and not inline_catalog_str:
+            raise ValueError("Client UI capabilities not provided")
+        return catalog_uri, inline_catalog_str
+
+    def load_catalog_validator(self, catalog_uri: Optional[str], inline_catalog_str: Optional[str]) -> A2uiValidator:
+        """
+        Returns:
+            The validator for the a2ui_schema merged with the catalog uri or the inline catalog
+        """
+        if catalog_uri:
+            catalog_key = f"uri:{catalog_uri}"
+        elif inline_catalog_str:
+            catalog_key = f"inline:{get_schema_hash(inline_catalog_str)}"
+        else:
+            raise ValueError("Neither a catalog uri nor an inline catalog was provided")
+
+        if a2ui_validator := self._get_cached_validator(catalog_key):
+            return a2ui_validator
+
+        if catalog_uri:
+            if local_path := self._uri_to_local_catalog_path.get(catalog_uri):
+                logger.info(f"Loading local component catalog with uri {catalog_uri} and local path {local_path}")
+                catalog_json = json.loads(Path(local_path).read_text())
             else:
-                raise ValueError("Client UI capabilities not provided")
+                raise ValueError(f"Local component catalog with URI {catalog_uri} not found")
+        else:
+            logger.info("Loading inline component catalog %s", LazyJson(inline_catalog_str))
+            catalog_json = json.loads(inline_catalog_str)
 
-            logger.info(f"Loading A2UI schema at {self._a2ui_schema_path}")
-            a2ui_schema = self.get_file_content(self._a2ui_schema_path)
-            a2ui_schema_json = json.loads(a2ui_schema)
+        # The validator merges the catalog into a copy of the schema, so the base schema is never mutated.
+        a2ui_validator = get_a2ui_validator(self._get_base_a2ui_schema(), catalog_json)
+        self._cache_validator(catalog_key, a2ui_validator)
+        return a2ui_validator
 
-            a2ui_schema_json["properties"]["surfaceUpdate"]["properties"]["components"]["items"]["properties"]["component"]["properties"] = catalog_json
-            
-            return a2ui_schema_json, catalog_uri
-    
+    def load_a2ui_validator(self, client_ui_capabilities: Optional[dict[str, Any]]) -> tuple[A2uiValidator, Optional[str]]:
+        """
+        Returns:
+            A tuple of the validator for the merged a2ui_schema and the catalog uri
+        """
+        try:
+            catalog_uri, inline_catalog_str = self.resolve_catalog(client_ui_capabilities)
+            return self.load_catalog_validator(catalog_uri, inline_catalog_str), catalog_uri
         except Exception as e:
             logger.error(f"Failed to a2ui schema with client ui capabilities {client_ui_capabilities}: {e}")
-            raise e     
-
-        
\ No newline at end of file
+            raise e
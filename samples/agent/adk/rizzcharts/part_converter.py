@@ -13,30 +13,33 @@
 # limitations under the License.
 
 import json
-import jsonschema
 import logging
-from typing import Any, List
+from typing import List, Optional
 
 from a2a import types as a2a_types
 from google.genai import types as genai_types
 
 from google.adk.a2a.converters import part_converter
 from a2ui.a2ui_extension import create_a2ui_part
+from a2ui.a2ui_logging import LazyJson
+from a2ui.a2ui_validator import A2uiValidator
 from a2ui_toolset import SendA2uiJsonToClientTool
 
 logger = logging.getLogger(__name__)
 
 class A2uiPartConverter:
+  """Converts GenAI parts to A2A parts for a single invocation.
 
-  def __init__(self):
-      self._a2ui_schema = None
+  The validator is passed in rather than set on a shared instance, so
+  concurrent sessions with different catalogs each use their own schema.
+  """
 
-  def set_a2ui_schema(self, a2ui_schema: dict[str, Any]):
-      self._a2ui_schema = a2ui_schema    
+  def __init__(self, a2ui_validator: Optional[A2uiValidator] = None):
+      self._a2ui_validator = a2ui_validator
       
   def convert_genai_part_to_a2a_part(self, part: genai_types.Part) -> List[a2a_types.Part]:
       if (function_call := part.function_call) and function_call.name == SendA2uiJsonToClientTool.TOOL_NAME:
-          if self._a2ui_schema is None:
+          if self._a2ui_validator is None:
               raise Exception("A2UI schema is not set in part converter")
           
           try:
@@ -47,25 +50,19 @@ class A2uiPartConverter:
                 logger.info("Empty a2ui_json, skipping")
                 return []
             
-            logger.info(f"Converting a2ui json: {a2ui_json}")
+            logger.info("Converting a2ui json: %s", LazyJson(a2ui_json))
 
             json_data = json.loads(a2ui_json)            
-            a2ui_schema_object = {"type": "array", "items": self._a2ui_schema} # Make a list since we support multiple parts in this tool call
-            jsonschema.validate(
-                  instance=json_data, schema=a2ui_schema_object
-              )          
+            # Validate each message on its own, since we support multiple parts in this tool call
+            validation_result = self._a2ui_validator.validate_messages(json_data)
+            for error in validation_result.errors:
+                logger.error(f"Invalid A2UI message in function call: {error}")
 
-            final_parts = []
-            if isinstance(json_data, list):
-                logger.info( f"Found {len(json_data)} messages. Creating individual DataParts." )
-                for message in json_data:
-                  final_parts.append(create_a2ui_part(message))
-            else:
-                # Handle the case where a single JSON object is returned
-                logger.info("Received a single JSON object. Creating a DataPart." )
-                final_parts.append(create_a2ui_part(json_data))
-
-            return final_parts
+            # Send the valid messages before the first failure right away. The tool
+            # call returns the errors to the LLM so it can fix the rest.
+            a2ui_messages = validation_result.valid_prefix()
+            logger.info( f"Found {len(a2ui_messages)} valid messages. Creating individual DataParts." )
+            return [create_a2ui_part(message) for message in a2ui_messages]
           except Exception as e:
               logger.error(f"Error converting A2UI function call to A2A parts: {str(e)}")
               return []
@@ -77,5 +74,5 @@ class A2uiPartConverter:
       # Use default part converter for other types (images, etc)
       converted_part = part_converter.convert_genai_part_to_a2a_part(part)
 
-      logger.info(f"Returning converted part: {converted_part}" )
+      logger.info("Returning converted part: %s", LazyJson(converted_part))
       return [converted_part] if converted_part else []